@@ -0,0 +1,77 @@
+"""
+Payload size and latency trade-off of response compression.
+
+Builds ParseResumeResponse bodies from the mock LLM output (repeating the work
+history to mimic longer CVs), then reports the compressed size, compression
+time and estimated transfer time on slow mobile links for each setting.
+
+Run from apps/backend:
+
+    python -m benchmarks.bench_compression
+"""
+import asyncio
+import copy
+import gzip
+import json
+import time
+
+from src.llm.client import llm_client
+from src.models.resume import ParseResumeResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Downlink bandwidth in bytes per second
+LINKS = {"3G 1.6Mbps": 1.6e6 / 8, "4G 10Mbps": 10e6 / 8}
+REPEATS = 50
+
+
+def sample_payloads() -> dict:
+    """Serialized parse responses of growing size, from the mock LLM output"""
+    data = json.loads(asyncio.run(llm_client._call_mock_llm("张三\n邮箱: test@example.com")))
+    payloads = {}
+    for copies in (1, 4, 16):
+        resume = copy.deepcopy(data)
+        resume["work"] = [
+            {**entry, "company": f"{entry['company']}{i}", "description": f"{entry['description']}（第{i}段）"}
+            for i in range(copies) for entry in data["work"]
+        ]
+        response = ParseResumeResponse(resume=resume, suggestions=[])
+        payloads[f"{copies}x work"] = response.model_dump_json().encode("utf-8")
+    return payloads
+
+
+def settings() -> dict:
+    """Compressors to compare, keyed by label"""
+    compressors = {"identity": lambda body: body}
+    for level in (1, 6, 9):
+        compressors[f"gzip-{level}"] = lambda body, level=level: gzip.compress(body, compresslevel=level)
+    if brotli is not None:
+        for quality in (1, 4, 11):
+            compressors[f"br-{quality}"] = lambda body, quality=quality: brotli.compress(
+                body, mode=brotli.MODE_TEXT, quality=quality
+            )
+    return compressors
+
+
+def main():
+    header = f"{'payload':<10} {'setting':<9} {'bytes':>8} {'ratio':>6} {'cpu ms':>7}"
+    header += "".join(f" {name + ' ms':>13}" for name in LINKS)
+    print(header)
+    for label, body in sample_payloads().items():
+        for name, compress in settings().items():
+            start = time.perf_counter()
+            for _ in range(REPEATS):
+                compressed = compress(body)
+            cpu_ms = (time.perf_counter() - start) / REPEATS * 1000
+            line = f"{label:<10} {name:<9} {len(compressed):>8} {len(body) / len(compressed):>6.2f} {cpu_ms:>7.3f}"
+            for bandwidth in LINKS.values():
+                line += f" {cpu_ms + len(compressed) / bandwidth * 1000:>13.1f}"
+            print(line)
+        print()
+
+
+if __name__ == "__main__":
+    main()
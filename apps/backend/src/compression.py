@@ -0,0 +1,104 @@
+from typing import Dict, Optional, Tuple
+
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES, GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip alone is used without it
+    brotli = None
+
+# Streamed responses are flushed event by event and must never wait on a compressor
+STREAMING_CONTENT_TYPES = ("application/x-ndjson", "text/event-stream")
+
+
+def negotiate_encoding(accept_encoding: str, brotli_available: bool = brotli is not None) -> Optional[str]:
+    """
+    Pick "br" or "gzip" from an Accept-Encoding header, or None for identity.
+
+    Higher q-values win; on a tie brotli is preferred, it compresses Chinese
+    text noticeably better than gzip at a similar CPU cost.
+    """
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    
+    supported = ("br", "gzip") if brotli_available else ("gzip",)
+    # An explicit entry for a coding overrides the "*" wildcard; max() keeps the first on ties
+    best = max(supported, key=lambda coding: qualities.get(coding, qualities.get("*", 0.0)))
+    return best if qualities.get(best, qualities.get("*", 0.0)) > 0 else None
+
+
+class BrotliResponder(IdentityResponder):
+    """Starlette responder compressing the body with brotli"""
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int, thread_minimum_size: int,
+                 exclude_content_types: Tuple[str, ...]):
+        super().__init__(app, minimum_size, exclude_content_types=exclude_content_types)
+        self.quality = quality
+        self.thread_minimum_size = thread_minimum_size
+        self._compressor = None
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if len(body) >= self.thread_minimum_size:
+            # Compressing large bodies inline would block the event loop
+            return await anyio.to_thread.run_sync(self._compress_body, body, more_body)
+        return self._compress_body(body, more_body)
+
+    def _compress_body(self, body: bytes, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=self.quality)
+        if more_body:
+            return self._compressor.process(body) + self._compressor.flush()
+        return self._compressor.process(body) + self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Negotiated brotli/gzip response compression.
+
+    Bodies below minimum_size are sent as is, since compressing a few hundred
+    bytes costs more latency than it saves. Streaming endpoints are excluded.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6,
+                 brotli_quality: int = 4, thread_minimum_size: int = 128 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.thread_minimum_size = thread_minimum_size
+        self.exclude_content_types = DEFAULT_EXCLUDED_CONTENT_TYPES + STREAMING_CONTENT_TYPES
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("Accept-Encoding", ""))
+        if encoding == "br":
+            responder = BrotliResponder(
+                self.app, self.minimum_size, self.brotli_quality, self.thread_minimum_size,
+                self.exclude_content_types
+            )
+        elif encoding == "gzip":
+            responder = GZipResponder(
+                self.app, self.minimum_size, compresslevel=self.gzip_level,
+                thread_minimum_size=self.thread_minimum_size, exclude_content_types=self.exclude_content_types
+            )
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size, exclude_content_types=self.exclude_content_types)
+
+        await responder(scope, receive, send)
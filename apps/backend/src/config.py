@@ -7,4 +7,85 @@ load_dotenv(dotenv_path=env_path)
 
 DASHSCOPE_API_KEY = os.getenv("DASHSCOPE_API_KEY")
 APP_ENV = os.getenv("APP_ENV", "development")
-PORT = int(os.getenv("PORT", 8000))
\ No newline at end of file
+PORT = int(os.getenv("PORT", 8000))
+
+# LLM 调用配置（共享的异步 HTTP 连接池）
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://dashscope.aliyuncs.com/compatible-mode/v1")
+LLM_MODEL = os.getenv("LLM_MODEL", "qwen-turbo-latest")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 120))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", 10))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 100))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", 20))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", 30))
+
+# LLM 准入控制：全局/单会话并发上限，超出后按优先级排队（聊天 > 解析 > 建议），队列满时返回 429
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 16))
+LLM_TENANT_MAX_CONCURRENCY = int(os.getenv("LLM_TENANT_MAX_CONCURRENCY", 4))
+LLM_QUEUE_LIMIT_CHAT = int(os.getenv("LLM_QUEUE_LIMIT_CHAT", 64))
+LLM_QUEUE_LIMIT_PARSE = int(os.getenv("LLM_QUEUE_LIMIT_PARSE", 32))
+LLM_QUEUE_LIMIT_SUGGESTIONS = int(os.getenv("LLM_QUEUE_LIMIT_SUGGESTIONS", 16))
+
+# LLM 重试与超时：可重试错误按抖动退避重试；每个 HTTP 请求有截止时间（可用 X-Request-Timeout 头缩短）
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", 3))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", 0.5))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", 8))
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", 180))
+# 对冲请求：调用耗时超过近期 P95 时并发发起第二次调用，取先返回的结果（默认关闭）
+LLM_HEDGE = os.getenv("LLM_HEDGE", "false").lower() == "true"
+LLM_HEDGE_QUANTILE = float(os.getenv("LLM_HEDGE_QUANTILE", 0.95))
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", 1.0))
+
+# LLM 熔断：窗口内错误率或慢调用比例过高时熔断，熔断期间直接返回 503，之后放少量探测请求
+LLM_BREAKER_WINDOW = float(os.getenv("LLM_BREAKER_WINDOW", 60))
+LLM_BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", 10))
+LLM_BREAKER_ERROR_RATE = float(os.getenv("LLM_BREAKER_ERROR_RATE", 0.5))
+LLM_BREAKER_SLOW_CALL_SECONDS = float(os.getenv("LLM_BREAKER_SLOW_CALL_SECONDS", 30))
+LLM_BREAKER_SLOW_RATE = float(os.getenv("LLM_BREAKER_SLOW_RATE", 0.8))
+LLM_BREAKER_OPEN_SECONDS = float(os.getenv("LLM_BREAKER_OPEN_SECONDS", 30))
+LLM_BREAKER_HALF_OPEN_CALLS = int(os.getenv("LLM_BREAKER_HALF_OPEN_CALLS", 2))
+
+# 简历解析模式：single（一次调用）/ sections（按段落并发解析）/ auto（文本较长时按段落解析）
+PARSE_RESUME_MODE = os.getenv("PARSE_RESUME_MODE", "auto")
+PARSE_SECTIONS_MIN_CHARS = int(os.getenv("PARSE_SECTIONS_MIN_CHARS", 3000))
+PARSE_SECTION_CONCURRENCY = int(os.getenv("PARSE_SECTION_CONCURRENCY", 3))
+PARSE_SECTION_MAX_TOKENS = int(os.getenv("PARSE_SECTION_MAX_TOKENS", 4000))
+
+# 简历解析结果缓存
+PARSE_CACHE_MAX_ENTRIES = int(os.getenv("PARSE_CACHE_MAX_ENTRIES", 256))
+PARSE_CACHE_TTL = float(os.getenv("PARSE_CACHE_TTL", 24 * 3600))
+PARSE_CACHE_DB = os.getenv("PARSE_CACHE_DB", "")  # SQLite 文件路径，为空则只使用内存缓存
+PARSE_CACHE_DB_MAX_ENTRIES = int(os.getenv("PARSE_CACHE_DB_MAX_ENTRIES", 10000))
+
+# 会话级简历存储：memory / sqlite / redis
+RESUME_STORE_BACKEND = os.getenv("RESUME_STORE_BACKEND", "memory")
+RESUME_STORE_MAX_SESSIONS = int(os.getenv("RESUME_STORE_MAX_SESSIONS", 10000))
+RESUME_STORE_MAX_BYTES = int(os.getenv("RESUME_STORE_MAX_BYTES", 256 * 1024 * 1024))
+RESUME_STORE_IDLE_TTL = float(os.getenv("RESUME_STORE_IDLE_TTL", 24 * 3600))
+RESUME_STORE_SQLITE_PATH = os.getenv("RESUME_STORE_SQLITE_PATH", "resume_sessions.db")
+RESUME_STORE_REDIS_URL = os.getenv("RESUME_STORE_REDIS_URL", "redis://localhost:6379/0")
+
+# 聊天会话检查点：memory / sqlite，按 thread_id 保存对话状态（只保留最新检查点）
+CHAT_CHECKPOINT_BACKEND = os.getenv("CHAT_CHECKPOINT_BACKEND", "memory")
+CHAT_CHECKPOINT_MAX_THREADS = int(os.getenv("CHAT_CHECKPOINT_MAX_THREADS", 10000))
+CHAT_CHECKPOINT_IDLE_TTL = float(os.getenv("CHAT_CHECKPOINT_IDLE_TTL", 24 * 3600))
+CHAT_CHECKPOINT_SQLITE_PATH = os.getenv("CHAT_CHECKPOINT_SQLITE_PATH", "chat_checkpoints.db")
+CHAT_HISTORY_MAX_MESSAGES = int(os.getenv("CHAT_HISTORY_MAX_MESSAGES", 20))
+CHAT_INTENT_KEYWORDS_FILE = os.getenv("CHAT_INTENT_KEYWORDS_FILE", "")  # JSON 文件，覆盖默认的意图关键词、权重和否定词
+CHAT_ROUTER_EXAMPLES_FILE = os.getenv("CHAT_ROUTER_EXAMPLES_FILE", "")  # 意图分类器的标注样本（JSON Lines），为空则使用内置样本
+CHAT_ROUTER_CONFIDENCE = float(os.getenv("CHAT_ROUTER_CONFIDENCE", 0.6))  # 分类器置信度低于该值时改由 LLM 判断意图
+RESUME_CONTEXT_CACHE_SIZE = int(os.getenv("RESUME_CONTEXT_CACHE_SIZE", 1024))  # 缓存的简历提示词上下文数量
+
+# 响应压缩（gzip，安装 brotli 后优先使用 br）
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024))  # 小于该字节数的响应不压缩
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+
+# 日志：记录经队列由后台线程写入，日志文件按大小轮转
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FILE = os.getenv("LOG_FILE", "app.log")  # 为空则只输出到控制台
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # text / json（每行一个 JSON 对象）
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", 5))
+LOG_MAX_CHARS = int(os.getenv("LOG_MAX_CHARS", 2000))  # 单条消息最大长度，0 表示不截断
+LOG_MODULE_MAX_CHARS = os.getenv("LOG_MODULE_MAX_CHARS", "")  # 按模块覆盖，如 "src.llm=500,src.langgraph=1000"
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")  # 按模块采样 WARNING 以下的日志，如 "src.llm=0.1"
@@ -0,0 +1,42 @@
+"""
+Per-request deadlines for LLM work, taken from the X-Request-Timeout header
+"""
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.llm.resilience import deadline
+
+TIMEOUT_HEADER = "X-Request-Timeout"
+
+
+def requested_timeout(value: Optional[str], default: float) -> float:
+    """Seconds from an X-Request-Timeout header, never more than default"""
+    try:
+        timeout = float(value) if value else default
+    except ValueError:
+        return default
+    return min(timeout, default) if timeout > 0 else default
+
+
+class DeadlineMiddleware:
+    """
+    Give every HTTP request a deadline for its LLM work.
+
+    Clients may ask for a shorter one with X-Request-Timeout (seconds), e.g.
+    to match their own timeout; LLM calls and retries never run past it.
+    """
+
+    def __init__(self, app: ASGIApp, default_timeout: float):
+        self.app = app
+        self.default_timeout = default_timeout
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timeout = requested_timeout(Headers(scope=scope).get(TIMEOUT_HEADER), self.default_timeout)
+        with deadline(timeout):
+            await self.app(scope, receive, send)
@@ -0,0 +1,180 @@
+"""
+Keyword intent matching for chat messages, one pass over the text
+
+Used by the chat workflow and by the mock LLM client, so it depends on
+neither.
+"""
+import json
+import logging
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.config import CHAT_INTENT_KEYWORDS_FILE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTENT = "chat"
+
+# Intents the chat graph routes on
+CHAT_INTENTS = ("request_suggestion", "confirm_suggestion", "reject_suggestion", DEFAULT_INTENT)
+
+# intent -> {keyword: weight}; on equal scores the intent listed first wins.
+# "建议" is mostly the noun ("这个建议"), so it weighs less than the verbs.
+DEFAULT_KEYWORDS: Dict[str, Dict[str, float]] = {
+    "request_suggestion": {"改进": 1.0, "修改": 1.0, "优化": 1.0, "建议": 0.5},
+    "confirm_suggestion": {"确认": 1.0, "同意": 1.0, "接受": 1.0, "没问题": 1.0, "好的": 0.5, "可以": 0.5},
+    "reject_suggestion": {"拒绝": 1.0, "不同意": 1.0, "不要": 1.0, "不行": 1.0, "算了": 1.0},
+}
+
+# Words that negate the keyword right after them ("不接受", "别修改")
+DEFAULT_NEGATIONS: List[str] = ["不", "没", "别", "不要", "不用", "没有"]
+
+# A negated keyword counts towards this intent instead; otherwise it is ignored
+DEFAULT_NEGATED_INTENTS: Dict[str, str] = {"confirm_suggestion": "reject_suggestion"}
+
+
+class AhoCorasick:
+    """
+    Aho–Corasick automaton over a fixed set of patterns.
+
+    find_all scans the text once, whatever the number of patterns, and
+    reports every occurrence, overlapping ones included.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Indexes of the patterns ending at each node, through fail links too
+        self._out: List[List[int]] = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                raise ValueError("Empty pattern")
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = next_node
+            self._out[node].append(index)
+
+        # Breadth-first, so a node's fail target is complete before the node
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_all(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, pattern index) for every occurrence, in order of end"""
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in out[node]:
+                yield position + 1 - len(patterns[index]), position + 1, index
+
+
+class IntentMatcher:
+    """
+    Weighted keyword classifier compiled into one Aho–Corasick automaton.
+
+    Each intent scores the summed weights of its keywords found in the
+    text. A keyword inside a longer one counts only as the longer one, so
+    "不同意" is a rejection and not also an agreement. A keyword directly
+    after a negation word counts towards its negated_intents entry, or not
+    at all. The highest score wins, ties going to the intent listed first;
+    without any keyword the intent is default.
+    """
+
+    def __init__(self, keywords: Dict[str, Dict[str, float]],
+                 negations: Iterable[str] = (),
+                 negated_intents: Optional[Dict[str, str]] = None,
+                 default: str = DEFAULT_INTENT):
+        self.intents = list(keywords)
+        self.default = default
+        self.negated_intents = dict(negated_intents or {})
+        # pattern -> (intent, weight) for keywords, (None, 0) for negation words
+        self._entries: Dict[str, Tuple[Optional[str], float]] = {}
+        self._negations = set()
+        for intent, words in keywords.items():
+            for word, weight in words.items():
+                self._entries[word.lower()] = (intent, float(weight))
+        for word in negations:
+            self._negations.add(word.lower())
+            self._entries.setdefault(word.lower(), (None, 0.0))
+        self._patterns = list(self._entries)
+        self._automaton = AhoCorasick(self._patterns)
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Score of every intent with at least one counted keyword"""
+        keyword_matches: List[Tuple[int, int, str]] = []
+        negation_ends = set()
+        for start, end, index in self._automaton.find_all(text.lower()):
+            pattern = self._patterns[index]
+            if pattern in self._negations:
+                negation_ends.add(end)
+            if self._entries[pattern][0] is not None:
+                keyword_matches.append((start, end, pattern))
+
+        scores: Dict[str, float] = {}
+        covered_until = -1
+        # Longest first among matches starting together; later ones inside an earlier match are dropped
+        for start, end, pattern in sorted(keyword_matches, key=lambda m: (m[0], -m[1])):
+            if end <= covered_until:
+                continue
+            covered_until = end
+            intent, weight = self._entries[pattern]
+            if start in negation_ends:
+                intent = self.negated_intents.get(intent)
+                if intent is None:
+                    continue
+            scores[intent] = scores.get(intent, 0.0) + weight
+        return scores
+
+    def classify(self, text: str) -> str:
+        """The best scoring intent, or default"""
+        scores = self.scores(text)
+        best, best_score = self.default, 0.0
+        for intent in self.intents:
+            if scores.get(intent, 0.0) > best_score:
+                best, best_score = intent, scores[intent]
+        return best
+
+
+def load_intent_matcher(path: str = CHAT_INTENT_KEYWORDS_FILE) -> IntentMatcher:
+    """
+    Build the matcher from the defaults, overridden by a JSON file if path is set
+
+    The file may give ``keywords`` (intent -> {keyword: weight}, replacing
+    that intent's defaults), ``negations`` and ``negated_intents``. Intents
+    must be ones the chat graph routes: request_suggestion,
+    confirm_suggestion, reject_suggestion or chat.
+    """
+    keywords = {intent: dict(words) for intent, words in DEFAULT_KEYWORDS.items()}
+    negations = list(DEFAULT_NEGATIONS)
+    negated_intents = dict(DEFAULT_NEGATED_INTENTS)
+    if path:
+        with open(path, encoding="utf-8") as f:
+            overrides = json.load(f)
+        keywords.update(overrides.get("keywords", {}))
+        negations = overrides.get("negations", negations)
+        negated_intents = overrides.get("negated_intents", negated_intents)
+        logger.info(f"Loaded chat intent keywords from {path}")
+    return IntentMatcher(keywords, negations, negated_intents)
+
+
+# Global matcher instance
+intent_matcher = load_intent_matcher()
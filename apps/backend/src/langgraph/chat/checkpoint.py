@@ -0,0 +1,451 @@
+"""
+Checkpoint savers for chat threads, keeping only each thread's latest checkpoint
+"""
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from abc import abstractmethod
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP, BaseCheckpointSaver, ChannelVersions, Checkpoint, CheckpointMetadata,
+    CheckpointTuple, get_checkpoint_id, get_checkpoint_metadata
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.config import (
+    CHAT_CHECKPOINT_BACKEND, CHAT_CHECKPOINT_MAX_THREADS, CHAT_CHECKPOINT_IDLE_TTL,
+    CHAT_CHECKPOINT_SQLITE_PATH
+)
+
+logger = logging.getLogger(__name__)
+
+Typed = Tuple[str, bytes]
+# (task_id, channel, serialized value, task_path, write index)
+StoredWrite = Tuple[str, str, Typed, str, int]
+
+
+class ThreadRecord:
+    """The latest checkpoint of one (thread, namespace) with its pending writes"""
+    __slots__ = ("checkpoint_id", "parent_id", "checkpoint", "metadata", "writes")
+
+    def __init__(self, checkpoint_id: str, parent_id: Optional[str], checkpoint: Typed,
+                 metadata: Typed, writes: Optional[List[StoredWrite]] = None):
+        self.checkpoint_id = checkpoint_id
+        self.parent_id = parent_id
+        self.checkpoint = checkpoint
+        self.metadata = metadata
+        self.writes = writes or []
+
+
+class LatestCheckpointSaver(BaseCheckpointSaver):
+    """
+    Checkpointer keeping only the newest checkpoint of each thread.
+
+    A chat turn always resumes from the thread's latest state, so older
+    checkpoints are replaced on every put and storage per thread stays
+    constant however long the conversation runs. Checkpoint history (time
+    travel, forking from an older checkpoint) is not available.
+    """
+
+    def __init__(self):
+        # Chat state holds Suggestion models; only they may be revived from stored checkpoints
+        super().__init__(serde=JsonPlusSerializer(allowed_msgpack_modules=[("src.models.resume", "Suggestion")]))
+
+    @abstractmethod
+    def _load(self, thread_id: str, checkpoint_ns: str) -> Optional[ThreadRecord]:
+        """The thread's record, refreshing its last access"""
+
+    @abstractmethod
+    def _save(self, thread_id: str, checkpoint_ns: str, record: ThreadRecord) -> None:
+        """Replace the thread's record (checkpoint and writes)"""
+
+    @abstractmethod
+    def _add_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str,
+                    writes: List[StoredWrite]) -> None:
+        """Add pending writes to the record if it still holds checkpoint_id"""
+
+    @abstractmethod
+    def _records(self, thread_id: Optional[str]) -> Iterator[Tuple[str, str, ThreadRecord]]:
+        """(thread_id, checkpoint_ns, record) for one thread, or all when None"""
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        record = self._load(thread_id, checkpoint_ns)
+        if record is None:
+            return None
+        checkpoint_id = get_checkpoint_id(config)
+        if checkpoint_id and checkpoint_id != record.checkpoint_id:
+            # Older checkpoints are not kept
+            return None
+        return self._to_tuple(thread_id, checkpoint_ns, record)
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"] if config else None
+        before_id = get_checkpoint_id(before) if before else None
+        count = 0
+        for record_thread, checkpoint_ns, record in self._records(thread_id):
+            if before_id and record.checkpoint_id >= before_id:
+                continue
+            checkpoint_tuple = self._to_tuple(record_thread, checkpoint_ns, record)
+            if filter and any(checkpoint_tuple.metadata.get(k) != v for k, v in filter.items()):
+                continue
+            if limit is not None and count >= limit:
+                return
+            count += 1
+            yield checkpoint_tuple
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        self._save(thread_id, checkpoint_ns, ThreadRecord(
+            checkpoint["id"],
+            config["configurable"].get("checkpoint_id"),
+            self.serde.dumps_typed(checkpoint),
+            self.serde.dumps_typed(get_checkpoint_metadata(config, metadata)),
+        ))
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                   task_path: str = "") -> None:
+        stored = [
+            (task_id, channel, self.serde.dumps_typed(value), task_path, WRITES_IDX_MAP.get(channel, idx))
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        self._add_writes(
+            config["configurable"]["thread_id"],
+            config["configurable"].get("checkpoint_ns", ""),
+            config["configurable"]["checkpoint_id"],
+            stored,
+        )
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None,
+                    limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        for checkpoint_tuple in self.list(config, filter=filter, before=before, limit=limit):
+            yield checkpoint_tuple
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                          task_path: str = "") -> None:
+        self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self.delete_thread(thread_id)
+
+    def close(self) -> None:
+        """Release backend resources"""
+
+    def _to_tuple(self, thread_id: str, checkpoint_ns: str, record: ThreadRecord) -> CheckpointTuple:
+        writes = sorted(record.writes, key=lambda write: (write[0], write[4]))
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": record.checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed(record.checkpoint),
+            metadata=self.serde.loads_typed(record.metadata),
+            pending_writes=[(task_id, channel, self.serde.loads_typed(value)) for task_id, channel, value, _, _ in writes],
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": record.parent_id,
+                    }
+                }
+                if record.parent_id
+                else None
+            ),
+        )
+
+
+def _merge_writes(existing: List[StoredWrite], new: List[StoredWrite]) -> List[StoredWrite]:
+    """
+    Add writes as InMemorySaver does: a regular write is kept once per
+    (task, index), special writes (negative index) are replaced
+    """
+    merged = {(write[0], write[4]): write for write in existing}
+    for write in new:
+        key = (write[0], write[4])
+        if key[1] >= 0 and key in merged:
+            continue
+        merged[key] = write
+    return list(merged.values())
+
+
+class MemoryCheckpointSaver(LatestCheckpointSaver):
+    """In-process saver holding at most max_threads threads, least recently used evicted first"""
+
+    def __init__(self, max_threads: int = CHAT_CHECKPOINT_MAX_THREADS,
+                 idle_ttl: float = CHAT_CHECKPOINT_IDLE_TTL):
+        super().__init__()
+        self.max_threads = max_threads
+        self.idle_ttl = idle_ttl
+        # thread_id -> ({checkpoint_ns: record}, last access time), oldest access first
+        self._threads: "OrderedDict[str, Tuple[Dict[str, ThreadRecord], float]]" = OrderedDict()
+
+    def _load(self, thread_id: str, checkpoint_ns: str) -> Optional[ThreadRecord]:
+        entry = self._threads.get(thread_id)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if now - entry[1] > self.idle_ttl:
+            del self._threads[thread_id]
+            return None
+        self._threads[thread_id] = (entry[0], now)
+        self._threads.move_to_end(thread_id)
+        return entry[0].get(checkpoint_ns)
+
+    def _save(self, thread_id: str, checkpoint_ns: str, record: ThreadRecord) -> None:
+        entry = self._threads.pop(thread_id, None)
+        namespaces = entry[0] if entry is not None else {}
+        namespaces[checkpoint_ns] = record
+        self._threads[thread_id] = (namespaces, time.monotonic())
+        self._evict(keep=thread_id)
+
+    def _add_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str,
+                    writes: List[StoredWrite]) -> None:
+        entry = self._threads.get(thread_id)
+        record = entry[0].get(checkpoint_ns) if entry is not None else None
+        if record is not None and record.checkpoint_id == checkpoint_id:
+            record.writes = _merge_writes(record.writes, writes)
+
+    def _records(self, thread_id: Optional[str]) -> Iterator[Tuple[str, str, ThreadRecord]]:
+        thread_ids = [thread_id] if thread_id is not None else list(self._threads)
+        for tid in thread_ids:
+            entry = self._threads.get(tid)
+            if entry is not None:
+                for checkpoint_ns, record in list(entry[0].items()):
+                    yield tid, checkpoint_ns, record
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._threads.pop(thread_id, None)
+
+    def _evict(self, keep: str) -> None:
+        """Drop idle threads and least recently used ones beyond max_threads"""
+        now = time.monotonic()
+        while self._threads:
+            oldest_id = next(iter(self._threads))
+            if oldest_id == keep:
+                break
+            idle = now - self._threads[oldest_id][1] > self.idle_ttl
+            if not idle and len(self._threads) <= self.max_threads:
+                break
+            logger.info(f"Evicting chat thread {oldest_id}")
+            del self._threads[oldest_id]
+
+    @property
+    def thread_count(self) -> int:
+        # Not __len__: LangGraph treats a falsy checkpointer as none at all
+        return len(self._threads)
+
+
+class SQLiteCheckpointSaver(LatestCheckpointSaver):
+    """SQLite-file saver shared by all worker processes on one host"""
+
+    def __init__(self, path: str = CHAT_CHECKPOINT_SQLITE_PATH,
+                 max_threads: int = CHAT_CHECKPOINT_MAX_THREADS,
+                 idle_ttl: float = CHAT_CHECKPOINT_IDLE_TTL):
+        super().__init__()
+        self.max_threads = max_threads
+        self.idle_ttl = idle_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS chat_checkpoints (
+                    thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL,
+                    checkpoint_id TEXT NOT NULL, parent_id TEXT,
+                    checkpoint_type TEXT NOT NULL, checkpoint BLOB NOT NULL,
+                    metadata_type TEXT NOT NULL, metadata BLOB NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (thread_id, checkpoint_ns));
+                CREATE INDEX IF NOT EXISTS chat_checkpoints_accessed ON chat_checkpoints (accessed_at);
+                CREATE TABLE IF NOT EXISTS chat_checkpoint_writes (
+                    thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL,
+                    checkpoint_id TEXT NOT NULL, task_id TEXT NOT NULL, idx INTEGER NOT NULL,
+                    channel TEXT NOT NULL, value_type TEXT NOT NULL, value BLOB NOT NULL,
+                    task_path TEXT NOT NULL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx));
+            """)
+            # The thread count is kept up to date by triggers (seeded from any existing
+            # rows), so enforcing max_threads never scans the whole table
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS chat_checkpoint_totals (
+                    id INTEGER PRIMARY KEY CHECK (id = 0), threads INTEGER NOT NULL);
+                INSERT OR IGNORE INTO chat_checkpoint_totals
+                    SELECT 0, COUNT(DISTINCT thread_id) FROM chat_checkpoints;
+                CREATE TRIGGER IF NOT EXISTS chat_checkpoints_insert AFTER INSERT ON chat_checkpoints BEGIN
+                    UPDATE chat_checkpoint_totals SET threads = threads + 1 WHERE NOT EXISTS (
+                        SELECT 1 FROM chat_checkpoints
+                        WHERE thread_id = NEW.thread_id AND checkpoint_ns != NEW.checkpoint_ns);
+                END;
+                CREATE TRIGGER IF NOT EXISTS chat_checkpoints_delete AFTER DELETE ON chat_checkpoints BEGIN
+                    UPDATE chat_checkpoint_totals SET threads = threads - 1 WHERE NOT EXISTS (
+                        SELECT 1 FROM chat_checkpoints WHERE thread_id = OLD.thread_id);
+                END;
+            """)
+            self._conn.commit()
+
+    def _load(self, thread_id: str, checkpoint_ns: str) -> Optional[ThreadRecord]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT checkpoint_id, parent_id, checkpoint_type, checkpoint, metadata_type, metadata, "
+                "accessed_at FROM chat_checkpoints WHERE thread_id = ? AND checkpoint_ns = ?",
+                (thread_id, checkpoint_ns)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[6] > self.idle_ttl:
+                self._delete_thread(thread_id)
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE chat_checkpoints SET accessed_at = ? WHERE thread_id = ?", (now, thread_id)
+            )
+            writes = self._conn.execute(
+                "SELECT task_id, channel, value_type, value, task_path, idx FROM chat_checkpoint_writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, row[0])
+            ).fetchall()
+            self._conn.commit()
+        return ThreadRecord(
+            row[0], row[1], (row[2], row[3]), (row[4], row[5]),
+            [(task_id, channel, (value_type, value), task_path, idx)
+             for task_id, channel, value_type, value, task_path, idx in writes]
+        )
+
+    def _save(self, thread_id: str, checkpoint_ns: str, record: ThreadRecord) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO chat_checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_id, "
+                "checkpoint_type, checkpoint, metadata_type, metadata, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (thread_id, checkpoint_ns) DO UPDATE SET "
+                "checkpoint_id = excluded.checkpoint_id, parent_id = excluded.parent_id, "
+                "checkpoint_type = excluded.checkpoint_type, checkpoint = excluded.checkpoint, "
+                "metadata_type = excluded.metadata_type, metadata = excluded.metadata, "
+                "accessed_at = excluded.accessed_at",
+                (thread_id, checkpoint_ns, record.checkpoint_id, record.parent_id, *record.checkpoint,
+                 *record.metadata, now)
+            )
+            # Writes belonged to the replaced checkpoint
+            self._conn.execute(
+                "DELETE FROM chat_checkpoint_writes WHERE thread_id = ? AND checkpoint_ns = ? "
+                "AND checkpoint_id != ?",
+                (thread_id, checkpoint_ns, record.checkpoint_id)
+            )
+            self._evict(keep=thread_id, now=now)
+            self._conn.commit()
+
+    def _add_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str,
+                    writes: List[StoredWrite]) -> None:
+        with self._lock:
+            for task_id, channel, (value_type, value), task_path, idx in writes:
+                # Like InMemorySaver: regular writes are kept once, special ones (idx < 0) replaced
+                verb = "INSERT OR REPLACE" if idx < 0 else "INSERT OR IGNORE"
+                self._conn.execute(
+                    f"{verb} INTO chat_checkpoint_writes (thread_id, checkpoint_ns, checkpoint_id, task_id, "
+                    "idx, channel, value_type, value, task_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, value_type, value, task_path)
+                )
+            self._conn.commit()
+
+    def _records(self, thread_id: Optional[str]) -> Iterator[Tuple[str, str, ThreadRecord]]:
+        with self._lock:
+            if thread_id is None:
+                keys = self._conn.execute("SELECT thread_id, checkpoint_ns FROM chat_checkpoints").fetchall()
+            else:
+                keys = self._conn.execute(
+                    "SELECT thread_id, checkpoint_ns FROM chat_checkpoints WHERE thread_id = ?", (thread_id,)
+                ).fetchall()
+        for tid, checkpoint_ns in keys:
+            record = self._load(tid, checkpoint_ns)
+            if record is not None:
+                yield tid, checkpoint_ns, record
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._delete_thread(thread_id)
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                          task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def _delete_thread(self, thread_id: str) -> None:
+        self._conn.execute("DELETE FROM chat_checkpoints WHERE thread_id = ?", (thread_id,))
+        self._conn.execute("DELETE FROM chat_checkpoint_writes WHERE thread_id = ?", (thread_id,))
+
+    def _evict(self, keep: str, now: float) -> None:
+        """Drop idle threads and least recently used ones beyond max_threads"""
+        stale = self._conn.execute(
+            "SELECT DISTINCT thread_id FROM chat_checkpoints WHERE accessed_at < ? AND thread_id != ?",
+            (now - self.idle_ttl, keep)
+        ).fetchall()
+        (count,) = self._conn.execute("SELECT threads FROM chat_checkpoint_totals").fetchone()
+        count -= len(stale)
+        if count > self.max_threads:
+            stale += self._conn.execute(
+                "SELECT thread_id FROM chat_checkpoints WHERE thread_id != ? AND accessed_at >= ? "
+                "GROUP BY thread_id ORDER BY MAX(accessed_at) LIMIT ?",
+                (keep, now - self.idle_ttl, count - self.max_threads)
+            ).fetchall()
+        for (thread_id,) in stale:
+            self._delete_thread(thread_id)
+
+
+def create_chat_checkpointer(backend: str = CHAT_CHECKPOINT_BACKEND) -> LatestCheckpointSaver:
+    """
+    Create the checkpointer selected by CHAT_CHECKPOINT_BACKEND
+
+    Never falls back to memory: a persistent backend that cannot be opened
+    (or an unknown one) fails startup rather than losing threads on restart.
+    """
+    if backend == "memory":
+        return MemoryCheckpointSaver()
+    if backend == "sqlite":
+        saver = SQLiteCheckpointSaver(CHAT_CHECKPOINT_SQLITE_PATH)
+        logger.info(f"Chat threads are checkpointed to SQLite at {CHAT_CHECKPOINT_SQLITE_PATH}")
+        return saver
+    raise ValueError(f"Unknown chat checkpoint backend: {backend}")
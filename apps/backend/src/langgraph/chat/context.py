@@ -0,0 +1,123 @@
+"""
+Resume context block of the chat prompts, rendered once per resume version
+"""
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from pydantic_core import to_json
+
+from src.config import RESUME_CONTEXT_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+def resume_content_key(resume: Dict[str, Any]) -> str:
+    """Content-addressed key for a resume without a known version"""
+    return "sha256:" + hashlib.sha256(to_json(resume)).hexdigest()
+
+
+def render_resume_context(resume: Dict[str, Any]) -> str:
+    """Render resume data as the plain-text block used in chat prompts"""
+    if not resume:
+        return "无简历信息"
+
+    try:
+        lines = []
+
+        # Basic info
+        basics = resume.get("basics") or {}
+        lines.append(f"姓名: {basics.get('name', 'N/A')}")
+        lines.append(f"邮箱: {basics.get('email', 'N/A')}")
+        lines.append(f"电话: {basics.get('phone', 'N/A')}")
+        lines.append(f"地点: {basics.get('location', 'N/A')}")
+        lines.append(f"简介: {basics.get('summary', 'N/A')}")
+        lines.append("")
+
+        # Education; entries are numbered from 0 to match field paths like education[0]
+        education = resume.get("education") or []
+        if education:
+            lines.append("教育经历:")
+            for i, edu in enumerate(education):
+                lines.append(f"  {i}. {edu.get('institution', 'N/A')} - {edu.get('degree', 'N/A')}")
+                lines.append(f"     专业: {edu.get('field_of_study', 'N/A')}")
+                lines.append(f"     时间: {edu.get('start_date', 'N/A')} - {edu.get('end_date', 'N/A')}")
+                if edu.get("gpa"):
+                    lines.append(f"     GPA: {edu['gpa']}")
+            lines.append("")
+
+        # Work experience
+        work = resume.get("work") or []
+        if work:
+            lines.append("工作经历:")
+            for i, job in enumerate(work):
+                lines.append(f"  {i}. {job.get('company', 'N/A')} - {job.get('position', 'N/A')}")
+                lines.append(f"     时间: {job.get('start_date', 'N/A')} - {job.get('end_date', 'N/A')}")
+                lines.append(f"     描述: {job.get('description', 'N/A')}")
+                achievements = job.get("achievements") or []
+                if achievements:
+                    lines.append("     成就:")
+                    lines.extend(f"       - {achievement}" for achievement in achievements)
+            lines.append("")
+
+        # Skills
+        skills = resume.get("skills") or []
+        if skills:
+            lines.append("技能:")
+            for skill in skills:
+                lines.append(f"  - {skill.get('name', 'N/A')} ({skill.get('level', 'N/A')})")
+            lines.append("")
+
+        return "\n".join(lines) + "\n"
+
+    except Exception as e:
+        logger.error(f"Error formatting resume: {str(e)}")
+        return "简历信息格式错误"
+
+
+class ResumeContextRenderer:
+    """
+    LRU cache of rendered resume context blocks.
+
+    Entries are keyed by the stored session's version (its ETag) when the
+    resume came from the session store, otherwise by a hash of the resume's
+    content. Every turn of a chat reuses the same block; accepting a
+    suggestion or saving the resume stores a new version, which is rendered
+    on its next use.
+    """
+
+    def __init__(self, max_entries: int = RESUME_CONTEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, resume: Dict[str, Any], version: Optional[str] = None) -> str:
+        """The rendered context for resume; version, if given, must identify its content"""
+        if not resume:
+            return render_resume_context(resume)
+
+        key = version or resume_content_key(resume)
+        rendered = self._entries.get(key)
+        if rendered is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rendered
+
+        self.misses += 1
+        rendered = render_resume_context(resume)
+        self._entries[key] = rendered
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return rendered
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Global renderer instance
+resume_context = ResumeContextRenderer()
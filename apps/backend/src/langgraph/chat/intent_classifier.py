@@ -0,0 +1,147 @@
+"""
+CPU-only intent classifier for the chat router: hashed character n-grams
+and a softmax regression, trained from a small labelled file at startup
+"""
+import json
+import logging
+import os
+import re
+import zlib
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config import CHAT_ROUTER_EXAMPLES_FILE
+from src.intent import CHAT_INTENTS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXAMPLES_FILE = os.path.join(os.path.dirname(__file__), "intent_examples.jsonl")
+
+_SEPARATORS = re.compile(r"[\s,.!?;:，。！？；：、~～…\"'“”‘’()（）]+")
+
+
+class HashingVectorizer:
+    """
+    Character n-grams hashed into a fixed number of buckets.
+
+    Chinese needs no tokenizer this way, and unseen wording still shares
+    n-grams ("不同意" with "不同意这样改"). Vectors are L2-normalized and
+    returned sparse, as (bucket indexes, values).
+    """
+
+    def __init__(self, n_features: int = 4096, ngram_range: Tuple[int, int] = (1, 3)):
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+
+    def ngrams(self, text: str) -> List[str]:
+        # Punctuation and spacing carry no intent; "OK" and "ok" are the same
+        text = _SEPARATORS.sub(" ", text.lower()).strip()
+        grams = []
+        for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+            grams.extend(text[i:i + n] for i in range(len(text) - n + 1))
+        return [gram for gram in grams if gram.strip()]
+
+    def transform_one(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sparse (indexes, values) vector of one text"""
+        # crc32, not hash(): buckets must not change between processes
+        buckets = [zlib.crc32(gram.encode("utf-8")) % self.n_features for gram in self.ngrams(text)]
+        if not buckets:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.float32)
+        indexes, counts = np.unique(np.asarray(buckets, dtype=np.intp), return_counts=True)
+        values = counts.astype(np.float32)
+        return indexes, values / np.linalg.norm(values)
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        """Dense matrix of texts, one row each"""
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            indexes, values = self.transform_one(text)
+            matrix[row, indexes] = values
+        return matrix
+
+
+class IntentClassifier:
+    """
+    Multinomial logistic regression over hashed n-gram vectors.
+
+    Trained by full-batch gradient descent on a few hundred examples in
+    milliseconds; predicting one message costs a gather over its n-gram
+    buckets, well under a millisecond. predict returns the intent with its
+    probability, for the caller to decide whether that is confident enough.
+    """
+
+    def __init__(self, vectorizer: Optional[HashingVectorizer] = None, l2: float = 1e-4,
+                 learning_rate: float = 2.0, epochs: int = 300):
+        self.vectorizer = vectorizer or HashingVectorizer()
+        self.l2 = l2
+        self.learning_rate = learning_rate
+        self.epochs = epochs
+        self.intents: List[str] = []
+        self.weights: Optional[np.ndarray] = None
+        self.bias: Optional[np.ndarray] = None
+
+    def fit(self, texts: Sequence[str], intents: Sequence[str]) -> "IntentClassifier":
+        """Train on labelled texts"""
+        if not texts or len(texts) != len(intents):
+            raise ValueError("Need the same, non-zero number of texts and intents")
+        self.intents = sorted(set(intents))
+        x = self.vectorizer.transform(texts)
+        y = np.zeros((len(texts), len(self.intents)), dtype=np.float32)
+        y[np.arange(len(texts)), [self.intents.index(intent) for intent in intents]] = 1.0
+
+        weights = np.zeros((x.shape[1], len(self.intents)), dtype=np.float32)
+        bias = np.zeros(len(self.intents), dtype=np.float32)
+        for _ in range(self.epochs):
+            error = (_softmax(x @ weights + bias) - y) / len(texts)
+            weights -= self.learning_rate * (x.T @ error + self.l2 * weights)
+            bias -= self.learning_rate * error.sum(axis=0)
+        self.weights, self.bias = weights, bias
+        return self
+
+    def predict_proba(self, text: str) -> np.ndarray:
+        """Probability of each intent, in the order of self.intents"""
+        if self.weights is None:
+            raise RuntimeError("IntentClassifier is not trained")
+        indexes, values = self.vectorizer.transform_one(text)
+        return _softmax(values @ self.weights[indexes] + self.bias)
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """The most likely intent and its probability"""
+        probabilities = self.predict_proba(text)
+        best = int(np.argmax(probabilities))
+        return self.intents[best], float(probabilities[best])
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    scores = scores - scores.max(axis=-1, keepdims=True)
+    exp = np.exp(scores)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def read_examples(path: str) -> Tuple[List[str], List[str]]:
+    """Texts and intents from a JSON Lines file of {"text": ..., "intent": ...}"""
+    texts, intents = [], []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                example = json.loads(line)
+                texts.append(example["text"])
+                intents.append(example["intent"])
+    return texts, intents
+
+
+def load_intent_classifier(path: str = CHAT_ROUTER_EXAMPLES_FILE) -> IntentClassifier:
+    """Train the router classifier on path, or on the bundled examples if not set"""
+    path = path or DEFAULT_EXAMPLES_FILE
+    texts, intents = read_examples(path)
+    unknown = set(intents) - set(CHAT_INTENTS)
+    if unknown:
+        raise ValueError(f"Unknown intents in {path}: {sorted(unknown)}")
+    classifier = IntentClassifier().fit(texts, intents)
+    logger.info(f"Trained chat intent classifier on {len(texts)} examples from {path}")
+    return classifier
+
+
+# Global classifier instance
+intent_classifier = load_intent_classifier()
@@ -2,40 +2,76 @@
 LangGraph nodes for chat workflow
 """
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.types import StreamWriter
 
 from src.models.chat import ChatState
+from src.models.resume import Suggestion
 from src.langgraph.chat.tools import (
     format_history, format_resume, extract_intent, 
     get_field_value, is_confirmation, parse_suggestion
 )
+from src.intent import CHAT_INTENTS
+from src.langgraph.chat.intent_classifier import intent_classifier
 from src.llm.client import llm_client
+from src.llm.resilience import LLMUnavailable
 from src.llm.prompts import SUGGESTION_PROMPT, CONFIRMATION_PROMPT, CHAT_RESPONSE_PROMPT
+from src.config import CHAT_HISTORY_MAX_MESSAGES, CHAT_ROUTER_CONFIDENCE
 
 logger = logging.getLogger(__name__)
 
+# Set in a run's configurable to have llm_chat_response stream its reply as custom events
+STREAM_TOKENS = "stream_tokens"
+
 
 async def router(state: ChatState) -> ChatState:
     """Route user input to appropriate handler"""
     try:
-        # Extract intent from user text
-        state.intent = extract_intent(state.text)
-        logger.info(f"Router determined intent: {state.intent}")
+        # The local classifier settles most turns without an LLM round trip
+        intent, confidence = intent_classifier.predict(state.text)
+        if confidence >= CHAT_ROUTER_CONFIDENCE:
+            state.intent = intent
+        else:
+            state.intent = await _route_with_llm(state)
+        logger.info(f"Router determined intent: {state.intent} (classifier: {intent}, {confidence:.2f})")
         return state
         
+    except LLMUnavailable:
+        # Shed, circuit open or past the deadline: answered with 429/503/504
+        raise
     except Exception as e:
         logger.error(f"Error in router: {str(e)}")
         state.intent = "chat"  # Default to chat
         return state
 
 
+async def _route_with_llm(state: ChatState) -> str:
+    """Intent from the LLM, or from the keyword matcher if the LLM gives no valid one"""
+    try:
+        intent = await llm_client.route_intent(
+            state.text,
+            format_history(state.history),
+            format_resume(state.resume, state.resume_version)
+        )
+        if intent in CHAT_INTENTS:
+            return intent
+        logger.warning(f"LLM router returned an unknown intent: {intent[:50]}")
+    except LLMUnavailable:
+        raise
+    except Exception as e:
+        logger.error(f"Error routing with LLM: {str(e)}")
+    return extract_intent(state.text)
+
+
 async def generate_suggestion(state: ChatState) -> ChatState:
     """Generate a suggestion based on user request"""
     try:
         prompt = SUGGESTION_PROMPT.format(
             user_text=state.text,
             history=format_history(state.history),
-            resume=format_resume(state.resume)
+            resume=format_resume(state.resume, state.resume_version)
         )
         
         response = await llm_client.chat_response(prompt)
@@ -43,13 +79,15 @@ async def generate_suggestion(state: ChatState) -> ChatState:
         # Parse suggestion from response
         suggestion = parse_suggestion(response, state.resume)
         if suggestion:
-            state.latest_suggestion = suggestion
+            state.latest_suggestion = Suggestion(**suggestion)
             state.response = f"我为您生成了一个建议：\n\n**字段**: {suggestion['field']}\n**当前内容**: {suggestion['current']}\n**建议内容**: {suggestion['suggested']}\n**理由**: {suggestion['reason']}\n\n您觉得这个建议如何？"
         else:
             state.response = "抱歉，我无法为您的请求生成具体的建议。请提供更详细的信息或具体说明您想要改进的简历部分。"
         
         return state
         
+    except LLMUnavailable:
+        raise
     except Exception as e:
         logger.error(f"Error generating suggestion: {str(e)}")
         state.response = "生成建议时出现错误，请稍后重试。"
@@ -66,7 +104,7 @@ async def finalize_suggestion(state: ChatState) -> ChatState:
         prompt = CONFIRMATION_PROMPT.format(
             user_text=state.text,
             suggestion=state.latest_suggestion,
-            resume=format_resume(state.resume)
+            resume=format_resume(state.resume, state.resume_version)
         )
         
         response = await llm_client.chat_response(prompt)
@@ -74,12 +112,14 @@ async def finalize_suggestion(state: ChatState) -> ChatState:
         # Check if user confirmed the suggestion
         if is_confirmation(state.text):
             state.finalized = True
-            state.response = f"好的，我已经确认了您的建议。建议内容：{state.latest_suggestion['suggested']}"
+            state.response = f"好的，我已经确认了您的建议。建议内容：{state.latest_suggestion.suggested}"
         else:
             state.response = "我理解您可能还需要进一步讨论这个建议。请告诉我您的想法。"
         
         return state
         
+    except LLMUnavailable:
+        raise
     except Exception as e:
         logger.error(f"Error finalizing suggestion: {str(e)}")
         state.response = "确认建议时出现错误，请稍后重试。"
@@ -97,26 +137,39 @@ async def reject_suggestion(state: ChatState) -> ChatState:
         
         return state
         
+    except LLMUnavailable:
+        raise
     except Exception as e:
         logger.error(f"Error rejecting suggestion: {str(e)}")
         state.response = "拒绝建议时出现错误，请稍后重试。"
         return state
 
 
-async def llm_chat_response(state: ChatState) -> ChatState:
-    """Generate a general chat response"""
+async def llm_chat_response(state: ChatState, config: Optional[RunnableConfig] = None,
+                            writer: StreamWriter = None) -> ChatState:
+    """Generate a general chat response, token by token when the run streams"""
     try:
         prompt = CHAT_RESPONSE_PROMPT.format(
             user_text=state.text,
             history=format_history(state.history),
-            resume=format_resume(state.resume)
+            resume=format_resume(state.resume, state.resume_version)
         )
         
-        response = await llm_client.chat_response(prompt)
+        # LangGraph passes a writer to every run; only streaming runs ask for tokens
+        if writer is not None and (config or {}).get("configurable", {}).get(STREAM_TOKENS):
+            tokens = []
+            async for token in llm_client.chat_response_stream(prompt):
+                writer({"token": token})
+                tokens.append(token)
+            response = "".join(tokens)
+        else:
+            response = await llm_client.chat_response(prompt)
         state.response = response
         
         return state
         
+    except LLMUnavailable:
+        raise
     except Exception as e:
         logger.error(f"Error generating chat response: {str(e)}")
         state.response = "生成回复时出现错误，请稍后重试。"
@@ -124,7 +177,12 @@ async def llm_chat_response(state: ChatState) -> ChatState:
 
 
 async def update_response(state: ChatState) -> ChatState:
-    """Update the final response"""
-    # This node ensures the response is properly formatted
-    # The actual response is already set in previous nodes
+    """Update the final response and record the turn in the history"""
+    # The actual response is already set in previous nodes.
+    # The history is kept by the checkpointer between turns; prompts only use
+    # the last few messages, so older ones are dropped.
+    state.history = (state.history + [
+        {"role": "user", "content": state.text},
+        {"role": "assistant", "content": state.response or ""},
+    ])[-CHAT_HISTORY_MAX_MESSAGES:]
     return state 
\ No newline at end of file
@@ -2,14 +2,16 @@
 LangGraph Chat Workflow for resume suggestion generation
 """
 import logging
-from typing import Dict, Any, List
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
 from src.models.chat import ChatState
+from src.langgraph.chat.checkpoint import create_chat_checkpointer
+from src.llm.resilience import LLMUnavailable
 from src.langgraph.chat.nodes import (
     router, generate_suggestion, finalize_suggestion, 
-    reject_suggestion, llm_chat_response, update_response
+    reject_suggestion, llm_chat_response, update_response, STREAM_TOKENS
 )
 
 logger = logging.getLogger(__name__)
@@ -18,11 +20,14 @@ logger = logging.getLogger(__name__)
 class ChatWorkflow:
     """LangGraph workflow for managing chat interactions and suggestion generation"""
     
-    def __init__(self):
-        self.memory = MemorySaver()
-        self.graph = self._build_graph()
+    def __init__(self, checkpointer: Optional[BaseCheckpointSaver] = None):
+        # Keeps each thread's history, resume and latest suggestion between turns
+        self.checkpointer = checkpointer or create_chat_checkpointer()
+        self.graph = self._build_graph(self.checkpointer)
+        # The same graph without checkpoints, for calls that carry their own history
+        self.stateless_graph = self._build_graph()
     
-    def _build_graph(self) -> StateGraph:
+    def _build_graph(self, checkpointer: Optional[BaseCheckpointSaver] = None) -> StateGraph:
         """Build the LangGraph workflow"""
         workflow = StateGraph(ChatState)
         
@@ -58,7 +63,7 @@ class ChatWorkflow:
         # Add edge to END
         workflow.add_edge("update_response", END)
         
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
     
     def _route_condition(self, state: ChatState) -> str:
         """Determine the next node based on intent"""
@@ -66,39 +71,99 @@ class ChatWorkflow:
         logger.info(f"Routing to: {intent}")
         return intent
     
-
-    
-
-    
-
-    
-    async def run(self, text: str, history: List[Dict[str, str]], resume: Dict[str, Any]) -> Dict[str, Any]:
-        """Run the chat workflow"""
+    async def run(self, text: str, history: Optional[List[Dict[str, str]]] = None,
+                  resume: Optional[Dict[str, Any]] = None, thread_id: Optional[str] = None,
+                  resume_version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run the chat workflow
+        
+        With a thread_id, the history, resume and latest suggestion are
+        restored from the thread's checkpoint, so only the new text needs to
+        be sent; a history or resume passed in replaces the stored one.
+        resume_version identifies the resume's content (the stored session's
+        ETag), so its prompt context is rendered once per version.
+        """
         try:
-            # Initialize state
-            state = ChatState(
-                text=text,
-                history=history,
-                resume=resume
-            )
-            
-            # Run workflow
-            result = await self.graph.ainvoke(state)
-            
-            # Return formatted response
-            return {
-                "response": result.get("response") or "抱歉，我无法生成回复。",
-                "suggestion": result.get("latest_suggestion"),
-                "finalized": result.get("finalized", False)
-            }
+            graph, state, config = await self._prepare(text, history, resume, thread_id, resume_version)
+            result = await graph.ainvoke(state, config)
+            return self._format_result(result)
             
+        except LLMUnavailable:
+            # Answered with 429/503/504 rather than a canned reply
+            raise
         except Exception as e:
             logger.error(f"Error running chat workflow: {str(e)}")
             return {
                 "response": "处理您的请求时出现错误，请稍后重试。",
                 "suggestion": None,
-                "finalized": False
+                "finalized": False,
+                "intent": None
             }
+    
+    async def stream(self, text: str, history: Optional[List[Dict[str, str]]] = None,
+                     resume: Optional[Dict[str, Any]] = None, thread_id: Optional[str] = None,
+                     resume_version: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the chat workflow, yielding progress as it happens
+        
+        Events are ``node`` (a node has started, with its name) and ``token``
+        (the next piece of a chat reply, as the LLM generates it), followed by
+        ``result`` with the same payload as run(), or ``error``. Replies that
+        are not streamed, such as suggestions, arrive with ``result`` only.
+        LLMUnavailable is raised, as from run().
+        """
+        try:
+            graph, state, config = await self._prepare(text, history, resume, thread_id, resume_version)
+            configurable = dict(config.get("configurable", {}), **{STREAM_TOKENS: True})
+            result = state
+            async for mode, chunk in graph.astream(state, {**config, "configurable": configurable},
+                                                   stream_mode=["tasks", "custom", "values"]):
+                if mode == "tasks" and "input" in chunk:
+                    yield {"event": "node", "data": chunk["name"]}
+                elif mode == "custom":
+                    yield {"event": "token", "data": chunk["token"]}
+                elif mode == "values":
+                    result = chunk
+        except LLMUnavailable:
+            raise
+        except Exception as e:
+            logger.error(f"Error streaming chat workflow: {str(e)}")
+            yield {"event": "error", "detail": "处理您的请求时出现错误，请稍后重试。"}
+            return
+        
+        yield {"event": "result", "data": self._format_result(result)}
+    
+    async def _prepare(self, text: str, history: Optional[List[Dict[str, str]]],
+                       resume: Optional[Dict[str, Any]],
+                       thread_id: Optional[str], resume_version: Optional[str]) -> Tuple[Any, Dict[str, Any], Dict[str, Any]]:
+        """Pick the graph for a run and build its input state and config"""
+        # Per-turn fields start fresh, the rest carries over from the checkpoint
+        state = {"text": text, "response": None, "intent": None, "finalized": False}
+        if history is not None:
+            state["history"] = history
+        if resume is not None:
+            # A stored version belongs to the stored resume only
+            state["resume"] = resume
+            state["resume_version"] = resume_version
+        
+        if thread_id is None:
+            state.setdefault("history", [])
+            state.setdefault("resume", {})
+            return self.stateless_graph, state, {}
+        
+        config = {"configurable": {"thread_id": thread_id}}
+        if "resume" not in state and await self.checkpointer.aget_tuple(config) is None:
+            state["resume"] = {}
+        return self.graph, state, config
+    
+    def _format_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """The reply, latest suggestion, finalized flag and intent of a finished run"""
+        return {
+            "response": result.get("response") or "抱歉，我无法生成回复。",
+            "suggestion": result.get("latest_suggestion"),
+            "finalized": result.get("finalized", False),
+            "intent": result.get("intent")
+        }
 
 
 # Global workflow instance
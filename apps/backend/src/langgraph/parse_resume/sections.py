@@ -0,0 +1,53 @@
+"""
+Split raw resume text into sections, so each can be extracted by its own LLM call
+"""
+import re
+from typing import Dict, List
+
+# Section headings, longest first so "工作经历" wins over "工作"
+SECTION_HEADINGS = {
+    "basics": ["个人信息", "基本信息", "个人简介", "自我评价", "个人总结", "联系方式", "profile", "summary", "contact"],
+    "education": ["教育背景", "教育经历", "学历", "教育", "education"],
+    "work": ["工作经历", "工作经验", "实习经历", "项目经历", "工作", "实习", "work experience", "experience", "employment"],
+    "skills": ["专业技能", "技能特长", "技能", "skills"],
+    "certificates": ["资格证书", "证书", "获奖情况", "荣誉奖项", "certificates", "certifications", "awards"],
+}
+
+SECTION_ORDER = ["basics", "education", "work", "skills", "certificates"]
+
+_HEADING_PATTERN = re.compile(
+    r"^\s*(?:#+\s*)?[【\[]?(?P<title>"
+    + "|".join(sorted(
+        (re.escape(title) for titles in SECTION_HEADINGS.values() for title in titles),
+        key=len, reverse=True
+    ))
+    + r")[】\]]?\s*[:：]?\s*$",
+    re.IGNORECASE
+)
+_TITLE_TO_SECTION = {title: section for section, titles in SECTION_HEADINGS.items() for title in titles}
+
+
+def segment_resume_text(text: str) -> Dict[str, str]:
+    """
+    Split resume text into {section: text} at recognised headings.
+
+    A heading is a line holding only a section title, optionally as "# 标题"
+    or "【标题】" and with a trailing colon. Lines with content after the
+    colon, such as "学历：本科" among contact details, are ordinary lines of
+    the current section. Text before the first heading belongs to basics.
+    Sections without any text are left out.
+    """
+    lines: Dict[str, List[str]] = {section: [] for section in SECTION_ORDER}
+    current = "basics"
+    for line in text.splitlines():
+        match = _HEADING_PATTERN.match(line)
+        if match:
+            current = _TITLE_TO_SECTION[match.group("title").lower()]
+            continue
+        lines[current].append(line)
+
+    return {
+        section: "\n".join(section_lines).strip()
+        for section, section_lines in lines.items()
+        if "\n".join(section_lines).strip()
+    }
@@ -1,18 +1,42 @@
+import asyncio
 import json
 import logging
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Optional
 
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 
 from src.models.resume import (
-    Resume, ParseResumeResponse, LangGraphState, Suggestion
+    Resume, ParseResumeResponse, LangGraphState, Suggestion,
+    BasicInfo, Education, WorkExperience, Skill, Certificate, RESUME_LIST_SECTIONS
 )
 from src.llm.client import llm_client
+from src.llm.resilience import LLMUnavailable
+from src.models.field_path import compile_field_path
+from src.llm.json_stream import JSONStreamDecoder, Path, decode_partial
+from src.config import PARSE_RESUME_MODE, PARSE_SECTIONS_MIN_CHARS, PARSE_SECTION_CONCURRENCY
+from src.langgraph.parse_resume.sections import segment_resume_text
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Model used to validate a single entry of each section
+SECTION_MODELS = {
+    "basics": BasicInfo,
+    "education": Education,
+    "work": WorkExperience,
+    "skills": Skill,
+    "certificates": Certificate,
+}
+
+# Nodes return only the fields they change; LangGraph merges them into the
+# stored state, so validated sub-models are never copied or re-validated
+StateUpdate = Dict[str, Any]
+
+class SectionValidationError(ValueError):
+    """Raised when a streamed resume section fails validation"""
+
+
 class ResumeParsingWorkflow:
     """LangGraph workflow for resume parsing"""
     
@@ -74,65 +98,36 @@ class ResumeParsingWorkflow:
         logger.info("LangGraph workflow built successfully")
         return workflow.compile()
     
-    async def _parse_resume_node(self, state: LangGraphState) -> LangGraphState:
+    async def _parse_resume_node(self, state: LangGraphState) -> StateUpdate:
         """Parse resume text using LLM"""
         logger.info("Starting parse_resume node")
         try:
-            # Use LLM to parse resume
-            logger.info(f"Calling LLM with resume text: {state.resume_text[:100]}...")
-            response = await llm_client.parse_resume(state.resume_text)
-            logger.info(f"LLM response received, length: {len(response)}")
+            sections = self._sections_to_parse(state.resume_text)
+            if sections is not None:
+                # One concurrent extraction per section, merged before validation
+                resume_data = await self._parse_sections(sections)
+            else:
+                # Use LLM to parse resume
+                logger.info(f"Calling LLM with resume text: {state.resume_text[:100]}...")
+                response = await llm_client.parse_resume(state.resume_text)
+                logger.info(f"LLM response received, length: {len(response)}")
             
-            # Parse JSON response
-            logger.info("Parsing JSON response from LLM")
-            try:
-                resume_data = json.loads(response)
-            except json.JSONDecodeError as e:
-                logger.warning(f"JSON parsing failed: {e}. Attempting to extract partial JSON...")
-                # Try to extract valid JSON from the response
-                resume_data = self._extract_partial_json(response)
-                if not resume_data:
-                    raise ValueError(f"Failed to parse JSON response: {e}")
+                # Parse JSON response
+                logger.info("Parsing JSON response from LLM")
+                try:
+                    resume_data = json.loads(response)
+                except json.JSONDecodeError as e:
+                    logger.warning(f"JSON parsing failed: {e}. Attempting to extract partial JSON...")
+                    # Try to extract valid JSON from the response
+                    resume_data = self._extract_partial_json(response)
+                    if not resume_data:
+                        raise ValueError(f"Failed to parse JSON response: {e}")
             
             logger.info(f"JSON parsed successfully. Resume data keys: {list(resume_data.keys())}")
             
             # Extract suggestions from embedded fields to separate array
             # This maintains the original design: resume (pure data) + suggestions (separate array)
-            all_suggestions = []
-            
-            if "basics" in resume_data and "suggestions" in resume_data["basics"]:
-                logger.info(f"Found {len(resume_data['basics']['suggestions'])} suggestions in basics")
-                all_suggestions.extend(resume_data["basics"]["suggestions"])
-                del resume_data["basics"]["suggestions"]
-            
-            if "education" in resume_data:
-                for i, edu in enumerate(resume_data["education"]):
-                    if "suggestions" in edu:
-                        logger.info(f"Found {len(edu['suggestions'])} suggestions in education[{i}]")
-                        all_suggestions.extend(edu["suggestions"])
-                        del edu["suggestions"]
-            
-            if "work" in resume_data:
-                for i, work in enumerate(resume_data["work"]):
-                    if "suggestions" in work:
-                        logger.info(f"Found {len(work['suggestions'])} suggestions in work[{i}]")
-                        all_suggestions.extend(work["suggestions"])
-                        del work["suggestions"]
-            
-            if "skills" in resume_data:
-                for i, skill in enumerate(resume_data["skills"]):
-                    if "suggestions" in skill:
-                        logger.info(f"Found {len(skill['suggestions'])} suggestions in skills[{i}]")
-                        all_suggestions.extend(skill["suggestions"])
-                        del skill["suggestions"]
-            
-            if "certificates" in resume_data:
-                for i, cert in enumerate(resume_data["certificates"]):
-                    if "suggestions" in cert:
-                        logger.info(f"Found {len(cert['suggestions'])} suggestions in certificates[{i}]")
-                        all_suggestions.extend(cert["suggestions"])
-                        del cert["suggestions"]
-            
+            all_suggestions = self._extract_embedded_suggestions(resume_data)
             logger.info(f"Total suggestions extracted: {len(all_suggestions)}")
             
             # Create Resume object (without suggestions embedded)
@@ -141,29 +136,90 @@ class ResumeParsingWorkflow:
             logger.info(f"Resume object created successfully. Education: {len(parsed_resume.education)}, Work: {len(parsed_resume.work)}")
             
             logger.info("Completed parse_resume node")
-            return LangGraphState(
-                resume_text=state.resume_text,
-                parsed_resume=parsed_resume,
-                suggestions=all_suggestions,
-                validation_errors=state.validation_errors,
-                final_result=state.final_result,
-                error_message=state.error_message
-            )
+            return {
+                "parsed_resume": parsed_resume,
+                # Validated once here, later nodes pass the models along
+                "suggestions": [Suggestion(**suggestion) for suggestion in all_suggestions],
+            }
+        except LLMUnavailable:
+            # Shed, timed out or failed upstream: surfaced as 429/503/504, not as a parse failure
+            raise
         except Exception as e:
             logger.error(f"Error in parse_resume node: {e}")
             # Log the raw response for debugging
             if 'response' in locals():
                 logger.error(f"Raw LLM response that caused error: {response}")
-            return LangGraphState(
-                resume_text=state.resume_text,
-                parsed_resume=state.parsed_resume,
-                suggestions=state.suggestions,
-                validation_errors=state.validation_errors,
-                final_result=state.final_result,
-                error_message=f"Failed to parse resume: {str(e)}"
-            )
+            return {"error_message": f"Failed to parse resume: {str(e)}"}
+    
+    def _sections_to_parse(self, resume_text: str) -> Optional[Dict[str, str]]:
+        """
+        The resume split into sections for section-parallel parsing, or None to
+        parse it with a single call (single mode, short text, or no education
+        and work headings found)
+        """
+        if PARSE_RESUME_MODE == "single":
+            return None
+        if PARSE_RESUME_MODE == "auto" and len(resume_text) < PARSE_SECTIONS_MIN_CHARS:
+            return None
+        sections = segment_resume_text(resume_text)
+        if "education" not in sections or "work" not in sections:
+            logger.info("Section headings not found, parsing the resume with a single call")
+            return None
+        # Contact details may sit anywhere when the resume starts with a heading
+        sections.setdefault("basics", resume_text)
+        return sections
+    
+    async def _parse_sections(self, sections: Dict[str, str]) -> Dict[str, Any]:
+        """Extract each section concurrently (at most PARSE_SECTION_CONCURRENCY at once) and merge them"""
+        logger.info(f"Parsing {len(sections)} sections concurrently: {list(sections)}")
+        semaphore = asyncio.Semaphore(PARSE_SECTION_CONCURRENCY)
+        
+        async def parse_section(section: str, text: str) -> Any:
+            async with semaphore:
+                response = await llm_client.parse_resume_section(section, text)
+            try:
+                return json.loads(response)
+            except json.JSONDecodeError as e:
+                logger.warning(f"JSON parsing failed for {section} section: {e}. Keeping complete entries")
+                # Sections are short, but keep what was completed if the output was cut anyway
+                return decode_partial(response, max_open_depth=0)
+        
+        results = await asyncio.gather(*(parse_section(section, text) for section, text in sections.items()))
+        
+        resume_data: Dict[str, Any] = {}
+        for section, data in zip(sections, results):
+            expected = dict if section == "basics" else list
+            if isinstance(data, expected):
+                resume_data[section] = data
+            else:
+                logger.warning(f"Discarding {section} section, expected a JSON {expected.__name__}")
+        if "basics" not in resume_data:
+            raise ValueError("Failed to parse basics section")
+        return resume_data
+    
+    def _extract_embedded_suggestions(self, resume_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Remove suggestions embedded in each section and return them as one list"""
+        all_suggestions = []
+        
+        basics = resume_data.get("basics")
+        if isinstance(basics, dict):
+            all_suggestions.extend(self._pop_entry_suggestions(basics, "basics"))
+        
+        for section in RESUME_LIST_SECTIONS:
+            for i, entry in enumerate(resume_data.get(section) or []):
+                if isinstance(entry, dict):
+                    all_suggestions.extend(self._pop_entry_suggestions(entry, f"{section}[{i}]"))
+        
+        return all_suggestions
+    
+    def _pop_entry_suggestions(self, entry: Dict[str, Any], location: str) -> List[Dict[str, Any]]:
+        """Remove and return the suggestions embedded in one resume entry"""
+        suggestions = entry.pop("suggestions", None) or []
+        if suggestions:
+            logger.info(f"Found {len(suggestions)} suggestions in {location}")
+        return suggestions
     
-    async def _validate_resume_node(self, state: LangGraphState) -> LangGraphState:
+    async def _validate_resume_node(self, state: LangGraphState) -> StateUpdate:
         """Validate parsed resume structure"""
         logger.info("Starting validate_resume node")
         errors = []
@@ -171,54 +227,51 @@ class ResumeParsingWorkflow:
         if not state.parsed_resume:
             errors.append("No resume data parsed")
             logger.warning("validate_resume node failed due to missing parsed_resume")
-            return LangGraphState(
-                resume_text=state.resume_text,
-                parsed_resume=state.parsed_resume,
-                suggestions=state.suggestions,
-                validation_errors=errors,
-                final_result=state.final_result,
-                error_message=state.error_message
-            )
+            return {"validation_errors": errors}
         
         resume = state.parsed_resume
         
-        # Validate basic info - only require name and email
-        if not resume.basics.name:
-            errors.append("Missing required basic info: name")
-        if not resume.basics.email:
-            errors.append("Missing required basic info: email")
-        
-        # Validate education (optional, but if present must have institution)
-        if resume.education:
-            for i, edu in enumerate(resume.education):
-                # Check if this education entry has any meaningful data
-                has_data = (edu.institution or edu.degree or edu.field_of_study or 
-                           edu.start_date or edu.end_date or edu.gpa)
-                if has_data and not edu.institution:
-                    errors.append(f"Education {i+1}: Missing institution")
-                # degree, field_of_study, start_date are optional
-        
-        # Validate work experience (optional, but if present must have company)
-        if resume.work:
-            for i, work in enumerate(resume.work):
-                # Only validate if there's both position AND description but missing company
-                # Allow entries with just position or just description
-                has_both_position_and_description = work.position and work.description
-                if has_both_position_and_description and not work.company:
-                    errors.append(f"Work experience {i+1}: Missing company")
-                # position, description, start_date are optional
+        errors.extend(self._validate_basics(resume.basics))
+        for i, edu in enumerate(resume.education):
+            errors.extend(self._validate_education_entry(i, edu))
+        for i, work in enumerate(resume.work):
+            errors.extend(self._validate_work_entry(i, work))
         
         logger.info("Completed validate_resume node")
-        return LangGraphState(
-            resume_text=state.resume_text,
-            parsed_resume=state.parsed_resume,
-            suggestions=state.suggestions,
-            validation_errors=errors,
-            final_result=state.final_result,
-            error_message=state.error_message
-        )
+        return {"validation_errors": errors}
+    
+    def _validate_basics(self, basics: BasicInfo) -> List[str]:
+        """Validate basic info - only require name and email"""
+        errors = []
+        if not basics.name:
+            errors.append("Missing required basic info: name")
+        if not basics.email:
+            errors.append("Missing required basic info: email")
+        return errors
     
-    async def _validate_suggestions_node(self, state: LangGraphState) -> LangGraphState:
+    def _validate_education_entry(self, i: int, edu: Education) -> List[str]:
+        """Validate education (optional, but if present must have institution)"""
+        errors = []
+        # Check if this education entry has any meaningful data
+        has_data = (edu.institution or edu.degree or edu.field_of_study or 
+                   edu.start_date or edu.end_date or edu.gpa)
+        if has_data and not edu.institution:
+            errors.append(f"Education {i+1}: Missing institution")
+        # degree, field_of_study, start_date are optional
+        return errors
+    
+    def _validate_work_entry(self, i: int, work: WorkExperience) -> List[str]:
+        """Validate work experience (optional, but if present must have company)"""
+        errors = []
+        # Only validate if there's both position AND description but missing company
+        # Allow entries with just position or just description
+        has_both_position_and_description = work.position and work.description
+        if has_both_position_and_description and not work.company:
+            errors.append(f"Work experience {i+1}: Missing company")
+        # position, description, start_date are optional
+        return errors
+    
+    async def _validate_suggestions_node(self, state: LangGraphState) -> StateUpdate:
         """Validate that suggestions reference valid resume fields"""
         logger.info("Starting validate_suggestions node")
         errors = []
@@ -227,14 +280,7 @@ class ResumeParsingWorkflow:
         if not state.parsed_resume or not state.suggestions:
             errors.append("No resume or suggestions data available for validation")
             logger.warning("validate_suggestions node failed due to missing parsed_resume or suggestions")
-            return LangGraphState(
-                resume_text=state.resume_text,
-                parsed_resume=state.parsed_resume,
-                suggestions=state.suggestions,
-                validation_errors=errors,
-                final_result=state.final_result,
-                error_message=state.error_message
-            )
+            return {"validation_errors": errors}
         
         resume = state.parsed_resume
         logger.info(f"Validating {len(state.suggestions)} suggestions")
@@ -252,95 +298,28 @@ class ResumeParsingWorkflow:
         
         logger.info(f"Validation completed. Valid suggestions: {len(valid_suggestions)}, Invalid: {len(errors)}")
         logger.info("Completed validate_suggestions node")
-        return LangGraphState(
-            resume_text=state.resume_text,
-            parsed_resume=state.parsed_resume,
-            suggestions=valid_suggestions,
-            validation_errors=errors,
-            final_result=state.final_result,
-            error_message=state.error_message
-        )
+        return {"suggestions": valid_suggestions, "validation_errors": errors}
     
     def _validate_field_path(self, field_path: str, resume: Resume) -> bool:
         """Validate if a field path exists in the resume"""
         try:
-            # Parse field path
-            path_parts = self._parse_field_path(field_path)
-            
-            # Navigate through the resume object
-            current = resume
-            for part in path_parts:
-                if isinstance(part, int):
-                    # Array access
-                    if not isinstance(current, list):
-                        return False
-                    # Check if array is empty or index is out of bounds
-                    if len(current) == 0 or part >= len(current):
-                        return False
-                    current = current[part]
-                else:
-                    # Object property access
-                    if not hasattr(current, part):
-                        return False
-                    current = getattr(current, part)
-            
-            return True
-        except Exception:
+            return compile_field_path(field_path).exists(resume)
+        except ValueError:
             return False
     
     def _parse_field_path(self, field_path: str) -> List:
         """Parse field path like 'work[0].description' into parts"""
-        parts = []
-        current = ""
-        i = 0
-        
-        while i < len(field_path):
-            char = field_path[i]
-            
-            if char == '.':
-                if current:
-                    parts.append(current)
-                    current = ""
-            elif char == '[':
-                if current:
-                    parts.append(current)
-                    current = ""
-                # Find closing bracket
-                j = i + 1
-                while j < len(field_path) and field_path[j] != ']':
-                    j += 1
-                if j < len(field_path):
-                    index_str = field_path[i+1:j]
-                    try:
-                        parts.append(int(index_str))
-                        i = j
-                    except ValueError:
-                        return []  # Invalid index
-                else:
-                    return []  # Missing closing bracket
-            else:
-                current += char
-            
-            i += 1
-        
-        if current:
-            parts.append(current)
-        
-        return parts
+        try:
+            return list(compile_field_path(field_path).parts)
+        except ValueError:
+            return []  # Invalid index or missing closing bracket
     
-    async def _combine_result_node(self, state: LangGraphState) -> LangGraphState:
+    async def _combine_result_node(self, state: LangGraphState) -> StateUpdate:
         """Combine resume and suggestions into final result"""
         logger.info("Starting combine_result node")
         if not state.parsed_resume:
             logger.warning("combine_result node failed due to missing parsed_resume")
-            return LangGraphState(
-                resume_text=state.resume_text,
-                parsed_resume=state.parsed_resume,
-                suggestions=state.suggestions,
-                validation_errors=state.validation_errors,
-                final_result=state.final_result,
-                error_message="No resume data available for final result"
-            )
+            return {"error_message": "No resume data available for final result"}
         
         # Keep suggestions embedded within each object
         # The resume object already has suggestions embedded in each section
@@ -382,42 +361,21 @@ class ResumeParsingWorkflow:
         )
         
         logger.info("Completed combine_result node")
-        return LangGraphState(
-            resume_text=state.resume_text,
-            parsed_resume=state.parsed_resume,
-            suggestions=all_suggestions,
-            validation_errors=state.validation_errors,
-            final_result=final_result,
-            error_message=state.error_message
-        )
+        return {"suggestions": all_suggestions, "final_result": final_result}
     
-    async def _handle_resume_error_node(self, state: LangGraphState) -> LangGraphState:
+    async def _handle_resume_error_node(self, state: LangGraphState) -> StateUpdate:
         """Handle resume validation errors"""
         logger.info("Starting handle_resume_error node")
         error_msg = "Resume structure validation failed:\n" + "\n".join(state.validation_errors)
         logger.error(f"handle_resume_error node completed with error: {error_msg}")
-        return LangGraphState(
-            resume_text=state.resume_text,
-            parsed_resume=state.parsed_resume,
-            suggestions=state.suggestions,
-            validation_errors=state.validation_errors,
-            final_result=state.final_result,
-            error_message=error_msg
-        )
+        return {"error_message": error_msg}
     
-    async def _handle_suggestion_error_node(self, state: LangGraphState) -> LangGraphState:
+    async def _handle_suggestion_error_node(self, state: LangGraphState) -> StateUpdate:
         """Handle suggestion validation errors"""
         logger.info("Starting handle_suggestion_error node")
         error_msg = "Suggestion validation failed:\n" + "\n".join(state.validation_errors)
         logger.error(f"handle_suggestion_error node completed with error: {error_msg}")
-        return LangGraphState(
-            resume_text=state.resume_text,
-            parsed_resume=state.parsed_resume,
-            suggestions=state.suggestions,
-            validation_errors=state.validation_errors,
-            final_result=state.final_result,
-            error_message=error_msg
-        )
+        return {"error_message": error_msg}
     
     def _should_continue_after_resume_validation(self, state: LangGraphState) -> str:
         """Determine next step after resume validation"""
@@ -442,74 +400,138 @@ class ResumeParsingWorkflow:
         logger.info("Starting workflow run")
         initial_state = LangGraphState(resume_text=resume_text)
         
-        # Execute the workflow
-        final_state_dict = await self.graph.ainvoke(initial_state)
+        # Execute the workflow; the output dict is read as is, not rebuilt into a state
+        final_state = await self.graph.ainvoke(initial_state)
+        error_message = final_state.get("error_message")
+        final_result = final_state.get("final_result")
         
-        # Convert dict back to LangGraphState
-        final_state = LangGraphState(**final_state_dict)
-        
-        logger.info(f"Workflow run completed. Final state: {final_state}")
+        logger.info(
+            f"Workflow run completed. Suggestions: {len(final_state.get('suggestions') or [])}, "
+            f"validation errors: {final_state.get('validation_errors')}"
+        )
         
-        if final_state.error_message:
-            logger.error(f"Workflow failed with error: {final_state.error_message}")
-            raise ValueError(final_state.error_message)
+        if error_message:
+            logger.error(f"Workflow failed with error: {error_message}")
+            raise ValueError(error_message)
         
-        if not final_state.final_result:
+        if not final_result:
             logger.warning("Workflow completed but no result generated")
             raise ValueError("Workflow completed but no result generated")
         
-        return final_state.final_result
+        return final_result
 
+    async def stream(self, resume_text: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the workflow on the LLM token stream, yielding each section as soon
+        as it has been decoded and validated.
+        
+        Events are ``basics``, ``education``/``work``/``skills``/``certificates``
+        (with ``index``) and ``suggestion``, followed by either ``result``
+        (carrying the ParseResumeResponse) or ``error``.
+        """
+        logger.info("Starting streaming workflow run")
+        decoder = JSONStreamDecoder(max_event_depth=2)
+        sections: Dict[str, Any] = {"basics": None}
+        sections.update({name: [] for name in RESUME_LIST_SECTIONS})
+        suggestions: List[Dict[str, Any]] = []
+        
+        try:
+            async for chunk in llm_client.parse_resume_stream(resume_text):
+                for path, value in decoder.feed(chunk):
+                    for event in self._section_events(path, value, sections, suggestions):
+                        yield event
+            
+            if not decoder.done:
+                # Truncated output: keep the sections that were completed
+                logger.warning("LLM output ended before the JSON was complete, using completed sections")
+            
+            parsed_resume = Resume(
+                basics=sections["basics"],
+                **{name: sections[name] for name in RESUME_LIST_SECTIONS}
+            )
+        except SectionValidationError as e:
+            logger.error(f"Streaming parse failed validation: {e}")
+            yield {"event": "error", "detail": str(e)}
+            return
+        except Exception as e:
+            logger.error(f"Error in streaming parse: {e}")
+            yield {"event": "error", "detail": f"Failed to parse resume: {str(e)}"}
+            return
+        
+        # Run the same validation steps as the graph on the assembled resume
+        state = LangGraphState(resume_text=resume_text, parsed_resume=parsed_resume, suggestions=suggestions)
+        state = state.model_copy(update=await self._validate_resume_node(state))
+        if self._should_continue_after_resume_validation(state) == "error":
+            state = state.model_copy(update=await self._handle_resume_error_node(state))
+        else:
+            state = state.model_copy(update=await self._validate_suggestions_node(state))
+            if self._should_continue_after_suggestion_validation(state) == "error":
+                state = state.model_copy(update=await self._handle_suggestion_error_node(state))
+            else:
+                state = state.model_copy(update=await self._combine_result_node(state))
+        
+        if state.error_message:
+            logger.error(f"Streaming workflow failed with error: {state.error_message}")
+            yield {"event": "error", "detail": state.error_message}
+        else:
+            logger.info("Streaming workflow run completed")
+            yield {"event": "result", "data": state.final_result}
+    
+    def _section_events(self, path: Path, value: Any, sections: Dict[str, Any],
+                        suggestions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Validate a decoded section entry and build the events it produces"""
+        if path == ("basics",) and isinstance(value, dict):
+            section, index = "basics", None
+        elif (len(path) == 2 and path[0] in RESUME_LIST_SECTIONS
+              and isinstance(path[1], int) and isinstance(value, dict)):
+            section, index = path
+        else:
+            return []
+        
+        location = section if index is None else f"{section}[{index}]"
+        entry_suggestions = self._pop_entry_suggestions(value, location)
+        entry = SECTION_MODELS[section](**value)
+        
+        if section == "basics":
+            errors = self._validate_basics(entry)
+            sections["basics"] = entry
+        else:
+            if section == "education":
+                errors = self._validate_education_entry(index, entry)
+            elif section == "work":
+                errors = self._validate_work_entry(index, entry)
+            else:
+                errors = []
+            sections[section].append(entry)
+        if errors:
+            raise SectionValidationError("Resume structure validation failed:\n" + "\n".join(errors))
+        
+        event = {"event": section, "data": entry.model_dump()}
+        if index is not None:
+            event["index"] = index
+        events = [event]
+        
+        # Suggestions that do not resolve yet are re-checked once the resume is complete
+        partial_resume = Resume.model_construct(**sections)
+        for raw_suggestion in entry_suggestions:
+            suggestions.append(raw_suggestion)
+            suggestion = Suggestion(**raw_suggestion)
+            if self._validate_field_path(suggestion.field, partial_resume):
+                events.append({"event": "suggestion", "data": suggestion.model_dump()})
+        return events
+    
     def _extract_partial_json(self, response: str) -> dict:
         """Extract partial valid JSON from truncated response"""
         logger.info("Attempting to extract partial JSON from truncated response")
         
-        # Find the last complete object by looking for balanced braces
-        brace_count = 0
-        last_complete_pos = -1
-        
-        for i, char in enumerate(response):
-            if char == '{':
-                brace_count += 1
-            elif char == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    last_complete_pos = i
-        
-        if last_complete_pos > 0:
-            # Extract the complete JSON part
-            complete_json = response[:last_complete_pos + 1]
-            logger.info(f"Extracted complete JSON ending at position {last_complete_pos}")
-            
-            try:
-                return json.loads(complete_json)
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse extracted JSON: {e}")
-        
-        # If we can't find complete JSON, try to fix common truncation issues
-        logger.warning("Could not find complete JSON, attempting to fix common truncation issues")
-        
-        # Remove incomplete suggestions arrays
-        import re
-        # Find incomplete suggestions like: "suggestions": [{"field": "skills[18].level", "current": "Proficient", "suggested": "
-        pattern = r'"suggestions":\s*\[\s*\{[^}]*"[^"]*"[^}]*$'
-        cleaned_response = re.sub(pattern, '"suggestions": []', response)
-        
-        # Remove incomplete objects at the end
-        # Find the last complete object by removing trailing incomplete content
-        lines = cleaned_response.split('\n')
-        for i in range(len(lines) - 1, -1, -1):
-            line = lines[i].strip()
-            if line.endswith('{') or line.endswith('[') or not line.endswith(','):
-                # This line is incomplete, remove it and everything after
-                cleaned_response = '\n'.join(lines[:i])
-                break
-        
-        try:
-            return json.loads(cleaned_response)
-        except json.JSONDecodeError:
+        # Keep the longest valid prefix; half-written section entries are dropped
+        resume_data = decode_partial(response, max_open_depth=1)
+        if not isinstance(resume_data, dict):
             logger.error("Failed to extract any valid JSON")
             return {}
+        
+        logger.info(f"Extracted partial JSON with keys: {list(resume_data.keys())}")
+        return resume_data
 
 
 # Global workflow instance
@@ -0,0 +1,157 @@
+"""
+Admission control for upstream LLM calls: a global and per-tenant concurrency
+cap with priority queues and load shedding
+"""
+import asyncio
+import itertools
+import math
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import AsyncIterator, Dict, List, Optional
+
+from src.llm.resilience import LLMUnavailable
+
+# Tenant (session id) of the request making LLM calls, None when unknown or shared
+current_tenant: ContextVar[Optional[str]] = ContextVar("current_tenant", default=None)
+
+
+class Priority(IntEnum):
+    """Admission priority of an LLM call, lower values are served first"""
+    CHAT = 0
+    PARSE = 1
+    SUGGESTIONS = 2
+
+
+class LLMOverloaded(LLMUnavailable):
+    """Raised when an LLM call is shed because its priority queue is full"""
+
+    def __init__(self, priority: Priority, retry_after: int):
+        super().__init__(f"LLM capacity exhausted for {priority.name.lower()} requests, retry in {retry_after}s")
+        self.priority = priority
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "tenant", "future")
+
+    def __init__(self, priority: Priority, seq: int, tenant: Optional[str], future: "asyncio.Future[None]"):
+        self.priority = priority
+        self.seq = seq
+        self.tenant = tenant
+        self.future = future
+
+
+class AdmissionController:
+    """
+    Limit concurrent upstream calls globally and per tenant.
+
+    Calls over the limit wait in per-priority queues; a freed slot goes to the
+    oldest waiter of the highest priority whose tenant is under its own limit.
+    When a priority's queue is full the call is rejected with LLMOverloaded,
+    carrying a Retry-After estimate from recent call durations.
+    """
+
+    def __init__(self, max_concurrency: int, tenant_max_concurrency: int,
+                 queue_limits: Dict[Priority, int], initial_duration: float = 5.0):
+        self.max_concurrency = max_concurrency
+        self.tenant_max_concurrency = tenant_max_concurrency
+        self.queue_limits = queue_limits
+        self.active = 0
+        self.rejected = 0
+        self._tenant_active: Counter = Counter()
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        # Moving average of how long a slot is held, for Retry-After
+        self._avg_duration = initial_duration
+
+    def queue_depth(self, priority: Priority) -> int:
+        return sum(1 for waiter in self._waiters if waiter.priority == priority)
+
+    def has_idle_capacity(self, tenant: Optional[str] = None) -> bool:
+        """Whether a call for tenant would be admitted right away with nobody waiting"""
+        return not self._waiters and self._has_capacity(tenant)
+
+    def check(self, priority: Priority, tenant: Optional[str] = None) -> None:
+        """Raise LLMOverloaded if a call of this priority would be shed right now"""
+        if not self._admits_now(tenant):
+            self._reject_if_full(priority)
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority, tenant: Optional[str] = None) -> AsyncIterator[None]:
+        """Hold one upstream call slot for the duration of the block"""
+        await self._acquire(priority, tenant)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._avg_duration = 0.8 * self._avg_duration + 0.2 * (time.monotonic() - start)
+            self._release(tenant)
+
+    async def _acquire(self, priority: Priority, tenant: Optional[str]) -> None:
+        if self._admits_now(tenant):
+            self._grant(tenant)
+            return
+
+        self._reject_if_full(priority)
+        waiter = _Waiter(priority, next(self._seq), tenant, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just before the cancellation arrived, pass the slot on
+                self._release(tenant)
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def _admits_now(self, tenant: Optional[str]) -> bool:
+        return self._has_capacity(tenant) and not any(self._eligible(waiter) for waiter in self._waiters)
+
+    def _reject_if_full(self, priority: Priority) -> None:
+        if self.queue_depth(priority) >= self.queue_limits.get(priority, 0):
+            self.rejected += 1
+            raise LLMOverloaded(priority, self._retry_after(priority))
+
+    def _has_capacity(self, tenant: Optional[str]) -> bool:
+        if self.active >= self.max_concurrency:
+            return False
+        return tenant is None or self._tenant_active[tenant] < self.tenant_max_concurrency
+
+    def _eligible(self, waiter: _Waiter) -> bool:
+        return waiter.tenant is None or self._tenant_active[waiter.tenant] < self.tenant_max_concurrency
+
+    def _grant(self, tenant: Optional[str]) -> None:
+        self.active += 1
+        if tenant is not None:
+            self._tenant_active[tenant] += 1
+
+    def _release(self, tenant: Optional[str]) -> None:
+        self.active -= 1
+        if tenant is not None:
+            self._tenant_active[tenant] -= 1
+            if not self._tenant_active[tenant]:
+                del self._tenant_active[tenant]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiters in priority order"""
+        for waiter in sorted(self._waiters, key=lambda w: (w.priority, w.seq)):
+            if self.active >= self.max_concurrency:
+                break
+            if waiter.future.done():
+                # Cancelled, but its task has not run yet to leave the queue
+                self._waiters.remove(waiter)
+                continue
+            if self._has_capacity(waiter.tenant):
+                self._waiters.remove(waiter)
+                self._grant(waiter.tenant)
+                waiter.future.set_result(None)
+
+    def _retry_after(self, priority: Priority) -> int:
+        """Seconds until the queue ahead of a new call of this priority should have drained"""
+        ahead = sum(1 for waiter in self._waiters if waiter.priority <= priority) + self.active
+        return max(1, math.ceil(self._avg_duration * ahead / self.max_concurrency))
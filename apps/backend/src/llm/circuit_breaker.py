@@ -0,0 +1,163 @@
+"""
+Circuit breaker for the upstream LLM: fail fast while it is degraded
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Tuple
+
+from src.llm.resilience import LLMUnavailable, is_retryable
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpen(LLMUnavailable):
+    """Raised instead of calling the upstream while the circuit is open"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"LLM upstream is failing, calls suspended for {retry_after}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker driven by the rolling error and slow-call rates.
+
+    Outcomes of calls in the last window seconds are kept. Once there are at
+    least min_calls of them and the share of failures reaches
+    error_rate_threshold, or the share of calls slower than slow_call_duration
+    reaches slow_rate_threshold, the circuit opens and calls fail at once with
+    CircuitOpen. After open_duration it lets half_open_max_calls probes
+    through: if they all succeed it closes, any failure reopens it.
+
+    Only upstream trouble counts as a failure (what is_retryable accepts); a
+    call rejected for its own request, or cancelled early, says nothing about
+    upstream health. A call cancelled after running slow still counts as slow.
+    """
+
+    def __init__(self, window: float = 60.0, min_calls: int = 10, error_rate_threshold: float = 0.5,
+                 slow_call_duration: float = 30.0, slow_rate_threshold: float = 0.8,
+                 open_duration: float = 30.0, half_open_max_calls: int = 2,
+                 clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_rate_threshold = slow_rate_threshold
+        self.open_duration = open_duration
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+        self.opened = 0
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        # (finished at, failed, slow)
+        self._outcomes: Deque[Tuple[float, bool, bool]] = deque()
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and self.clock() - self._opened_at >= self.open_duration:
+            self._state = CircuitState.HALF_OPEN
+            self._probes = 0
+            self._probe_successes = 0
+        return self._state
+
+    def retry_after(self) -> int:
+        """Seconds until the circuit lets calls through again"""
+        return max(1, math.ceil(self.open_duration - (self.clock() - self._opened_at)))
+
+    def check(self) -> None:
+        """Raise CircuitOpen if a call would be refused right now"""
+        state = self.state
+        if state is CircuitState.OPEN or (
+            state is CircuitState.HALF_OPEN and self._probes >= self.half_open_max_calls
+        ):
+            raise CircuitOpen(self.retry_after())
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        """Run one upstream call under the breaker, recording how it went"""
+        self.check()
+        probe = self._state is CircuitState.HALF_OPEN
+        if probe:
+            self._probes += 1
+        start = self.clock()
+        try:
+            yield
+        except BaseException as e:
+            duration = self.clock() - start
+            if isinstance(e, Exception) and is_retryable(e):
+                self._record(failed=True, duration=duration, probe=probe)
+            elif probe:
+                # Not a verdict on upstream health, give the probe back
+                self._probes -= 1
+            elif isinstance(e, asyncio.CancelledError) and duration >= self.slow_call_duration:
+                # Abandoned by a deadline or a faster hedge, still a slow call
+                self._record(failed=False, duration=duration, probe=False)
+            raise
+        else:
+            self._record(failed=False, duration=self.clock() - start, probe=probe)
+
+    def _record(self, failed: bool, duration: float, probe: bool) -> None:
+        if probe:
+            if failed:
+                self._open()
+            else:
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_max_calls:
+                    self._state = CircuitState.CLOSED
+                    self._outcomes.clear()
+            return
+        if self._state is not CircuitState.CLOSED:
+            # A call admitted before the circuit opened; the probes decide now
+            return
+
+        self._outcomes.append((self.clock(), failed, duration >= self.slow_call_duration))
+        self._prune()
+        if len(self._outcomes) < self.min_calls:
+            return
+        error_rate, slow_rate = self._rates()
+        if error_rate >= self.error_rate_threshold or slow_rate >= self.slow_rate_threshold:
+            self._open()
+
+    def _prune(self) -> None:
+        now = self.clock()
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+
+    def _rates(self) -> Tuple[float, float]:
+        self._prune()
+        if not self._outcomes:
+            return 0.0, 0.0
+        failures = sum(1 for _, failed, _ in self._outcomes if failed)
+        slow = sum(1 for _, _, is_slow in self._outcomes if is_slow)
+        return failures / len(self._outcomes), slow / len(self._outcomes)
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = self.clock()
+        self._outcomes.clear()
+        self.opened += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State and rolling rates, for /healthz"""
+        state = self.state
+        error_rate, slow_rate = self._rates()
+        snapshot: Dict[str, Any] = {
+            "state": state.value,
+            "calls": len(self._outcomes),
+            "error_rate": round(error_rate, 3),
+            "slow_rate": round(slow_rate, 3),
+            "opened": self.opened,
+        }
+        if state is CircuitState.OPEN:
+            snapshot["retry_after"] = self.retry_after()
+        return snapshot
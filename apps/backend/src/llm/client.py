@@ -1,36 +1,195 @@
+import asyncio
 import json
 import os
-from typing import Dict, Any, List
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, List, Optional
 import logging
 
-from openai import OpenAI
-from src.config import DASHSCOPE_API_KEY
-from src.llm.prompts import RESUME_PARSE_PROMPT, CHAT_PROMPT, build_parse_resume_messages
+import httpx
+from openai import AsyncOpenAI
+from src.config import (
+    DASHSCOPE_API_KEY, LLM_BASE_URL, LLM_MODEL, LLM_TIMEOUT, LLM_CONNECT_TIMEOUT,
+    LLM_MAX_CONNECTIONS, LLM_MAX_KEEPALIVE_CONNECTIONS, LLM_KEEPALIVE_EXPIRY, PARSE_SECTION_MAX_TOKENS,
+    LLM_MAX_CONCURRENCY, LLM_TENANT_MAX_CONCURRENCY, LLM_QUEUE_LIMIT_CHAT, LLM_QUEUE_LIMIT_PARSE,
+    LLM_QUEUE_LIMIT_SUGGESTIONS, LLM_MAX_ATTEMPTS, LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY,
+    LLM_HEDGE, LLM_HEDGE_QUANTILE, LLM_HEDGE_MIN_DELAY, LLM_BREAKER_WINDOW, LLM_BREAKER_MIN_CALLS,
+    LLM_BREAKER_ERROR_RATE, LLM_BREAKER_SLOW_CALL_SECONDS, LLM_BREAKER_SLOW_RATE, LLM_BREAKER_OPEN_SECONDS,
+    LLM_BREAKER_HALF_OPEN_CALLS
+)
+from src.intent import intent_matcher
+from src.llm.admission import AdmissionController, Priority, current_tenant
+from src.llm.circuit_breaker import CircuitBreaker
+from src.llm.resilience import RetryPolicy
+from src.llm.singleflight import SingleFlight, request_key
+from src.llm.prompts import (
+    RESUME_PARSE_PROMPT, CHAT_PROMPT, CHAT_ROUTER_PROMPT, build_parse_resume_messages,
+    build_parse_section_messages, build_generate_suggestions_messages
+)
 
 logger = logging.getLogger(__name__)
 
+# Chunk size used to simulate token streaming with the mock LLM
+MOCK_STREAM_CHUNK_SIZE = 32
+# Chat replies are short, so the mock streams them a few characters at a time
+MOCK_CHAT_STREAM_CHUNK_SIZE = 4
+
+
+def build_admission() -> AdmissionController:
+    """Build the admission controller shared by all upstream LLM calls on this worker"""
+    return AdmissionController(
+        max_concurrency=LLM_MAX_CONCURRENCY,
+        tenant_max_concurrency=LLM_TENANT_MAX_CONCURRENCY,
+        queue_limits={
+            Priority.CHAT: LLM_QUEUE_LIMIT_CHAT,
+            Priority.PARSE: LLM_QUEUE_LIMIT_PARSE,
+            Priority.SUGGESTIONS: LLM_QUEUE_LIMIT_SUGGESTIONS,
+        },
+    )
+
+
+def build_retry_policy() -> RetryPolicy:
+    """Build the retry, deadline and hedging policy for upstream LLM calls"""
+    return RetryPolicy(
+        max_attempts=LLM_MAX_ATTEMPTS,
+        base_delay=LLM_RETRY_BASE_DELAY,
+        max_delay=LLM_RETRY_MAX_DELAY,
+        hedge=LLM_HEDGE,
+        hedge_quantile=LLM_HEDGE_QUANTILE,
+        hedge_min_delay=LLM_HEDGE_MIN_DELAY,
+    )
+
+
+def build_circuit_breaker() -> CircuitBreaker:
+    """Build the circuit breaker guarding the LLM upstream"""
+    return CircuitBreaker(
+        window=LLM_BREAKER_WINDOW,
+        min_calls=LLM_BREAKER_MIN_CALLS,
+        error_rate_threshold=LLM_BREAKER_ERROR_RATE,
+        slow_call_duration=LLM_BREAKER_SLOW_CALL_SECONDS,
+        slow_rate_threshold=LLM_BREAKER_SLOW_RATE,
+        open_duration=LLM_BREAKER_OPEN_SECONDS,
+        half_open_max_calls=LLM_BREAKER_HALF_OPEN_CALLS,
+    )
+
+
+def build_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """Build the shared, pooled async HTTP client used for all LLM calls"""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+        transport=transport,
+    )
+
+
 class LLMClient:
     """LLM client for interacting with language models"""
     
-    def __init__(self):
+    def __init__(self, api_key: Optional[str] = DASHSCOPE_API_KEY,
+                 http_client: Optional[httpx.AsyncClient] = None,
+                 admission: Optional[AdmissionController] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None):
         """Initialize LLM client with DashScope API"""
-        if DASHSCOPE_API_KEY:
-            self.client = OpenAI(
-                api_key=DASHSCOPE_API_KEY,
-                base_url="https://dashscope.aliyuncs.com/compatible-mode/v1",
+        self.model = LLM_MODEL
+        # Caps concurrent upstream calls; chat is admitted before parsing and suggestions
+        self.admission = admission or build_admission()
+        # Retries, request deadlines and hedging; failures surface as LLMUnavailable
+        self.retry_policy = retry_policy or build_retry_policy()
+        # Fails calls fast while the upstream is erroring or hanging
+        self.breaker = breaker or build_circuit_breaker()
+        # Concurrent identical requests share one upstream call
+        self.single_flight = SingleFlight()
+        if api_key:
+            # One pooled keep-alive client is shared by every request on this worker,
+            # so concurrent completions never block the event loop or each other.
+            self.http_client = http_client or build_http_client()
+            self.client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=LLM_BASE_URL,
+                http_client=self.http_client,
+                # Retries are done by retry_policy, with jitter and within the deadline
+                max_retries=0,
             )
             self.use_real_llm = True
             print("Using real LLM implementation")
         else:
+            self.http_client = None
             self.client = None
             self.use_real_llm = False
             print("Warning: DASHSCOPE_API_KEY not found, using mock implementation")
     
+    @property
+    def model_id(self) -> str:
+        """Identifier of the model that actually produces responses"""
+        return self.model if self.use_real_llm else "mock"
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections"""
+        if self.client is not None:
+            await self.client.close()
+    
+    def check_admission(self, priority: Priority) -> None:
+        """
+        Raise CircuitOpen or LLMOverloaded if a call of this priority would be
+        refused right now, so streaming endpoints can answer with 503/429
+        before their first byte instead of with an error event
+        """
+        if not self.use_real_llm:
+            return
+        self.breaker.check()
+        self.admission.check(priority, current_tenant.get())
+    
+    async def _coalesced(self, messages: List[Dict[str, str]], temperature: float,
+                         fn: Callable[[], Awaitable[str]]) -> str:
+        """Run fn once for all concurrent callers with the same request key"""
+        key = request_key(messages, self.model_id, temperature)
+        return await self.single_flight.do(key, fn)
+    
+    async def _complete(self, messages: List[Dict[str, str]], temperature: float = 0.2,
+                        max_tokens: Optional[int] = None, *, priority: Priority) -> str:
+        """
+        Send a chat completion request through the shared async client, retrying
+        failed attempts; every attempt (hedges included) is admitted separately
+        """
+        params: Dict[str, Any] = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        if max_tokens is not None:
+            params["max_tokens"] = max_tokens
+        tenant = current_tenant.get()
+        
+        async def attempt():
+            # Refuse before queueing for a slot, and again once admitted
+            self.breaker.check()
+            async with self.admission.slot(priority, tenant):
+                async with self.breaker.guard():
+                    return await self.client.chat.completions.create(**params)
+        
+        response = await self.retry_policy.call(
+            attempt,
+            kind=f"{priority.name.lower()}:{max_tokens}",
+            # A hedge that would have to queue only adds load
+            hedge_if=lambda: self.admission.has_idle_capacity(tenant),
+        )
+        # Only the id and token usage: the full response object can run to tens of KB
+        logger.info("[LLMClient] Completion %s, usage: %s", response.id, response.usage)
+        return response.choices[0].message.content or ""
+    
     async def parse_resume(self, resume_text: str) -> str:
         """
         Parse resume text and return structured JSON
         """
         logger.info(f"[LLMClient] parse_resume called. Input text (first 200 chars): {resume_text[:200]}")
+        messages = build_parse_resume_messages(resume_text)
+        return await self._coalesced(messages, 0.2, lambda: self._parse_resume(resume_text))
+    
+    async def _parse_resume(self, resume_text: str) -> str:
+        """Parse resume text with the real or mock LLM"""
         try:
             if self.use_real_llm:
                 logger.info("[LLMClient] Using real LLM API for resume parsing.")
@@ -47,26 +206,69 @@ class LLMClient:
     async def _call_real_llm(self, resume_text: str) -> str:
         """Call real DashScope LLM API"""
         logger.info(f"[LLMClient] _call_real_llm called. Input text (first 200 chars): {resume_text[:200]}")
-        try:
-            messages = build_parse_resume_messages(resume_text)
-            
-            response = self.client.chat.completions.create(
-                model="qwen-turbo-latest",
-                messages=messages,
-                temperature=0.2,
-                max_tokens=8000,  # Increased from 2048 to handle longer resumes
+        messages = build_parse_resume_messages(resume_text)
+        
+        # Failures raise LLMUnavailable: mock data is never passed off as a real parse
+        content = await self._complete(
+            messages,
+            temperature=0.2,
+            max_tokens=8000,  # Increased from 2048 to handle longer resumes
+            priority=Priority.PARSE,
+        )
+        logger.info(f"[LLMClient] Extracted content (first 1000 chars): {content[:1000]}")
+        return content
+    
+    async def parse_resume_section(self, section: str, text: str) -> str:
+        """
+        Extract one resume section (basics, education, work, skills or certificates)
+        and return its JSON: an object for basics, an array for the others
+        """
+        logger.info(f"[LLMClient] parse_resume_section called for {section}. Input length: {len(text)}")
+        messages = build_parse_section_messages(section, text)
+        return await self._coalesced(messages, 0.2, lambda: self._parse_resume_section(section, messages))
+    
+    async def _parse_resume_section(self, section: str, messages: List[Dict[str, str]]) -> str:
+        """Extract one section with the real or mock LLM"""
+        if self.use_real_llm:
+            return await self._complete(
+                messages, temperature=0.2, max_tokens=PARSE_SECTION_MAX_TOKENS, priority=Priority.PARSE
             )
-            logger.info(f"[LLMClient] OpenAI API response: {response}")
-            content = response.choices[0].message.content
-            logger.info(f"[LLMClient] Extracted content (first 1000 chars): {content[:1000]}")
-            return content
-        except Exception as e:
-            logger.error(f"[LLMClient] Error calling real LLM: {e}")
-            logger.error(f"[LLMClient] Error type: {type(e).__name__}")
-            logger.error(f"[LLMClient] Error details: {str(e)}")
-            # Fallback to mock implementation
-            logger.warning("[LLMClient] Falling back to mock implementation")
-            return await self._call_mock_llm(resume_text)
+        mock_resume = json.loads(await self._call_mock_llm(messages[-1]["content"]))
+        return json.dumps(mock_resume[section], ensure_ascii=False)
+    
+    async def parse_resume_stream(self, resume_text: str) -> AsyncIterator[str]:
+        """
+        Parse resume text and yield the structured JSON as it is generated
+        """
+        logger.info(f"[LLMClient] parse_resume_stream called. Input text (first 200 chars): {resume_text[:200]}")
+        if self.use_real_llm:
+            # The slot is held until the stream is fully read; only opening the stream
+            # is retried, output already handed out cannot be taken back
+            async def open_stream():
+                async with self.breaker.guard():
+                    return await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=build_parse_resume_messages(resume_text),
+                        temperature=0.2,
+                        max_tokens=8000,
+                        stream=True,
+                    )
+            
+            self.breaker.check()
+            async with self.admission.slot(Priority.PARSE, current_tenant.get()):
+                stream = await self.retry_policy.call(open_stream, kind="parse_stream")
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+            return
+        
+        response = await self._call_mock_llm(resume_text)
+        for start in range(0, len(response), MOCK_STREAM_CHUNK_SIZE):
+            yield response[start:start + MOCK_STREAM_CHUNK_SIZE]
+            await asyncio.sleep(0)
     
     async def _call_mock_llm(self, resume_text: str) -> str:
         """Mock implementation for development/testing"""
@@ -220,7 +422,14 @@ class LLMClient:
         Generate optimization suggestions based on resume data
         """
         logger.info(f"[LLMClient] generate_suggestions called. Resume data keys: {list(resume_data.keys())}")
-        # Mock implementation - in production, this would call actual LLM API
+        messages = build_generate_suggestions_messages(resume_data)
+        return await self._coalesced(messages, 0.2, lambda: self._generate_suggestions(messages))
+    
+    async def _generate_suggestions(self, messages: List[Dict[str, str]]) -> str:
+        """Generate suggestions with the real or mock LLM"""
+        if self.use_real_llm:
+            return await self._complete(messages, temperature=0.2, priority=Priority.SUGGESTIONS)
+        # Mock implementation
         # This method is now less important since suggestions are embedded in the resume data
         mock_suggestions = [
             {
@@ -250,25 +459,83 @@ class LLMClient:
         """
         Process chat prompt and return response
         """
-        # Mock implementation - in production, this would call actual LLM API
+        messages = [{"role": "user", "content": prompt}]
+        return await self._coalesced(messages, 0, lambda: self._chat(messages))
+    
+    async def _chat(self, messages: List[Dict[str, str]]) -> str:
+        """Route a chat prompt with the real or mock LLM"""
+        prompt = messages[-1]["content"]
+        if self.use_real_llm:
+            content = await self._complete(messages, temperature=0, priority=Priority.CHAT)
+            return content.strip()
         
-        if "建议" in prompt or "改进" in prompt or "优化" in prompt:
-            return "request_suggestion"
-        elif "确认" in prompt or "同意" in prompt or "接受" in prompt:
-            return "confirm_suggestion"
-        elif "拒绝" in prompt or "不同意" in prompt or "不要" in prompt:
-            return "reject_suggestion"
-        elif "你好" in prompt or "您好" in prompt:
-            return "chat"
-        else:
-            return "chat"
+        # Mock implementation
+        return intent_matcher.classify(prompt)
+    
+    async def route_intent(self, user_text: str, history: str, resume: str) -> str:
+        """
+        Ask the LLM which chat intent user_text has (only the bare intent is returned)
+        """
+        prompt = CHAT_ROUTER_PROMPT.format(user_text=user_text, history=history, resume=resume)
+        messages = [{"role": "user", "content": prompt}]
+        return await self._coalesced(messages, 0, lambda: self._route_intent(messages, user_text))
+    
+    async def _route_intent(self, messages: List[Dict[str, str]], user_text: str) -> str:
+        """Route a chat turn with the real or mock LLM"""
+        if self.use_real_llm:
+            content = await self._complete(messages, temperature=0, max_tokens=16, priority=Priority.CHAT)
+            return content.strip().strip("\"'`").strip()
+        
+        # Mock implementation
+        return intent_matcher.classify(user_text)
     
     async def chat_response(self, prompt: str) -> str:
         """
         Generate chat response (not routing)
         """
-        # Mock implementation - in production, this would call actual LLM API
+        messages = [{"role": "user", "content": prompt}]
+        return await self._coalesced(messages, 0.7, lambda: self._chat_response(messages))
+    
+    async def _chat_response(self, messages: List[Dict[str, str]]) -> str:
+        """Generate a chat response with the real or mock LLM"""
+        if self.use_real_llm:
+            return await self._complete(messages, temperature=0.7, priority=Priority.CHAT)
+        return self._mock_chat_response(messages[-1]["content"])
+    
+    async def chat_response_stream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Generate a chat response, yielding tokens as they are generated
+        """
+        messages = [{"role": "user", "content": prompt}]
+        if self.use_real_llm:
+            # As in parse_resume_stream: only opening the stream is retried
+            async def open_stream():
+                async with self.breaker.guard():
+                    return await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=0.7,
+                        stream=True,
+                    )
+            
+            self.breaker.check()
+            async with self.admission.slot(Priority.CHAT, current_tenant.get()):
+                stream = await self.retry_policy.call(open_stream, kind="chat_stream")
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+            return
         
+        response = self._mock_chat_response(prompt)
+        for start in range(0, len(response), MOCK_CHAT_STREAM_CHUNK_SIZE):
+            yield response[start:start + MOCK_CHAT_STREAM_CHUNK_SIZE]
+            await asyncio.sleep(0)
+    
+    def _mock_chat_response(self, prompt: str) -> str:
+        """Mock chat response for development/testing"""
         if "你好" in prompt or "您好" in prompt:
             return "您好！我是您的简历优化助手。我可以帮您分析简历、提供改进建议，或者回答关于简历的任何问题。请告诉我您需要什么帮助？"
         else:
@@ -0,0 +1,281 @@
+"""
+Incremental JSON decoder for streamed LLM output
+"""
+import json
+import re
+from typing import Any, List, Optional, Tuple, Union
+
+PathPart = Union[str, int]
+Path = Tuple[PathPart, ...]
+
+# Characters that can appear inside a number / true / false / null token
+_LITERAL_CHARS = frozenset("0123456789+-.eEtruefalsn")
+_WHITESPACE = frozenset(" \t\r\n")
+_STRING_SPECIAL = re.compile(r'["\\]')
+# LLMs sometimes emit raw control characters (e.g. newlines) inside strings
+_STRING_DECODER = json.JSONDecoder(strict=False)
+
+
+class JSONStreamError(ValueError):
+    """Raised when the streamed text is not valid JSON"""
+
+
+class _Frame:
+    """An open object or array on the decoder stack"""
+    __slots__ = ("container", "path", "key", "expect")
+
+    def __init__(self, container: Union[dict, list], path: Path):
+        self.container = container
+        self.path = path
+        self.key: Optional[str] = None
+        # object: key -> colon -> value -> comma ; array: value -> comma
+        self.expect = "key" if isinstance(container, dict) else "value"
+
+
+class JSONStreamDecoder:
+    """
+    Decode a JSON document from text chunks as they arrive.
+
+    The decoder builds the document tree in a single pass and reports every
+    value that completes at a depth of at most ``max_event_depth`` (the root
+    has depth 0, ``basics`` depth 1, ``work[0]`` depth 2), so callers can act
+    on finished sections without waiting for the whole document.
+    Text before the first ``{`` or ``[`` (e.g. a markdown fence) is ignored.
+    """
+
+    def __init__(self, max_event_depth: int = 2):
+        self.max_event_depth = max_event_depth
+        self._stack: List[_Frame] = []
+        self._root: Any = None
+        self._started = False
+        self._done = False
+        # Current scalar token: None, "string" or "literal"
+        self._token_kind: Optional[str] = None
+        self._token_parts: List[str] = []
+        self._escape = False
+
+    @property
+    def done(self) -> bool:
+        """Whether the root value has been fully decoded"""
+        return self._done
+
+    @property
+    def value(self) -> Any:
+        """The decoded root value (live, possibly incomplete)"""
+        return self._root
+
+    def snapshot(self, max_open_depth: Optional[int] = None) -> Any:
+        """
+        Return a copy of the longest valid prefix decoded so far.
+
+        Open containers are closed and unfinished keys, strings and literals
+        are dropped. Containers still open deeper than ``max_open_depth`` are
+        dropped as a whole, which discards half-written entries.
+        """
+        if self._root is None:
+            return None
+        open_depths = {id(frame.container): len(frame.path) for frame in self._stack}
+
+        def keep(value: Any) -> bool:
+            if max_open_depth is None or id(value) not in open_depths:
+                return True
+            return open_depths[id(value)] <= max_open_depth
+
+        def copy(value: Any) -> Any:
+            if isinstance(value, dict):
+                return {k: copy(v) for k, v in value.items() if keep(v)}
+            if isinstance(value, list):
+                return [copy(v) for v in value if keep(v)]
+            return value
+
+        return copy(self._root)
+
+    def feed(self, chunk: str) -> List[Tuple[Path, Any]]:
+        """Consume a chunk of text and return the values completed by it"""
+        events: List[Tuple[Path, Any]] = []
+        i = 0
+        n = len(chunk)
+
+        while i < n and not self._done:
+            if self._token_kind == "string":
+                i = self._scan_string(chunk, i, events)
+                continue
+
+            char = chunk[i]
+
+            if self._token_kind == "literal":
+                if char in _LITERAL_CHARS:
+                    self._token_parts.append(char)
+                    i += 1
+                    continue
+                self._finish_literal(events)
+                if self._done:
+                    break
+
+            if not self._started:
+                if char == "{" or char == "[":
+                    self._started = True
+                else:
+                    i += 1
+                    continue
+
+            if char in _WHITESPACE:
+                pass
+            elif char == "{":
+                self._open({}, events)
+            elif char == "[":
+                self._open([], events)
+            elif char == "}" or char == "]":
+                self._close(char, events)
+            elif char == ":":
+                frame = self._top()
+                if frame is None or frame.expect != "colon":
+                    raise JSONStreamError("Unexpected ':'")
+                frame.expect = "value"
+            elif char == ",":
+                frame = self._top()
+                if frame is None or frame.expect != "comma":
+                    raise JSONStreamError("Unexpected ','")
+                frame.expect = "key" if isinstance(frame.container, dict) else "value"
+            elif char == '"':
+                self._expect_token(is_key_allowed=True)
+                self._token_kind = "string"
+                self._token_parts = ['"']
+                self._escape = False
+            elif char in _LITERAL_CHARS:
+                self._expect_token(is_key_allowed=False)
+                self._token_kind = "literal"
+                self._token_parts = [char]
+            else:
+                raise JSONStreamError(f"Unexpected character {char!r}")
+            i += 1
+
+        return events
+
+    def _scan_string(self, chunk: str, i: int, events: List[Tuple[Path, Any]]) -> int:
+        """Advance through string contents, returning the next index to process"""
+        n = len(chunk)
+        while i < n:
+            if self._escape:
+                self._token_parts.append(chunk[i])
+                self._escape = False
+                i += 1
+                continue
+            match = _STRING_SPECIAL.search(chunk, i)
+            if match is None:
+                self._token_parts.append(chunk[i:])
+                return n
+            end = match.start()
+            self._token_parts.append(chunk[i:end + 1])
+            i = end + 1
+            if match.group() == "\\":
+                self._escape = True
+            else:
+                token = "".join(self._token_parts)
+                try:
+                    text = _STRING_DECODER.decode(token)
+                except json.JSONDecodeError as e:
+                    raise JSONStreamError(f"Invalid string {token[:50]!r}") from e
+                self._token_kind = None
+                self._token_parts = []
+                frame = self._top()
+                if frame is not None and frame.expect == "key":
+                    frame.key = text
+                    frame.expect = "colon"
+                else:
+                    self._add_value(text, events)
+                return i
+        return i
+
+    def _finish_literal(self, events: List[Tuple[Path, Any]]) -> None:
+        """Decode a completed number / true / false / null token"""
+        token = "".join(self._token_parts)
+        self._token_kind = None
+        self._token_parts = []
+        try:
+            value = json.loads(token)
+        except json.JSONDecodeError as e:
+            raise JSONStreamError(f"Invalid literal {token!r}") from e
+        self._add_value(value, events)
+
+    def _top(self) -> Optional[_Frame]:
+        return self._stack[-1] if self._stack else None
+
+    def _expect_token(self, is_key_allowed: bool) -> None:
+        """Check that a value (or key, for strings) may start here"""
+        frame = self._top()
+        if frame is None:
+            if self._root is not None:
+                raise JSONStreamError("Unexpected data after root value")
+            return
+        if frame.expect == "value" or (is_key_allowed and frame.expect == "key"):
+            return
+        raise JSONStreamError(f"Unexpected token while expecting {frame.expect}")
+
+    def _child_path(self, frame: Optional[_Frame]) -> Path:
+        if frame is None:
+            return ()
+        if isinstance(frame.container, dict):
+            return frame.path + (frame.key,)
+        return frame.path + (len(frame.container),)
+
+    def _attach(self, value: Any) -> Path:
+        """Attach a value to the current container and return its path"""
+        frame = self._top()
+        path = self._child_path(frame)
+        if frame is None:
+            self._root = value
+        elif isinstance(frame.container, dict):
+            frame.container[frame.key] = value
+            frame.key = None
+            frame.expect = "comma"
+        else:
+            frame.container.append(value)
+            frame.expect = "comma"
+        return path
+
+    def _open(self, container: Union[dict, list], events: List[Tuple[Path, Any]]) -> None:
+        self._expect_token(is_key_allowed=False)
+        path = self._attach(container)
+        self._stack.append(_Frame(container, path))
+
+    def _close(self, char: str, events: List[Tuple[Path, Any]]) -> None:
+        frame = self._top()
+        if frame is None:
+            raise JSONStreamError(f"Unexpected {char!r}")
+        is_object = isinstance(frame.container, dict)
+        if (char == "}") != is_object:
+            raise JSONStreamError(f"Mismatched {char!r}")
+        # Allow closing an empty container, or after a complete value
+        if frame.expect not in ("comma", "key" if is_object else "value") or (
+            frame.expect != "comma" and frame.container
+        ):
+            raise JSONStreamError(f"Unexpected {char!r}")
+        self._stack.pop()
+        self._emit(frame.path, frame.container, events)
+
+    def _add_value(self, value: Any, events: List[Tuple[Path, Any]]) -> None:
+        self._expect_token(is_key_allowed=False)
+        path = self._attach(value)
+        self._emit(path, value, events)
+
+    def _emit(self, path: Path, value: Any, events: List[Tuple[Path, Any]]) -> None:
+        if len(path) <= self.max_event_depth:
+            events.append((path, value))
+        if not path:
+            self._done = True
+
+
+def decode_partial(text: str, max_open_depth: Optional[int] = None) -> Any:
+    """
+    Decode the longest valid JSON prefix of ``text`` in a single pass.
+
+    Decoding stops at the first syntax error; everything before it is kept.
+    Returns None if no JSON document starts in the text.
+    """
+    decoder = JSONStreamDecoder(max_event_depth=-1)
+    try:
+        decoder.feed(text)
+    except JSONStreamError:
+        pass
+    return decoder.snapshot(max_open_depth=max_open_depth)
@@ -1,7 +1,12 @@
 """
 Prompt templates for LLM interactions
 """
-from typing import List, Dict
+import json
+from typing import Any, List, Dict
+
+# Bump whenever the resume parsing prompt changes, so cached parse results are not reused
+PARSE_RESUME_PROMPT_VERSION = "1"
+
 
 def build_parse_resume_messages(text: str) -> List[Dict[str, str]]:
     """Build messages for resume parsing with LLM"""
@@ -131,6 +136,126 @@ def build_parse_resume_messages(text: str) -> List[Dict[str, str]]:
     ]
 
 
+
+# Output format of each section when it is extracted on its own
+SECTION_FORMATS = {
+    "basics": """{
+    "name": "姓名",
+    "email": "邮箱",
+    "phone": "电话",
+    "location": "地点",
+    "summary": "个人简介",
+    "suggestions": [
+        {"field": "basics.summary", "current": "当前内容", "suggested": "建议内容", "reason": "改进理由"}
+    ]
+}""",
+    "education": """[
+    {
+        "institution": "学校名称",
+        "degree": "学位",
+        "field_of_study": "专业",
+        "start_date": "开始时间",
+        "end_date": "结束时间",
+        "gpa": "GPA",
+        "courses": ["相关课程"],
+        "suggestions": [
+            {"field": "education[0].gpa", "current": "当前内容", "suggested": "建议内容", "reason": "改进理由"}
+        ]
+    }
+]""",
+    "work": """[
+    {
+        "company": "公司名称",
+        "position": "职位",
+        "start_date": "开始时间",
+        "end_date": "结束时间",
+        "description": "工作描述",
+        "achievements": ["成就列表"],
+        "suggestions": [
+            {"field": "work[0].description", "current": "当前内容", "suggested": "建议内容", "reason": "改进理由"}
+        ]
+    }
+]""",
+    "skills": """[
+    {
+        "name": "技能名称",
+        "level": "熟练程度",
+        "category": "技能类别",
+        "suggestions": [
+            {"field": "skills[0].level", "current": "当前内容", "suggested": "建议内容", "reason": "改进理由"}
+        ]
+    }
+]""",
+    "certificates": """[
+    {
+        "name": "证书名称",
+        "issuer": "颁发机构",
+        "date": "获得时间",
+        "description": "证书描述",
+        "suggestions": [
+            {"field": "certificates[0].description", "current": "当前内容", "suggested": "建议内容", "reason": "改进理由"}
+        ]
+    }
+]""",
+}
+
+SECTION_NAMES = {
+    "basics": "基本信息",
+    "education": "教育背景",
+    "work": "工作经历",
+    "skills": "技能",
+    "certificates": "证书",
+}
+
+
+def build_parse_section_messages(section: str, text: str) -> List[Dict[str, str]]:
+    """Build messages for extracting one resume section, used by section-parallel parsing"""
+    name = SECTION_NAMES[section]
+    return [
+        {
+            "role": "system",
+            "content": f"""你是一个专业的简历解析助手，负责从简历的「{name}」部分提取结构化信息并生成改进建议。
+
+返回格式要求：
+- 只返回有效的JSON，不要包含任何额外的说明文字
+- suggestions 字段嵌入在各个对象中，字段路径从 {section} 开始，下标从 0 开始
+- 如果信息不足，字段可以为空字符串
+- 建议只能引用实际存在的非空字段，suggested 为修改后的简历内容"""
+        },
+        {
+            "role": "user",
+            "content": f"""请解析以下简历「{name}」部分：
+
+{text}
+
+请按照以下JSON格式返回结果：
+{SECTION_FORMATS[section]}"""
+        }
+    ]
+
+def build_generate_suggestions_messages(resume_data: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Build messages for generating suggestions on an already parsed resume"""
+    resume_json = json.dumps(resume_data, ensure_ascii=False)
+    return [
+        {
+            "role": "system",
+            "content": """你是一个专业的简历优化助手，负责为结构化简历生成改进建议。
+
+返回格式要求：
+- 只返回有效的JSON数组，不要包含任何额外的说明文字
+- 每个元素包含 field、current、suggested、reason 四个字段
+- field 使用字段路径格式：basics.summary, work[0].description, skills[0].level 等
+- 建议只能引用实际存在的非空字段
+- suggested 为修改后的简历内容，而不是修改动作"""
+        },
+        {
+            "role": "user",
+            "content": f"""请为以下简历生成改进建议：
+
+{resume_json}"""
+        }
+    ]
+
 # 保留原有的 prompt 字符串用于兼容性
 RESUME_PARSE_PROMPT = """
 请分析以下简历文本，提取结构化信息并生成改进建议。
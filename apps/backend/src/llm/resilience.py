@@ -0,0 +1,176 @@
+"""
+Retries, deadlines and hedging for upstream LLM calls
+"""
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Deque, Dict, Iterator, Optional, TypeVar
+
+import httpx
+import openai
+
+T = TypeVar("T")
+
+# time.monotonic() by which the current HTTP request wants its LLM work done, None for no limit
+current_deadline: ContextVar[Optional[float]] = ContextVar("current_deadline", default=None)
+
+
+class LLMUnavailable(Exception):
+    """Raised when the upstream LLM could not produce a result"""
+
+
+class LLMDeadlineExceeded(LLMUnavailable):
+    """Raised when the request's deadline passes before the LLM answered"""
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left until the current deadline, None when there is none"""
+    deadline = current_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Bound the LLM work in this block to seconds, or less if an outer deadline is sooner"""
+    new_deadline = time.monotonic() + seconds
+    outer = current_deadline.get()
+    token = current_deadline.set(new_deadline if outer is None else min(outer, new_deadline))
+    try:
+        yield
+    finally:
+        current_deadline.reset(token)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether a failed attempt may succeed when repeated: timeouts, connection errors, 408/409/429/5xx"""
+    if isinstance(exc, (openai.APIConnectionError, httpx.TransportError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code in (408, 409, 429) or exc.status_code >= 500
+    return False
+
+
+class LatencyTracker:
+    """Durations of recent successful attempts, for the hedging delay"""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, duration: float) -> None:
+        self._samples.append(duration)
+
+    def quantile(self, q: float) -> float:
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+
+class RetryPolicy:
+    """
+    Run an upstream call with bounded retries, a deadline and optional hedging.
+
+    Retryable failures are repeated up to max_attempts times, sleeping with
+    decorrelated jitter (uniform between base_delay and three times the
+    previous sleep, capped at max_delay) so retries from many requests do not
+    arrive in waves. No attempt or sleep outlives the current deadline.
+
+    With hedging on, an attempt still running after the hedge_quantile
+    latency of recent calls of the same kind gets a second, concurrent
+    attempt; the first to succeed wins and the other is cancelled.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 hedge: bool = False, hedge_quantile: float = 0.95, hedge_min_delay: float = 1.0,
+                 hedge_min_samples: int = 20, rng: Optional[random.Random] = None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_min_samples = hedge_min_samples
+        self.rng = rng or random.Random()
+        self.retries = 0
+        self.hedged = 0
+        self._latencies: Dict[str, LatencyTracker] = {}
+
+    def backoff(self, previous: float) -> float:
+        """The next sleep after sleeping previous seconds (decorrelated jitter)"""
+        return min(self.max_delay, self.rng.uniform(self.base_delay, max(self.base_delay, previous * 3)))
+
+    def hedge_delay(self, kind: str) -> Optional[float]:
+        """How long to wait before hedging a call of this kind, None to not hedge"""
+        latencies = self._latencies.get(kind)
+        if not self.hedge or latencies is None or len(latencies) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay, latencies.quantile(self.hedge_quantile))
+
+    async def call(self, fn: Callable[[], Awaitable[T]], kind: str = "default",
+                   hedge_if: Optional[Callable[[], bool]] = None) -> T:
+        """
+        Call fn until it succeeds, raising LLMUnavailable (or LLMDeadlineExceeded)
+        once the attempts or the deadline run out. hedge_if is asked before each
+        hedge, so hedges can be skipped when they would only add load.
+        """
+        delay = self.base_delay
+        for attempt in range(1, self.max_attempts + 1):
+            remaining = remaining_time()
+            if remaining is not None and remaining <= 0:
+                raise LLMDeadlineExceeded("Request deadline passed before the LLM answered")
+            try:
+                return await asyncio.wait_for(self._attempt(fn, kind, hedge_if), remaining)
+            except LLMUnavailable:
+                # Already final, e.g. shed by admission control; retrying would only add load
+                raise
+            except asyncio.TimeoutError as e:
+                raise LLMDeadlineExceeded("Request deadline passed before the LLM answered") from e
+            except Exception as e:
+                if not is_retryable(e):
+                    raise LLMUnavailable(f"LLM call failed: {e}") from e
+                if attempt == self.max_attempts:
+                    raise LLMUnavailable(f"LLM call failed after {attempt} attempts: {e}") from e
+                delay = self.backoff(delay)
+                remaining = remaining_time()
+                if remaining is not None and delay >= remaining:
+                    raise LLMDeadlineExceeded(f"No time left to retry LLM call: {e}") from e
+                self.retries += 1
+                await asyncio.sleep(delay)
+
+    async def _attempt(self, fn: Callable[[], Awaitable[T]], kind: str,
+                       hedge_if: Optional[Callable[[], bool]]) -> T:
+        """One attempt, hedged with a second one if it runs past the hedge delay"""
+        hedge_delay = self.hedge_delay(kind)
+        primary = asyncio.ensure_future(self._timed(fn, kind))
+        done, pending = set(), {primary}
+        try:
+            if hedge_delay is not None:
+                done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+                if not done and (hedge_if is None or hedge_if()):
+                    self.hedged += 1
+                    pending.add(asyncio.ensure_future(self._timed(fn, kind)))
+            error: Optional[BaseException] = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    # Prefer the primary's error, the hedge may only have been shed
+                    if error is None or task is primary:
+                        error = task.exception()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _timed(self, fn: Callable[[], Awaitable[T]], kind: str) -> T:
+        start = time.monotonic()
+        result = await fn()
+        self._latencies.setdefault(kind, LatencyTracker()).record(time.monotonic() - start)
+        return result
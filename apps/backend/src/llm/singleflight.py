@@ -0,0 +1,81 @@
+"""
+Request coalescing for concurrent identical LLM calls
+"""
+import asyncio
+import hashlib
+import json
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, TypeVar
+
+from src.llm.resilience import LLMDeadlineExceeded, current_deadline, remaining_time
+
+T = TypeVar("T")
+
+
+def request_key(messages: List[Dict[str, str]], model: str, temperature: float) -> str:
+    """Key identifying an LLM request by its prompt messages, model and temperature"""
+    payload = json.dumps([messages, model, temperature], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    Share one in-flight call between concurrent callers with the same key.
+
+    The first caller starts the call as a task; callers arriving while it is
+    running await the same task and get the same result or exception. A
+    cancelled waiter does not cancel the call for the others; the call is
+    cancelled once no waiter is left.
+
+    The task runs in the first caller's context, so its admission slot is
+    charged to that caller's tenant, but not under its deadline: every
+    caller waits only until its own deadline, so a follower with more time
+    left is not failed by a leader with less.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+        self._waiters: Counter = Counter()
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            token = current_deadline.set(None)
+            try:
+                task = asyncio.ensure_future(fn())
+            finally:
+                current_deadline.reset(token)
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        else:
+            self.coalesced += 1
+
+        self._waiters[task] += 1
+        try:
+            remaining = remaining_time()
+            if remaining is None:
+                return await asyncio.shield(task)
+            try:
+                return await asyncio.wait_for(asyncio.shield(task), max(remaining, 0))
+            except asyncio.TimeoutError as e:
+                raise LLMDeadlineExceeded("Request deadline passed before the LLM answered") from e
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    task.cancel()
+
+    def _forget(self, key: str, task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter went away
+            task.exception()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,146 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List, Optional
+
+from src.config import (
+    LOG_LEVEL, LOG_FILE, LOG_FORMAT, LOG_MAX_BYTES, LOG_BACKUP_COUNT,
+    LOG_MAX_CHARS, LOG_MODULE_MAX_CHARS, LOG_SAMPLE_RATES
+)
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def parse_module_settings(spec: str) -> Dict[str, float]:
+    """Parse "src.llm=0.1,src.langgraph=0.5" into {logger prefix: value}"""
+    settings = {}
+    for item in spec.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip():
+            settings[name.strip()] = float(value)
+    return settings
+
+
+def module_setting(settings: Dict[str, float], logger_name: str) -> Optional[float]:
+    """The value for the longest configured prefix of logger_name, if any"""
+    best = None
+    for prefix, value in settings.items():
+        if logger_name == prefix or logger_name.startswith(prefix + "."):
+            if best is None or len(prefix) > len(best[0]):
+                best = (prefix, value)
+    return best[1] if best is not None else None
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of the records below WARNING from noisy modules.
+
+    Sampling is deterministic: a rate of 0.25 keeps every fourth record.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._credit: Dict[str, float] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = module_setting(self.rates, record.name)
+        if rate is None or rate >= 1:
+            return True
+        credit = self._credit.get(record.name, 0.0) + rate
+        keep = credit >= 1
+        self._credit[record.name] = credit - 1 if keep else credit
+        return keep
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    Queue handler that renders and truncates the message on the calling
+    thread, leaving formatting and file I/O to the listener thread.
+
+    Only the message is truncated; a traceback or stack appended to it is
+    kept whole.
+    """
+
+    def __init__(self, log_queue: queue.Queue, max_chars: int, module_max_chars: Dict[str, float]):
+        super().__init__(log_queue)
+        self.max_chars = max_chars
+        self.module_max_chars = module_max_chars
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        limit = module_setting(self.module_max_chars, record.name)
+        limit = int(limit) if limit is not None else self.max_chars
+        message = record.getMessage()
+        if limit > 0 and len(message) > limit:
+            # Before super() renders exc_text and stack_info into the message
+            record = copy.copy(record)
+            record.msg = f"{message[:limit]}... [truncated {len(message) - limit} chars]"
+            record.args = None
+        return super().prepare(record)
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def setup_logging() -> None:
+    """
+    Route all logging through a queue drained by a background thread.
+
+    Log calls on the event loop only enqueue the record; the console and the
+    size-rotated log file are written by the listener thread.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    formatter = JSONFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    if LOG_FILE:
+        handlers.append(RotatingFileHandler(
+            LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    _queue_handler = AsyncQueueHandler(log_queue, LOG_MAX_CHARS, parse_module_settings(LOG_MODULE_MAX_CHARS))
+    _queue_handler.addFilter(SamplingFilter(parse_module_settings(LOG_SAMPLE_RATES)))
+
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    root.addHandler(_queue_handler)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _queue_handler = None
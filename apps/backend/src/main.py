@@ -1,28 +1,47 @@
-import logging
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from src.config import APP_ENV, PORT
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('app.log')
-    ]
+from fastapi.responses import JSONResponse
+from src.config import (
+    APP_ENV, PORT, COMPRESSION_MINIMUM_SIZE, COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY,
+    REQUEST_DEADLINE
 )
+from src.compression import CompressionMiddleware
+from src.deadline import DeadlineMiddleware
+from src.routers.session import SessionCookieMiddleware
+from src.logging_config import setup_logging, shutdown_logging
+
+# Configure logging (queued, written by a background thread)
+setup_logging()
 
 # Import routers
 from src.routers import resume, chat
+from src.llm.client import llm_client
+from src.llm.admission import LLMOverloaded
+from src.llm.resilience import LLMUnavailable, LLMDeadlineExceeded
+from src.llm.circuit_breaker import CircuitOpen, CircuitState
+from src.services.session_store import resume_store
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release the pooled LLM connections, the resume store and the log listener on shutdown"""
+    setup_logging()
+    yield
+    await llm_client.aclose()
+    await resume_store.close()
+    shutdown_logging()
 
 # Create FastAPI app instance
+# No default_response_class: routes with a response_model are then serialized
+# straight to JSON bytes by pydantic-core, skipping jsonable_encoder
 app = FastAPI(
     title="JobPrep Backend API",
     description="Backend API for JobPrep application",
     version="1.0.0",
     docs_url="/docs" if APP_ENV == "development" else None,
-    redoc_url="/redoc" if APP_ENV == "development" else None
+    redoc_url="/redoc" if APP_ENV == "development" else None,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -34,6 +53,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses; NDJSON/SSE streams are passed through unbuffered
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESSION_MINIMUM_SIZE,
+    gzip_level=COMPRESSION_GZIP_LEVEL,
+    brotli_quality=COMPRESSION_BROTLI_QUALITY,
+)
+
+# Hand new sessions their cookie, whatever response the route returns
+app.add_middleware(SessionCookieMiddleware)
+
+# Bound each request's LLM calls and retries (X-Request-Timeout can shorten it)
+app.add_middleware(DeadlineMiddleware, default_timeout=REQUEST_DEADLINE)
+
+@app.exception_handler(LLMOverloaded)
+async def llm_overloaded_handler(request: Request, exc: LLMOverloaded):
+    """Shed LLM load with 429 and a hint when to retry"""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.exception_handler(CircuitOpen)
+async def circuit_open_handler(request: Request, exc: CircuitOpen):
+    """Fail fast while the LLM upstream is degraded"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.exception_handler(LLMDeadlineExceeded)
+async def llm_deadline_exceeded_handler(request: Request, exc: LLMDeadlineExceeded):
+    """The LLM did not answer within the request's deadline"""
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+@app.exception_handler(LLMUnavailable)
+async def llm_unavailable_handler(request: Request, exc: LLMUnavailable):
+    """The LLM failed after all retries; reported as such rather than answered with mock data"""
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
 # Include routers
 app.include_router(resume.router, prefix="/api")
 app.include_router(chat.router, prefix="/api")
@@ -49,8 +110,13 @@ async def test_endpoint():
 async def health_check():
     """
     Health check endpoint for deployment
+    
+    Stays 200 while the LLM circuit is open: restarting the worker would not
+    fix the upstream, so the state is reported as "degraded" instead.
     """
-    return {"status": "healthy", "service": "jobprep-backend"}
+    circuit = llm_client.breaker.snapshot()
+    status = "healthy" if circuit["state"] == CircuitState.CLOSED.value else "degraded"
+    return {"status": status, "service": "jobprep-backend", "llm_circuit": circuit}
 
 if __name__ == "__main__":
     import uvicorn
@@ -23,6 +23,7 @@ class ChatState(BaseModel):
     text: str = Field(..., description="User input text")
     history: List[Dict[str, str]] = Field(default_factory=list, description="Chat history")
     resume: Dict[str, Any] = Field(..., description="Current resume data")
+    resume_version: Optional[str] = Field(None, description="Version (ETag) of the stored resume, reuses its rendered prompt context")
     latest_suggestion: Optional[Suggestion] = Field(None, description="Latest generated suggestion")
     response: Optional[str] = Field(None, description="AI response text")
     finalized: bool = Field(False, description="Whether the suggestion is finalized")
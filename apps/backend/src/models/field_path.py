@@ -0,0 +1,192 @@
+"""
+Compiled field paths like ``work[0].achievements[1]``
+"""
+from functools import lru_cache
+from typing import Any, List, Tuple, Union
+
+from pydantic import BaseModel
+
+PathPart = Union[str, int]
+
+# get() default meaning "raise if missing"
+_MISSING = object()
+# Sentinel used by exists(), distinct from any stored value
+_NOT_FOUND = object()
+
+
+class FieldPath:
+    """
+    A parsed field path with accessors for pydantic models and plain dicts.
+
+    Instances are immutable and shared through ``compile_field_path``, so a
+    path string is parsed once and every later access is O(depth).
+    """
+    __slots__ = ("path", "parts")
+
+    def __init__(self, path: str, parts: Tuple[PathPart, ...]):
+        self.path = path
+        self.parts = parts
+
+    def __repr__(self) -> str:
+        return f"FieldPath({self.path!r})"
+
+    @classmethod
+    def from_parts(cls, parts: List[PathPart]) -> "FieldPath":
+        """Build a path from already parsed parts"""
+        path = ""
+        for part in parts:
+            path += f"[{part}]" if isinstance(part, int) else (f".{part}" if path else part)
+        return cls(path, tuple(parts))
+
+    @property
+    def section(self) -> PathPart:
+        """First path part, e.g. "work" """
+        return self.parts[0]
+
+    @property
+    def owner(self) -> Tuple[PathPart, ...]:
+        """The top-level entry that holds this field, e.g. ("work", 0) or ("basics",)"""
+        if len(self.parts) > 1 and isinstance(self.parts[1], int):
+            return self.parts[:2]
+        return self.parts[:1]
+
+    def get(self, obj: Any, default: Any = _MISSING) -> Any:
+        """Return the value at this path, or default if given and the path does not exist"""
+        try:
+            for part in self.parts:
+                obj = _step(obj, part)
+            return obj
+        except (KeyError, IndexError):
+            if default is _MISSING:
+                raise
+            return default
+
+    def exists(self, obj: Any) -> bool:
+        """Whether every part of the path resolves in obj"""
+        return self.get(obj, _NOT_FOUND) is not _NOT_FOUND
+
+    def set(self, obj: Any, value: Any) -> None:
+        """Replace the existing value at this path in place"""
+        parent = obj
+        for part in self.parts[:-1]:
+            parent = _step(parent, part)
+        last = self.parts[-1]
+        _step(parent, last)  # The target must already exist
+        if isinstance(last, int):
+            parent[last] = value
+        elif isinstance(parent, BaseModel):
+            setattr(parent, last, value)
+        else:
+            parent[last] = value
+
+    def replace(self, obj: Any, value: Any) -> Any:
+        """
+        Return a copy of obj with the value at this path replaced.
+
+        Copy-on-write: only the models, lists and dicts along the path are
+        copied (shallowly), everything else is shared with obj. The new value
+        is validated against the field that holds it on the nearest model,
+        so the cost depends on the path depth, not on the size of obj.
+        """
+        nodes = [obj]
+        for part in self.parts:
+            nodes.append(_step(nodes[-1], part))
+        # The nearest model above the target validates the new value
+        validate_at = max((i for i, node in enumerate(nodes[:-1]) if isinstance(node, BaseModel)), default=-1)
+
+        for i in range(len(self.parts) - 1, -1, -1):
+            parent, part = nodes[i], self.parts[i]
+            if isinstance(part, int):
+                updated = list(parent)
+                updated[part] = value
+            elif isinstance(parent, BaseModel):
+                if i == validate_at:
+                    updated = parent.model_copy()
+                    # Runs only this field's type and validators, not the whole model
+                    type(parent).__pydantic_validator__.validate_assignment(updated, part, value)
+                else:
+                    updated = parent.model_copy(update={part: value})
+            else:
+                updated = dict(parent)
+                updated[part] = value
+            value = updated
+        return value
+
+
+def _step(obj: Any, part: PathPart) -> Any:
+    """Resolve one path part on a model, dict or list"""
+    if isinstance(part, int):
+        if not isinstance(obj, list) or part < 0 or part >= len(obj):
+            raise IndexError(f"Array index {part} out of bounds")
+        return obj[part]
+    if isinstance(obj, BaseModel):
+        if part not in type(obj).model_fields:
+            raise KeyError(f"Field '{part}' not found")
+        return getattr(obj, part)
+    if isinstance(obj, dict):
+        if part not in obj:
+            raise KeyError(f"Field '{part}' not found")
+        return obj[part]
+    raise KeyError(f"Field '{part}' not found")
+
+
+def parse_field_path(field_path: str) -> List[PathPart]:
+    """Parse field path like 'work[0].description' into parts"""
+    parts: List[PathPart] = []
+    start = 0
+    i = 0
+    n = len(field_path)
+
+    while i < n:
+        char = field_path[i]
+        if char == ".":
+            if i > start:
+                parts.append(field_path[start:i])
+            start = i + 1
+        elif char == "[":
+            if i > start:
+                parts.append(field_path[start:i])
+            end = field_path.find("]", i + 1)
+            if end == -1:
+                raise ValueError("Missing closing bracket")
+            index_str = field_path[i + 1:end]
+            try:
+                parts.append(int(index_str))
+            except ValueError:
+                raise ValueError(f"Invalid array index: {index_str}")
+            i = end
+            start = end + 1
+        i += 1
+
+    if n > start:
+        parts.append(field_path[start:])
+
+    return parts
+
+
+def parse_json_pointer(pointer: str) -> List[PathPart]:
+    """
+    Parse an RFC 6901 JSON Pointer like '/work/0/description' into parts.
+
+    Array indexes become ints; the end-of-array marker '-' is kept as a string.
+    """
+    if not pointer:
+        return []
+    if not pointer.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer: {pointer}")
+    parts: List[PathPart] = []
+    for token in pointer[1:].split("/"):
+        token = token.replace("~1", "/").replace("~0", "~")
+        if token.isascii() and token.isdigit():
+            if len(token) > 1 and token[0] == "0":
+                raise ValueError(f"Invalid array index: {token}")
+            parts.append(int(token))
+        else:
+            parts.append(token)
+    return parts
+
+
+@lru_cache(maxsize=4096)
+def compile_field_path(field_path: str) -> FieldPath:
+    """Parse and cache a field path; raises ValueError for malformed paths"""
+    return FieldPath(field_path, tuple(parse_field_path(field_path)))
@@ -71,6 +71,9 @@ class Resume(BaseModel):
             raise ValueError(f"{field_name} must have at least one item")
         return v
 
+# Resume sections that hold a list of entries, in document order
+RESUME_LIST_SECTIONS = ("education", "work", "skills", "certificates")
+
 # 解析简历相关
 class ParseResumeRequest(BaseModel):
     """Parse resume request model"""
@@ -90,6 +93,56 @@ class AcceptSuggestionResponse(BaseModel):
     """Accept suggestion response model"""
     resume: Resume = Field(..., description="Updated resume")
 
+class SuggestionAction(str, Enum):
+    """What to do with a pending suggestion"""
+    ACCEPT = "accept"
+    REJECT = "reject"
+
+class SuggestionOperation(BaseModel):
+    """One operation of a batch accept/reject request"""
+    field: str = Field(..., description="Field path of the suggestion")
+    suggested: Optional[str] = Field(None, description="New value to set (required to accept)")
+    action: SuggestionAction = Field(SuggestionAction.ACCEPT, description="Accept or reject the suggestion")
+
+class AcceptSuggestionsRequest(BaseModel):
+    """Batch accept/reject suggestions request model"""
+    operations: List[SuggestionOperation] = Field(..., min_length=1, description="Operations applied in order")
+
+class SuggestionOperationResult(BaseModel):
+    """Outcome of one batch operation"""
+    field: str = Field(..., description="Field path of the suggestion")
+    action: SuggestionAction = Field(..., description="Requested action")
+    status: str = Field(..., description="applied or failed")
+    error: Optional[str] = Field(None, description="Why the operation failed")
+
+class AcceptSuggestionsResponse(BaseModel):
+    """Batch accept/reject suggestions response model"""
+    resume: Resume = Field(..., description="Updated resume")
+    results: List[SuggestionOperationResult] = Field(..., description="Per-operation status, in request order")
+
+class ResumePatchOp(str, Enum):
+    """Supported RFC 6902 operations"""
+    ADD = "add"
+    REMOVE = "remove"
+    REPLACE = "replace"
+    TEST = "test"
+
+class ResumePatchOperation(BaseModel):
+    """One RFC 6902 (JSON Patch) operation on the resume"""
+    op: ResumePatchOp = Field(..., description="Operation")
+    path: str = Field(..., description="JSON Pointer to the target, e.g. /work/0/description")
+    value: Any = Field(None, description="Value for add, replace and test")
+
+class PatchResumeRequest(BaseModel):
+    """Patch resume request model"""
+    version: Optional[int] = Field(None, description="Expected current version, the patch is rejected if it differs")
+    operations: List[ResumePatchOperation] = Field(..., min_length=1, description="Operations applied atomically, in order")
+
+class PatchResumeResponse(BaseModel):
+    """Patch resume response model"""
+    resume: Resume = Field(..., description="Updated resume")
+    version: int = Field(..., description="New version")
+
 class SaveResumeRequest(BaseModel):
     """Save resume request model"""
     resume: Resume = Field(..., description="Resume object to save")
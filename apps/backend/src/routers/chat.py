@@ -1,21 +1,55 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+import json
 import logging
 
 from src.models.chat import ChatRequest, ChatResponse
 from src.services.chat_service import chat_service
+from src.routers.session import get_session_id
+from src.llm.resilience import LLMUnavailable
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, session_id: str = Depends(get_session_id)):
+    """
+    Chat through the LangGraph workflow, in the session's chat thread
+    """
     try:
-        result = await chat_service.process_chat(request)
+        result = await chat_service.process_chat(request, session_id)
         return result
+    except LLMUnavailable:
+        # Answered with 429/503/504 by the app's exception handlers
+        raise
     except ValueError as e:
         # Handle validation errors from service layer
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in chat endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest, session_id: str = Depends(get_session_id)):
+    """
+    Chat through the LangGraph workflow, streaming node progress and reply tokens as NDJSON
+    """
+    try:
+        events = await chat_service.process_chat_stream(request, session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def event_stream():
+        try:
+            async for event in events:
+                if event["event"] == "result" and event["data"]["suggestion"] is not None:
+                    event["data"]["suggestion"] = event["data"]["suggestion"].model_dump()
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except LLMUnavailable as e:
+            # The status line is already sent, so the failure goes in-band
+            logger.error(f"LLM unavailable while streaming chat: {str(e)}")
+            yield json.dumps({"event": "error", "detail": str(e)}, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
@@ -1,21 +1,65 @@
-from fastapi import APIRouter, HTTPException
+import json
+from typing import Callable, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from src.models.resume import (
     ParseResumeRequest, ParseResumeResponse,
     AcceptSuggestionRequest, AcceptSuggestionResponse,
-    SaveResumeRequest, SaveResumeResponse
+    AcceptSuggestionsRequest, AcceptSuggestionsResponse,
+    SaveResumeRequest, SaveResumeResponse,
+    PatchResumeRequest, PatchResumeResponse
 )
 # from src.langgraph.parse_resume.workflow import resume_workflow  # TODO: 待实现
-from src.services.resume_service import resume_service
+from src.services.resume_service import resume_service, ResumePatchConflict
+from src.services.session_store import resume_store, next_session, ResumeSession
+from src.routers.session import get_session_id
+from src.llm.resilience import LLMUnavailable
 
 router = APIRouter(tags=["resume"])
 
-# In-memory storage for demo purposes
-# In production, this should be replaced with a proper database
-resume_storage = {}
+
+def _set_version_headers(response: Response, session: ResumeSession) -> None:
+    """Expose the stored session's version, for conditional GETs and PATCH"""
+    response.headers["ETag"] = session.etag
+    response.headers["X-Resume-Version"] = str(session.version)
+
+
+async def _replace_session(session_id: str, previous: ResumeSession, updated: ResumeSession) -> None:
+    """Store updated in place of previous, or 409 if another request changed the session first"""
+    if not await resume_store.replace(session_id, previous, updated):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Version conflict: version {previous.version} was changed by another request"
+        )
+
+
+async def _store_next_session(session_id: str,
+                              build: Callable[[Optional[ResumeSession]], ResumeSession]) -> ResumeSession:
+    """
+    Store build(current session) for a request that overwrites the resume anyway
+
+    Retried on a concurrent write, so two overwrites never store the same version number.
+    """
+    while True:
+        previous = await resume_store.get(session_id)
+        updated = build(previous)
+        if await resume_store.replace(session_id, previous, updated):
+            return updated
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison, RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
 
 
 @router.post("/parse_resume", response_model=ParseResumeResponse)
-async def parse_resume(request: ParseResumeRequest):
+async def parse_resume(request: ParseResumeRequest, session_id: str = Depends(get_session_id)):
     """
     Parse resume text using LangGraph workflow
     """
@@ -23,9 +67,13 @@ async def parse_resume(request: ParseResumeRequest):
         # Use LangGraph workflow to parse resume
         result = await resume_service.parse_resume(request.text)
         # Store both resume and suggestions
-        resume_storage["current"] = result.resume
-        resume_storage["suggestions"] = result.suggestions
+        await _store_next_session(
+            session_id, lambda previous: next_session(previous, result.resume, result.suggestions)
+        )
         return result
+    except LLMUnavailable:
+        # Answered with 429/503/504 by the app's exception handlers
+        raise
     except ValueError as e:
         # Handle validation errors from LangGraph workflow
         raise HTTPException(status_code=400, detail=str(e))
@@ -34,73 +82,52 @@ async def parse_resume(request: ParseResumeRequest):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.post("/parse_resume/stream")
+async def parse_resume_stream(request: ParseResumeRequest, session_id: str = Depends(get_session_id)):
+    """
+    Parse resume text and stream sections as NDJSON as soon as they are decoded
+    """
+    # Overload is answered with 429/503 here, before the stream's status line
+    events = await resume_service.parse_resume_stream(request.text)
+    
+    async def event_stream():
+        async for event in events:
+            if event["event"] == "result":
+                result = event["data"]
+                await _store_next_session(
+                    session_id, lambda previous: next_session(previous, result.resume, result.suggestions)
+                )
+                event = {"event": "result", "data": result.model_dump()}
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
 @router.get("/resume")
-async def get_resume():
+async def get_resume(session_id: str = Depends(get_session_id),
+                     if_none_match: Optional[str] = Header(None)):
     """
     Get the currently stored resume with suggestions embedded
     """
-    if "current" not in resume_storage:
+    session = await resume_store.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="No resume found")
     
-    resume = resume_storage["current"]
-    suggestions = resume_storage.get("suggestions", [])
-    
-    # Create a copy of the resume to embed suggestions
-    resume_dict = resume.model_dump()
-    
-    # Embed suggestions into the appropriate objects based on field paths
-    for suggestion in suggestions:
-        field_path = suggestion.field
-        if field_path.startswith("basics."):
-            if "suggestions" not in resume_dict["basics"] or resume_dict["basics"]["suggestions"] is None:
-                resume_dict["basics"]["suggestions"] = []
-            resume_dict["basics"]["suggestions"].append(suggestion.model_dump())
-        elif field_path.startswith("education["):
-            # Parse education index from field path like "education[0].gpa"
-            import re
-            match = re.match(r"education\[(\d+)\]", field_path)
-            if match:
-                index = int(match.group(1))
-                if index < len(resume_dict["education"]):
-                    if "suggestions" not in resume_dict["education"][index] or resume_dict["education"][index]["suggestions"] is None:
-                        resume_dict["education"][index]["suggestions"] = []
-                    resume_dict["education"][index]["suggestions"].append(suggestion.model_dump())
-        elif field_path.startswith("work["):
-            # Parse work index from field path like "work[0].description"
-            import re
-            match = re.match(r"work\[(\d+)\]", field_path)
-            if match:
-                index = int(match.group(1))
-                if index < len(resume_dict["work"]):
-                    if "suggestions" not in resume_dict["work"][index] or resume_dict["work"][index]["suggestions"] is None:
-                        resume_dict["work"][index]["suggestions"] = []
-                    resume_dict["work"][index]["suggestions"].append(suggestion.model_dump())
-        elif field_path.startswith("skills["):
-            # Parse skills index from field path like "skills[0].level"
-            import re
-            match = re.match(r"skills\[(\d+)\]", field_path)
-            if match:
-                index = int(match.group(1))
-                if index < len(resume_dict["skills"]):
-                    if "suggestions" not in resume_dict["skills"][index] or resume_dict["skills"][index]["suggestions"] is None:
-                        resume_dict["skills"][index]["suggestions"] = []
-                    resume_dict["skills"][index]["suggestions"].append(suggestion.model_dump())
-        elif field_path.startswith("certificates["):
-            # Parse certificates index from field path like "certificates[0].description"
-            import re
-            match = re.match(r"certificates\[(\d+)\]", field_path)
-            if match:
-                index = int(match.group(1))
-                if index < len(resume_dict["certificates"]):
-                    if "suggestions" not in resume_dict["certificates"][index] or resume_dict["certificates"][index]["suggestions"] is None:
-                        resume_dict["certificates"][index]["suggestions"] = []
-                    resume_dict["certificates"][index]["suggestions"].append(suggestion.model_dump())
+    # Unchanged since the client's copy: no body to build or send
+    if _etag_matches(if_none_match, session.etag):
+        return Response(status_code=304, headers={"ETag": session.etag, "Cache-Control": "no-cache"})
     
-    return resume_dict
+    # The embedded document is built and serialized once per stored session,
+    # so repeated reads skip jsonable_encoder and json.dumps entirely
+    response = Response(content=session.embedded_document_json(), media_type="application/json")
+    _set_version_headers(response, session)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 @router.post("/resume", response_model=SaveResumeResponse)
-async def save_resume(request: SaveResumeRequest):
+async def save_resume(request: SaveResumeRequest, response: Response,
+                      session_id: str = Depends(get_session_id)):
     """
     Save a complete resume object to backend memory (overwrites existing resume)
     """
@@ -109,8 +136,14 @@ async def save_resume(request: SaveResumeRequest):
         # The Resume model will automatically validate the structure
         validated_resume = request.resume
         
-        # Store the resume in memory (overwrites existing)
-        resume_storage["current"] = validated_resume
+        # Store the resume (overwrites existing, keeps pending suggestions)
+        updated = await _store_next_session(
+            session_id,
+            lambda previous: next_session(
+                previous, validated_resume, previous.suggestions if previous is not None else []
+            )
+        )
+        _set_version_headers(response, updated)
         
         return SaveResumeResponse(status="ok")
     except ValueError as e:
@@ -121,12 +154,44 @@ async def save_resume(request: SaveResumeRequest):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.patch("/resume", response_model=PatchResumeResponse)
+async def patch_resume(request: PatchResumeRequest, response: Response,
+                       session_id: str = Depends(get_session_id)):
+    """
+    Apply JSON Patch (RFC 6902) operations to the stored resume
+    """
+    session = await resume_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="No resume found")
+    if request.version is not None and request.version != session.version:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Version conflict: expected {request.version}, current is {session.version}"
+        )
+    
+    try:
+        updated_resume = resume_service.patch_resume(request.operations, session.resume)
+    except ResumePatchConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        # Malformed operations and invalid values
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    updated = next_session(session, updated_resume, session.suggestions)
+    # The version checked above may be replaced meanwhile, by this or another worker
+    await _replace_session(session_id, session, updated)
+    _set_version_headers(response, updated)
+    return PatchResumeResponse(resume=updated_resume, version=updated.version)
+
+
 @router.post("/accept_suggestion", response_model=AcceptSuggestionResponse)
-async def accept_suggestion(request: AcceptSuggestionRequest):
+async def accept_suggestion(request: AcceptSuggestionRequest, response: Response,
+                            session_id: str = Depends(get_session_id)):
     """
     Accept a suggestion and update the resume
     """
-    if "current" not in resume_storage:
+    session = await resume_store.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="No resume found")
     
     try:
@@ -134,12 +199,42 @@ async def accept_suggestion(request: AcceptSuggestionRequest):
         updated_resume = await resume_service.accept_suggestion(
             request.field,
             request.suggested,
-            resume_storage["current"]
+            session.resume
         )
         
-        # Update stored resume
-        resume_storage["current"] = updated_resume
+        # Update stored resume, the accepted suggestion is no longer pending
+        updated = next_session(session, updated_resume, session.without_suggestion(request.field))
+        await _replace_session(session_id, session, updated)
+        # Lets the next GET /api/resume revalidate instead of refetching
+        _set_version_headers(response, updated)
         
         return AcceptSuggestionResponse(resume=updated_resume)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/accept_suggestions", response_model=AcceptSuggestionsResponse)
+async def accept_suggestions(request: AcceptSuggestionsRequest, response: Response,
+                             session_id: str = Depends(get_session_id)):
+    """
+    Accept or reject several suggestions at once, with a single store write
+    """
+    session = await resume_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="No resume found")
+    
+    updated_resume, results = await resume_service.apply_suggestion_operations(
+        request.operations,
+        session.resume
+    )
+    
+    applied = [result.field for result in results if result.status == "applied"]
+    if applied:
+        updated = next_session(session, updated_resume, session.without_suggestions(applied))
+        await _replace_session(session_id, session, updated)
+        session = updated
+    _set_version_headers(response, session)
+    
+    return AcceptSuggestionsResponse(resume=updated_resume, results=results)
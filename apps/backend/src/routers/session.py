@@ -0,0 +1,78 @@
+import re
+import secrets
+from http.cookies import SimpleCookie
+
+from fastapi import HTTPException, Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import RESUME_STORE_IDLE_TTL
+from src.llm.admission import current_tenant
+
+SESSION_HEADER = "X-Session-ID"
+SESSION_COOKIE = "jobprep_session"
+# request.state key of a session id minted for this request, sent back as a cookie
+NEW_SESSION_STATE = "new_session_id"
+
+_SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.:-]{1,128}$")
+
+
+async def get_session_id(request: Request) -> str:
+    """
+    Resolve the session id from the X-Session-ID header or session cookie.
+    
+    Clients sending neither get a new random session, which
+    SessionCookieMiddleware hands back as an HttpOnly cookie. The id also
+    becomes the request's LLM tenant, so one session cannot take every
+    upstream LLM slot. Async so the tenant is set in the request's own
+    context rather than a worker thread's.
+    """
+    session_id = request.headers.get(SESSION_HEADER) or request.cookies.get(SESSION_COOKIE)
+    if not session_id:
+        session_id = secrets.token_urlsafe(24)
+        setattr(request.state, NEW_SESSION_STATE, session_id)
+    elif not _SESSION_ID_PATTERN.match(session_id):
+        raise HTTPException(status_code=400, detail="Invalid session id")
+    current_tenant.set(session_id)
+    return session_id
+
+
+def session_cookie_header(session_id: str, max_age: int) -> bytes:
+    """Set-Cookie value for a session id"""
+    cookie = SimpleCookie()
+    cookie[SESSION_COOKIE] = session_id
+    morsel = cookie[SESSION_COOKIE]
+    morsel["path"] = "/"
+    morsel["max-age"] = max_age
+    morsel["httponly"] = True
+    morsel["samesite"] = "lax"
+    return morsel.OutputString().encode("latin-1")
+
+
+class SessionCookieMiddleware:
+    """
+    Send the session cookie for sessions minted by get_session_id.
+
+    A middleware rather than the dependency's response, so routes that return
+    their own Response (streams, conditional GET) and error responses get the
+    cookie too.
+    """
+
+    def __init__(self, app: ASGIApp, max_age: int = int(RESUME_STORE_IDLE_TTL)):
+        self.app = app
+        self.max_age = max_age
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                session_id = scope.get("state", {}).get(NEW_SESSION_STATE)
+                if session_id:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"set-cookie", session_cookie_header(session_id, self.max_age)))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,9 +1,10 @@
 import logging
-import json
-from typing import Dict, Any, List
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 from src.models.chat import ChatRequest, ChatResponse, ChatMessage
+from src.llm.admission import Priority
 from src.llm.client import llm_client
-from src.llm.prompts import CHAT_PROMPT
+from src.langgraph.chat.workflow import chat_workflow
+from src.services.session_store import resume_store
 
 logger = logging.getLogger(__name__)
 
@@ -14,124 +15,111 @@ class ChatService:
     def __init__(self):
         self.llm_client = llm_client
     
-    async def process_chat(self, request: ChatRequest) -> ChatResponse:
+    async def process_chat(self, request: ChatRequest, session_id: Optional[str] = None) -> ChatResponse:
         """
-        Process chat request and generate AI response
+        Process chat request through the chat workflow
         
         Args:
             request: ChatRequest containing messages and context
+            session_id: Session whose stored resume and chat thread are used
             
         Returns:
             ChatResponse with AI reply and suggested actions
         """
         try:
             logger.info("Processing chat request")
-            
-            # Extract the latest user message
-            user_message = ""
-            for message in reversed(request.messages):
-                if message.role == "user":
-                    user_message = message.content
-                    break
-            
-            if not user_message:
-                raise ValueError("No user message found in chat history")
-            
-            # For now, return a mock response since LLM client is simplified
-            # In production, this would call the LLM with proper prompt formatting
-            if "分析" in user_message or "改进" in user_message:
-                reply = "我理解您想要改进简历。基于您提供的信息，我建议在以下几个方面进行优化：\n\n1. 在工作经历中添加更多量化成果\n2. 补充最新的技术技能\n3. 优化项目描述的表述方式\n\n您希望我帮您具体改进哪个部分？"
-                action = {
-                    "type": "suggest_update",
-                    "field": "work[0]",
-                    "suggested": "负责电商平台后端开发，通过微服务架构优化，提升系统响应速度30%，支持日活用户100万+"
-                }
-            else:
-                reply = "您好！我是您的简历优化助手。我可以帮您分析简历、提供改进建议，并协助您完善各个部分。请告诉我您需要什么帮助？"
-                action = None
-            
+            inputs = await self._workflow_input(request, session_id)
+            result = await chat_workflow.run(**inputs)
             logger.info("Chat response generated successfully")
             
             return ChatResponse(
-                reply=reply,
-                action=action
+                reply=result["response"],
+                action=self._action(result)
             )
             
         except Exception as e:
             logger.error(f"Error processing chat: {str(e)}")
             raise
     
-    def _format_resume_context(self, resume_data: Dict[str, Any]) -> str:
-        """Format resume data for context"""
-        if not resume_data:
-            return "无简历信息"
+    async def process_chat_stream(self, request: ChatRequest,
+                                  session_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the chat workflow on a request, streaming its progress
         
-        try:
-            # Format basic info
-            basics = resume_data.get("basics", {})
-            context = f"姓名: {basics.get('name', 'N/A')}\n"
-            context += f"邮箱: {basics.get('email', 'N/A')}\n"
-            context += f"电话: {basics.get('phone', 'N/A')}\n"
-            context += f"地点: {basics.get('location', 'N/A')}\n"
-            context += f"简介: {basics.get('summary', 'N/A')}\n\n"
-            
-            # Format education
-            education = resume_data.get("education", [])
-            if education:
-                context += "教育经历:\n"
-                for i, edu in enumerate(education):
-                    context += f"  {i+1}. {edu.get('institution', 'N/A')} - {edu.get('degree', 'N/A')}\n"
-                    context += f"     专业: {edu.get('field_of_study', 'N/A')}\n"
-                    context += f"     时间: {edu.get('start_date', 'N/A')} - {edu.get('end_date', 'N/A')}\n"
-                    if edu.get('gpa'):
-                        context += f"     GPA: {edu.get('gpa')}\n"
-                context += "\n"
-            
-            # Format work experience
-            work = resume_data.get("work", [])
-            if work:
-                context += "工作经历:\n"
-                for i, job in enumerate(work):
-                    context += f"  {i+1}. {job.get('company', 'N/A')} - {job.get('position', 'N/A')}\n"
-                    context += f"     时间: {job.get('start_date', 'N/A')} - {job.get('end_date', 'N/A')}\n"
-                    context += f"     描述: {job.get('description', 'N/A')}\n"
-                    achievements = job.get('achievements', [])
-                    if achievements:
-                        context += "     成就:\n"
-                        for achievement in achievements:
-                            context += f"       - {achievement}\n"
-                context += "\n"
-            
-            # Format skills
-            skills = resume_data.get("skills", [])
-            if skills:
-                context += "技能:\n"
-                for skill in skills:
-                    context += f"  - {skill.get('name', 'N/A')} ({skill.get('level', 'N/A')})\n"
-                context += "\n"
+        Args:
+            request: ChatRequest containing messages and context
+            session_id: Session whose stored resume and chat thread are used
             
-            return context
+        Returns:
+            Async iterator of node, token and final result/error events
             
-        except Exception as e:
-            logger.error(f"Error formatting resume context: {str(e)}")
-            return "简历信息格式错误"
+        Raises:
+            ValueError: If there is no user message, before anything is streamed
+            LLMUnavailable: If the LLM would refuse the turn right now
+        """
+        inputs = await self._workflow_input(request, session_id)
+        self.llm_client.check_admission(Priority.CHAT)
+        logger.info("Processing streaming chat request")
+        return chat_workflow.stream(**inputs)
     
-    def _format_chat_history(self, messages: List[ChatMessage]) -> str:
-        """Format chat history for context"""
-        if not messages:
-            return "无对话历史"
+    async def _workflow_input(self, request: ChatRequest, session_id: Optional[str]) -> Dict[str, Any]:
+        """
+        Arguments for ChatWorkflow.run/stream
         
-        try:
-            history = ""
-            for message in messages[-5:]:  # Only include last 5 messages
-                role = "用户" if message.role == "user" else "助手"
-                history += f"{role}: {message.content}\n"
-            
-            return history
-            
-        except Exception as e:
-            logger.error(f"Error formatting chat history: {str(e)}")
-            return "对话历史格式错误"
+        Each session chats in its own thread, so clients may send just the
+        new message; context["thread_id"] picks one of several threads
+        within the session, never another session's. Earlier messages, if
+        sent, replace the thread's history. The resume is context["resume"]
+        if given, otherwise the session's stored resume, whose version lets
+        the rendered prompt context be reused until the resume changes.
+        Without a session the run is stateless.
+        """
+        user_message, history = self._split_messages(request.messages)
+        thread_id = self._thread_id(session_id, request.context.get("thread_id"))
+        inputs: Dict[str, Any] = {
+            "text": user_message,
+            "thread_id": thread_id,
+        }
+        if history or thread_id is None:
+            inputs["history"] = [message.model_dump() for message in history]
+        
+        if request.context.get("resume"):
+            inputs["resume"] = request.context["resume"]
+        elif session_id is not None:
+            session = await resume_store.get(session_id)
+            if session is not None:
+                inputs["resume"] = session.resume.model_dump()
+                inputs["resume_version"] = session.etag
+        return inputs
+    
+    def _thread_id(self, session_id: Optional[str], client_thread_id: Any) -> Optional[str]:
+        """Checkpoint thread of a session; a client-chosen thread is scoped to the session"""
+        if session_id is None:
+            return None
+        if client_thread_id:
+            return f"{session_id}:{client_thread_id}"
+        return session_id
+    
+    def _action(self, result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The action for the client to take after this turn, if any"""
+        suggestion = result.get("suggestion")
+        if suggestion is None:
+            return None
+        if result.get("finalized"):
+            # Applied by the client through /api/accept_suggestion
+            return {"type": "accept_suggestion", **suggestion.model_dump()}
+        if result.get("intent") == "request_suggestion":
+            return {"type": "suggest_update", **suggestion.model_dump()}
+        return None
+    
+    def _split_messages(self, messages: List[ChatMessage]) -> Tuple[str, List[ChatMessage]]:
+        """The latest user message, and the messages before it"""
+        for index in range(len(messages) - 1, -1, -1):
+            if messages[index].role == "user":
+                if messages[index].content:
+                    return messages[index].content, messages[:index]
+                break
+        raise ValueError("No user message found in chat history")
 
 
 # Global service instance
@@ -0,0 +1,161 @@
+"""
+Cache of resume parse results, keyed by the normalized text, prompt version
+and model
+"""
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from src.config import (
+    PARSE_CACHE_MAX_ENTRIES, PARSE_CACHE_TTL, PARSE_CACHE_DB, PARSE_CACHE_DB_MAX_ENTRIES
+)
+from src.models.resume import ParseResumeResponse
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_resume_text(text: str) -> str:
+    """Collapse whitespace so re-uploads of the same resume share a cache key"""
+    return " ".join(text.split())
+
+
+def make_parse_cache_key(text: str, prompt_version: str, model: str) -> str:
+    """Content-addressed key for a parse result"""
+    digest = hashlib.sha256()
+    for part in (prompt_version, model, normalize_resume_text(text)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SQLiteParseCacheTier:
+    """On-disk cache tier that survives restarts"""
+
+    def __init__(self, db_path: str, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        """Return (expires_at, value) for a live entry"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, value FROM parse_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] <= now:
+                self._conn.execute("DELETE FROM parse_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE parse_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row[0], row[1]
+
+    def set(self, key: str, value: str, expires_at: float, now: float) -> None:
+        """Store an entry and evict expired / least recently used rows"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now)
+            )
+            self._conn.execute("DELETE FROM parse_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM parse_cache WHERE key NOT IN "
+                "(SELECT key FROM parse_cache ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM parse_cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ParseCache:
+    """LRU + TTL cache of parse results, with an optional SQLite tier"""
+
+    def __init__(self, max_entries: int = PARSE_CACHE_MAX_ENTRIES, ttl_seconds: float = PARSE_CACHE_TTL,
+                 db_path: Optional[str] = PARSE_CACHE_DB or None,
+                 db_max_entries: int = PARSE_CACHE_DB_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, serialized ParseResumeResponse)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._disk = SQLiteParseCacheTier(db_path, db_max_entries) if db_path else None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    async def get(self, key: str) -> Optional[ParseResumeResponse]:
+        """Return a fresh copy of the cached result, or None"""
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= now:
+            del self._entries[key]
+            entry = None
+
+        if entry is None and self._disk is not None:
+            entry = await asyncio.to_thread(self._disk.get, key, now)
+            if entry is not None:
+                self.disk_hits += 1
+                self._store_memory(key, entry)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        # Each caller gets its own objects, cached data is never shared
+        return ParseResumeResponse.model_validate_json(entry[1])
+
+    async def set(self, key: str, result: ParseResumeResponse) -> None:
+        """Cache a successful parse result"""
+        now = time.time()
+        entry = (now + self.ttl_seconds, result.model_dump_json())
+        self._store_memory(key, entry)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.set, key, entry[1], entry[0], now)
+
+    def _store_memory(self, key: str, entry: Tuple[float, str]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached results (memory and disk)"""
+        self._entries.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "entries": len(self._entries),
+        }
+
+
+# Global cache instance
+parse_cache = ParseCache()
@@ -1,11 +1,30 @@
 import logging
-from typing import Dict, Any, List
-from src.models.resume import Resume, ParseResumeResponse
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+from pydantic_core import to_jsonable_python
+from src.models.resume import (
+    Resume, ParseResumeResponse, RESUME_LIST_SECTIONS,
+    SuggestionAction, SuggestionOperation, SuggestionOperationResult,
+    ResumePatchOp, ResumePatchOperation
+)
+from src.models.field_path import FieldPath, compile_field_path, parse_json_pointer
+from src.llm.admission import Priority
+from src.llm.client import llm_client
+from src.llm.prompts import PARSE_RESUME_PROMPT_VERSION
+from src.config import PARSE_RESUME_MODE
+from src.services.parse_cache import parse_cache, make_parse_cache_key
 # from src.langgraph.parse_resume.workflow import resume_workflow  # TODO: 待实现
 
 logger = logging.getLogger(__name__)
 
 
+class ResumePatchError(ValueError):
+    """Raised when a patch operation cannot be applied"""
+
+
+class ResumePatchConflict(ResumePatchError):
+    """Raised when a patch 'test' operation does not match the current resume"""
+
+
 class ResumeService:
     """Service for resume parsing and management"""
     
@@ -23,11 +42,18 @@ class ResumeService:
             ParseResumeResponse with structured resume and suggestions
         """
         try:
+            cache_key = self._parse_cache_key(raw_text)
+            cached = await parse_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Parse cache hit. Stats: {parse_cache.stats()}")
+                return cached
+            
             logger.info("Starting resume parsing with LangGraph workflow")
             
             # Use LangGraph workflow to parse resume
             from src.langgraph.parse_resume.workflow import resume_workflow
             result = await resume_workflow.run(raw_text)
+            await parse_cache.set(cache_key, result)
             logger.info("Resume parsing completed successfully")
             return result
             
@@ -35,6 +61,60 @@ class ResumeService:
             logger.error(f"Error parsing resume: {str(e)}")
             raise
     
+    async def parse_resume_stream(self, raw_text: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Parse raw resume text, streaming sections as they are decoded
+        
+        Args:
+            raw_text: Raw resume text content
+            
+        Returns:
+            Async iterator of section, suggestion and final result/error events
+            
+        Raises:
+            LLMUnavailable: If a parse that misses the cache would be refused
+                by the LLM right now, before anything is streamed
+        """
+        cache_key = self._parse_cache_key(raw_text)
+        cached = await parse_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Parse cache hit. Stats: {parse_cache.stats()}")
+        else:
+            llm_client.check_admission(Priority.PARSE)
+        return self._parse_events(raw_text, cache_key, cached)
+    
+    async def _parse_events(self, raw_text: str, cache_key: str,
+                            cached: Optional[ParseResumeResponse]) -> AsyncIterator[Dict[str, Any]]:
+        """Replay a cached parse, or stream a new one and cache its result"""
+        if cached is not None:
+            for event in self._replay_parse_events(cached):
+                yield event
+            return
+        
+        logger.info("Starting streaming resume parsing with LangGraph workflow")
+        from src.langgraph.parse_resume.workflow import resume_workflow
+        async for event in resume_workflow.stream(raw_text):
+            if event["event"] == "result":
+                await parse_cache.set(cache_key, event["data"])
+            yield event
+    
+    def _parse_cache_key(self, raw_text: str) -> str:
+        """Cache key for a parse of this text with the current prompt and model"""
+        # Single-call and section-parallel parsing can produce different results
+        prompt_version = f"{PARSE_RESUME_PROMPT_VERSION}-{PARSE_RESUME_MODE}"
+        return make_parse_cache_key(raw_text, prompt_version, llm_client.model_id)
+    
+    def _replay_parse_events(self, result: ParseResumeResponse) -> List[Dict[str, Any]]:
+        """Build the streaming events for a cached parse result"""
+        events = [{"event": "basics", "data": result.resume.basics.model_dump()}]
+        for section in RESUME_LIST_SECTIONS:
+            for index, entry in enumerate(getattr(result.resume, section)):
+                events.append({"event": section, "index": index, "data": entry.model_dump()})
+        for suggestion in result.suggestions:
+            events.append({"event": "suggestion", "data": suggestion.model_dump()})
+        events.append({"event": "result", "data": result})
+        return events
+    
     async def accept_suggestion(self, field: str, suggested_value: str, current_resume: Resume) -> Resume:
         """
         Accept a suggestion and update the resume
@@ -50,13 +130,13 @@ class ResumeService:
         try:
             logger.info(f"Accepting suggestion for field: {field}")
             
-            # Parse field path
-            path_parts = self._parse_field_path(field)
+            # Parse field path (compiled once per distinct path)
+            path = compile_field_path(field)
             
-            # Update the resume
-            updated_resume = self._update_resume_field(current_resume, path_parts, suggested_value)
+            # Update the resume (copy-on-write, only the touched entry is copied)
+            updated_resume = path.replace(current_resume, suggested_value)
             
-            # Remove the accepted suggestion from all suggestion lists
+            # Remove the accepted suggestion from its entry's suggestion list
             updated_resume = self._remove_accepted_suggestion(updated_resume, field)
             
             logger.info(f"Suggestion accepted successfully for field: {field}")
@@ -66,125 +146,138 @@ class ResumeService:
             logger.error(f"Error accepting suggestion: {str(e)}")
             raise
     
-    def _remove_accepted_suggestion(self, resume: Resume, accepted_field: str) -> Resume:
-        """Remove the accepted suggestion from all suggestion lists"""
-        # Create a copy of the resume
-        resume_dict = resume.model_dump()
-        
-        # Remove from basics suggestions
-        if resume_dict.get('basics', {}).get('suggestions'):
-            resume_dict['basics']['suggestions'] = [
-                s for s in resume_dict['basics']['suggestions'] 
-                if s['field'] != accepted_field
-            ]
-        
-        # Remove from education suggestions
-        for edu in resume_dict.get('education', []):
-            if edu.get('suggestions'):
-                edu['suggestions'] = [
-                    s for s in edu['suggestions'] 
-                    if s['field'] != accepted_field
-                ]
-        
-        # Remove from work suggestions
-        for work in resume_dict.get('work', []):
-            if work.get('suggestions'):
-                work['suggestions'] = [
-                    s for s in work['suggestions'] 
-                    if s['field'] != accepted_field
-                ]
+    async def apply_suggestion_operations(
+        self, operations: List[SuggestionOperation], current_resume: Resume
+    ) -> Tuple[Resume, List[SuggestionOperationResult]]:
+        """
+        Accept or reject several suggestions in one pass
         
-        # Remove from skills suggestions
-        for skill in resume_dict.get('skills', []):
-            if skill.get('suggestions'):
-                skill['suggestions'] = [
-                    s for s in skill['suggestions'] 
-                    if s['field'] != accepted_field
-                ]
+        Operations are applied in order on a copy-on-write working copy. A
+        failed operation is reported and skipped, the others still apply.
         
-        # Remove from certificates suggestions
-        for cert in resume_dict.get('certificates', []):
-            if cert.get('suggestions'):
-                cert['suggestions'] = [
-                    s for s in cert['suggestions'] 
-                    if s['field'] != accepted_field
-                ]
+        Args:
+            operations: Accept/reject operations
+            current_resume: Current resume object
+            
+        Returns:
+            Updated resume object and the status of each operation
+        """
+        resume = current_resume
+        results = []
+        for operation in operations:
+            try:
+                if operation.action == SuggestionAction.ACCEPT:
+                    if operation.suggested is None:
+                        raise ValueError("Missing suggested value")
+                    resume = compile_field_path(operation.field).replace(resume, operation.suggested)
+                else:
+                    # Rejecting changes nothing, but the field must exist just as for accepting
+                    compile_field_path(operation.field).get(resume)
+                resume = self._remove_accepted_suggestion(resume, operation.field)
+                results.append(SuggestionOperationResult(
+                    field=operation.field, action=operation.action, status="applied"
+                ))
+            except (KeyError, IndexError, ValueError) as e:
+                logger.warning(f"Suggestion operation failed for field {operation.field}: {str(e)}")
+                results.append(SuggestionOperationResult(
+                    field=operation.field, action=operation.action, status="failed", error=str(e)
+                ))
         
-        # Create new Resume object from updated dict
-        return Resume(**resume_dict)
+        applied = sum(result.status == "applied" for result in results)
+        logger.info(f"Applied {applied}/{len(operations)} suggestion operations")
+        return resume, results
     
-    def _parse_field_path(self, field_path: str) -> List:
-        """Parse field path like 'work[0].description' into parts"""
-        parts = []
-        current = ""
-        i = 0
+    def patch_resume(self, operations: List[ResumePatchOperation], current_resume: Resume) -> Resume:
+        """
+        Apply RFC 6902 (JSON Patch) operations to the resume
+        
+        Each operation copies only the entries along its path and validates
+        only the value it touches. The operations apply atomically: the
+        original resume is left untouched if any of them fails.
         
-        while i < len(field_path):
-            char = field_path[i]
+        Args:
+            operations: add / remove / replace / test operations
+            current_resume: Current resume object
             
-            if char == '.':
-                if current:
-                    parts.append(current)
-                    current = ""
-            elif char == '[':
-                if current:
-                    parts.append(current)
-                    current = ""
-                # Find closing bracket
-                j = i + 1
-                while j < len(field_path) and field_path[j] != ']':
-                    j += 1
-                if j < len(field_path):
-                    index_str = field_path[i+1:j]
-                    try:
-                        parts.append(int(index_str))
-                        i = j
-                    except ValueError:
-                        raise ValueError(f"Invalid array index: {index_str}")
-                else:
-                    raise ValueError("Missing closing bracket")
-            else:
-                current += char
+        Returns:
+            Updated resume object
             
-            i += 1
-        
-        if current:
-            parts.append(current)
+        Raises:
+            ResumePatchConflict: A test operation failed
+            ResumePatchError: An operation is malformed or its path does not exist
+            ValidationError: A new value is invalid for its field
+        """
+        resume = current_resume
+        for i, operation in enumerate(operations):
+            try:
+                resume = self._apply_patch_operation(resume, operation)
+            except ResumePatchError:
+                raise
+            except (KeyError, IndexError) as e:
+                raise ResumePatchError(f"Operation {i} ({operation.op.value} {operation.path}): {e.args[0]}")
         
-        return parts
+        logger.info(f"Applied {len(operations)} patch operations")
+        return resume
     
-    def _update_resume_field(self, resume: Resume, path_parts: List, new_value: str) -> Resume:
-        """Update a field in the resume based on path parts"""
-        # Create a copy of the resume
-        resume_dict = resume.model_dump()
+    def _apply_patch_operation(self, resume: Resume, operation: ResumePatchOperation) -> Resume:
+        """Apply one patch operation, returning the updated copy"""
+        try:
+            parts = parse_json_pointer(operation.path)
+        except ValueError as e:
+            raise ResumePatchError(str(e))
+        if not parts:
+            raise ResumePatchError("The whole resume cannot be patched, use POST /api/resume")
+        if operation.op != ResumePatchOp.REMOVE and "value" not in operation.model_fields_set:
+            raise ResumePatchError(f"Missing value for {operation.op.value} {operation.path}")
         
-        # Navigate to the target field
-        current = resume_dict
-        for i, part in enumerate(path_parts[:-1]):
-            if isinstance(part, int):
-                # Array access
-                if not isinstance(current, list) or part >= len(current):
-                    raise IndexError(f"Array index {part} out of bounds")
-                current = current[part]
-            else:
-                # Object property access
-                if part not in current:
-                    raise KeyError(f"Field '{part}' not found")
-                current = current[part]
+        if operation.op == ResumePatchOp.TEST:
+            current = FieldPath.from_parts(parts).get(resume)
+            if to_jsonable_python(current) != operation.value:
+                raise ResumePatchConflict(f"Test failed at {operation.path}")
+            return resume
         
-        # Update the final field
-        final_part = path_parts[-1]
-        if isinstance(final_part, int):
-            if not isinstance(current, list) or final_part >= len(current):
-                raise IndexError(f"Array index {final_part} out of bounds")
-            current[final_part] = new_value
-        else:
-            if final_part not in current:
-                raise KeyError(f"Field '{final_part}' not found")
-            current[final_part] = new_value
+        if operation.op == ResumePatchOp.REPLACE:
+            return FieldPath.from_parts(parts).replace(resume, operation.value)
         
-        # Create new Resume object from updated dict
-        return Resume(**resume_dict)
+        last = parts[-1]
+        if isinstance(last, str) and last != "-":
+            # Model fields always exist: add sets the field, remove clears it
+            value = operation.value if operation.op == ResumePatchOp.ADD else None
+            return FieldPath.from_parts(parts).replace(resume, value)
+        
+        # Insert into / delete from an array
+        array_path = FieldPath.from_parts(parts[:-1])
+        array = array_path.get(resume)
+        if not isinstance(array, list):
+            raise ResumePatchError(f"Not an array: {operation.path}")
+        items = list(array)
+        if operation.op == ResumePatchOp.ADD:
+            index = len(items) if last == "-" else last
+            if index > len(items):
+                raise IndexError(f"Array index {index} out of bounds")
+            items.insert(index, operation.value)
+        else:
+            if last == "-" or last >= len(items):
+                raise IndexError(f"Array index {last} out of bounds")
+            del items[last]
+        return array_path.replace(resume, items)
+    
+    def _remove_accepted_suggestion(self, resume: Resume, accepted_field: str) -> Resume:
+        """Remove the accepted suggestion from the suggestion list of the entry it belongs to"""
+        suggestions_path = FieldPath.from_parts(list(compile_field_path(accepted_field).owner) + ["suggestions"])
+        suggestions = suggestions_path.get(resume, None)
+        if not suggestions or all(s.field != accepted_field for s in suggestions):
+            return resume
+        return suggestions_path.replace(resume, [s for s in suggestions if s.field != accepted_field])
+    
+    def _parse_field_path(self, field_path: str) -> List:
+        """Parse field path like 'work[0].description' into parts"""
+        return list(compile_field_path(field_path).parts)
+    
+    def _update_resume_field(self, resume: Resume, path_parts: List, new_value: str) -> Resume:
+        """Return a copy of the resume with the field at path parts replaced"""
+        # Raises KeyError / IndexError if the field does not exist
+        return FieldPath.from_parts(path_parts).replace(resume, new_value)
 
 
 # Global service instance
@@ -0,0 +1,654 @@
+import asyncio
+import logging
+import secrets
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from pydantic import BaseModel, Field, PrivateAttr
+from pydantic_core import to_json
+
+from src.config import (
+    RESUME_STORE_BACKEND, RESUME_STORE_MAX_SESSIONS, RESUME_STORE_MAX_BYTES,
+    RESUME_STORE_IDLE_TTL, RESUME_STORE_SQLITE_PATH, RESUME_STORE_REDIS_URL
+)
+from src.models.field_path import compile_field_path
+from src.models.resume import Resume, Suggestion, RESUME_LIST_SECTIONS
+
+logger = logging.getLogger(__name__)
+
+
+SuggestionOwner = Tuple[str, Optional[int]]
+
+
+class ResumeSession(BaseModel):
+    """
+    Resume and pending suggestions stored for one session.
+    
+    Stored sessions are treated as immutable: every change stores a new
+    session, so the suggestion index and the embedded document built from
+    this one never need invalidating. The SQLite and Redis stores return the
+    same object while the stored session is unchanged (DecodedSessionCache),
+    so these are built once per version on every backend.
+    """
+    resume: Resume = Field(..., description="Current resume")
+    suggestions: List[Suggestion] = Field(default_factory=list, description="Pending suggestions")
+    version: int = Field(0, description="Incremented every time the session is replaced")
+    revision: str = Field(
+        default_factory=lambda: secrets.token_hex(8),
+        description="Random token shared by all versions of one session, so versions of an expired session are not reused"
+    )
+    
+    _suggestion_index: Dict[SuggestionOwner, List[Suggestion]] = PrivateAttr(default_factory=dict)
+    _embedded_document: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    _embedded_document_json: Optional[bytes] = PrivateAttr(default=None)
+    
+    def model_post_init(self, __context: Any) -> None:
+        self._suggestion_index = index_suggestions(self.suggestions)
+    
+    @property
+    def suggestion_index(self) -> Dict[SuggestionOwner, List[Suggestion]]:
+        """Suggestions grouped by the entry they belong to, e.g. ("work", 0) or ("basics", None)"""
+        return self._suggestion_index
+    
+    @property
+    def etag(self) -> str:
+        """
+        Weak ETag of the stored resume and suggestions
+
+        Weak because the same version goes out brotli-, gzip- or un-encoded,
+        and a strong validator must differ whenever the bytes do.
+        """
+        return f'W/"{self.revision}-{self.version}"'
+    
+    def without_suggestion(self, field: str) -> List[Suggestion]:
+        """Pending suggestions minus those for field (this session's list if none match)"""
+        return self.without_suggestions([field])
+    
+    def without_suggestions(self, fields: Iterable[str]) -> List[Suggestion]:
+        """Pending suggestions minus those for any of fields (this session's list if none match)"""
+        pending = set()
+        for field in fields:
+            owner = suggestion_owner(field)
+            if owner is not None and any(s.field == field for s in self._suggestion_index.get(owner, ())):
+                pending.add(field)
+        if not pending:
+            return self.suggestions
+        return [s for s in self.suggestions if s.field not in pending]
+    
+    def embedded_document(self) -> Dict[str, Any]:
+        """The resume with suggestions embedded into their entries (built once)"""
+        if self._embedded_document is None:
+            document = self.resume.model_dump()
+            for (section, index), suggestions in self._suggestion_index.items():
+                if index is None:
+                    target = document[section]
+                elif index < len(document[section]):
+                    target = document[section][index]
+                else:
+                    continue
+                if target.get("suggestions") is None:
+                    target["suggestions"] = []
+                target["suggestions"].extend(suggestion.model_dump() for suggestion in suggestions)
+            self._embedded_document = document
+        return self._embedded_document
+    
+    def embedded_document_json(self) -> bytes:
+        """The embedded document as compact UTF-8 JSON, the same bytes JSONResponse renders (built once)"""
+        if self._embedded_document_json is None:
+            self._embedded_document_json = to_json(self.embedded_document())
+        return self._embedded_document_json
+
+
+def next_session(previous: Optional[ResumeSession], resume: Resume,
+                 suggestions: List[Suggestion]) -> ResumeSession:
+    """A session replacing previous, with the next version number"""
+    if previous is None:
+        return ResumeSession(resume=resume, suggestions=suggestions, version=1)
+    return ResumeSession(
+        resume=resume, suggestions=suggestions, version=previous.version + 1, revision=previous.revision
+    )
+
+
+def _same_version(current: Optional[ResumeSession], expected: Optional[ResumeSession]) -> bool:
+    """Whether current is the stored version expected (both None: no session)"""
+    if current is None or expected is None:
+        return current is None and expected is None
+    return current.revision == expected.revision and current.version == expected.version
+
+
+def suggestion_owner(field: str) -> Optional[SuggestionOwner]:
+    """The resume entry a suggestion's field path points into, if any"""
+    try:
+        path = compile_field_path(field)
+    except ValueError:
+        return None
+    entry = path.owner
+    if entry[0] == "basics" and len(path.parts) > 1:
+        return ("basics", None)
+    if entry[0] in RESUME_LIST_SECTIONS and len(entry) == 2:
+        return (entry[0], entry[1])
+    return None
+
+
+def index_suggestions(suggestions: List[Suggestion]) -> Dict[SuggestionOwner, List[Suggestion]]:
+    """Group suggestions by the resume entry their field path points into"""
+    index: Dict[SuggestionOwner, List[Suggestion]] = {}
+    for suggestion in suggestions:
+        owner = suggestion_owner(suggestion.field)
+        if owner is not None:
+            index.setdefault(owner, []).append(suggestion)
+    return index
+
+
+class DecodedSessionCache:
+    """
+    Sessions last read from a store that keeps them serialized, by session id.
+
+    SQLite and Redis hand back JSON, and decoding it builds a new
+    ResumeSession whose suggestion index, embedded document and response
+    JSON would all be rebuilt on every read. While the stored JSON is the
+    same as last time, the session decoded then is returned instead, with
+    everything it has built. Comparing against the freshly read JSON keeps
+    this correct when other workers write to the store.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, ResumeSession]]" = OrderedDict()
+
+    def decode(self, session_id: str, data: Any) -> ResumeSession:
+        """The session stored as data (str or bytes of JSON)"""
+        entry = self._entries.get(session_id)
+        if entry is not None and entry[0] == data:
+            self._entries.move_to_end(session_id)
+            return entry[1]
+        session = ResumeSession.model_validate_json(data)
+        self.put(session_id, data, session)
+        return session
+
+    def put(self, session_id: str, data: Any, session: ResumeSession) -> None:
+        """Remember that session was just stored as data"""
+        self._entries[session_id] = (data, session)
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, session_id: str) -> None:
+        self._entries.pop(session_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class ResumeStore(ABC):
+    """Session-scoped resume storage backend"""
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[ResumeSession]:
+        """Return the session, refreshing its idle timeout"""
+
+    @abstractmethod
+    async def set(self, session_id: str, session: ResumeSession) -> None:
+        """Create or replace the session"""
+
+    @abstractmethod
+    async def replace(self, session_id: str, expected: Optional[ResumeSession],
+                      session: ResumeSession) -> bool:
+        """
+        Store session only if the stored one is still expected (None: no session)
+
+        Compare-and-set on the session's revision and version, atomic across
+        workers sharing the store. Returns False, storing nothing, when
+        another request replaced the session first.
+        """
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        """Remove the session"""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove all sessions"""
+
+    async def close(self) -> None:
+        """Release backend resources"""
+
+
+class MemoryResumeStore(ResumeStore):
+    """In-process store with LRU, total-size and idle-TTL eviction"""
+
+    def __init__(self, max_sessions: int = RESUME_STORE_MAX_SESSIONS,
+                 max_bytes: int = RESUME_STORE_MAX_BYTES,
+                 idle_ttl: float = RESUME_STORE_IDLE_TTL):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        # session_id -> (session, size in bytes, last access time), oldest access first
+        self._sessions: "OrderedDict[str, Tuple[ResumeSession, int, float]]" = OrderedDict()
+        self.total_bytes = 0
+        # Held by every method that touches _sessions or total_bytes, so
+        # replace's compare and write is one step, also across threads
+        self._lock = threading.Lock()
+
+    async def get(self, session_id: str) -> Optional[ResumeSession]:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            now = time.monotonic()
+            if now - entry[2] > self.idle_ttl:
+                self._remove(session_id)
+                return None
+            self._sessions[session_id] = (entry[0], entry[1], now)
+            self._sessions.move_to_end(session_id)
+            return entry[0]
+
+    async def set(self, session_id: str, session: ResumeSession) -> None:
+        with self._lock:
+            self._store(session_id, session)
+
+    async def replace(self, session_id: str, expected: Optional[ResumeSession],
+                      session: ResumeSession) -> bool:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            current = entry[0] if entry is not None else None
+            if not _same_version(current, expected):
+                return False
+            self._store(session_id, session)
+            return True
+
+    async def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._remove(session_id)
+
+    def _store(self, session_id: str, session: ResumeSession) -> None:
+        self._remove(session_id)
+        size = len(session.model_dump_json())
+        self._sessions[session_id] = (session, size, time.monotonic())
+        self.total_bytes += size
+        self._evict(keep=session_id)
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            self.total_bytes = 0
+
+    def _remove(self, session_id: str) -> None:
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def _evict(self, keep: str) -> None:
+        """Drop idle sessions and least recently used ones beyond the limits"""
+        now = time.monotonic()
+        # Entries are ordered by last access, so idle ones are at the front
+        while self._sessions:
+            oldest_id = next(iter(self._sessions))
+            if oldest_id == keep:
+                break
+            idle = now - self._sessions[oldest_id][2] > self.idle_ttl
+            over_limit = len(self._sessions) > self.max_sessions or self.total_bytes > self.max_bytes
+            if not idle and not over_limit:
+                break
+            logger.info(f"Evicting resume session {oldest_id}")
+            self._remove(oldest_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+
+class SQLiteResumeStore(ResumeStore):
+    """SQLite-file store shared by all worker processes on one host"""
+
+    def __init__(self, path: str = RESUME_STORE_SQLITE_PATH,
+                 max_sessions: int = RESUME_STORE_MAX_SESSIONS,
+                 max_bytes: int = RESUME_STORE_MAX_BYTES,
+                 idle_ttl: float = RESUME_STORE_IDLE_TTL):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self.decoded = DecodedSessionCache()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS resume_sessions ("
+                "session_id TEXT PRIMARY KEY, data TEXT NOT NULL, "
+                "size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS resume_sessions_accessed ON resume_sessions (accessed_at)"
+            )
+            # Session count and total size are kept up to date by triggers, so
+            # enforcing the limits never scans the whole table
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS resume_sessions_totals (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    count INTEGER NOT NULL, bytes INTEGER NOT NULL);
+                INSERT OR IGNORE INTO resume_sessions_totals VALUES (0, 0, 0);
+                CREATE TRIGGER IF NOT EXISTS resume_sessions_insert AFTER INSERT ON resume_sessions BEGIN
+                    UPDATE resume_sessions_totals SET count = count + 1, bytes = bytes + NEW.size;
+                END;
+                CREATE TRIGGER IF NOT EXISTS resume_sessions_update AFTER UPDATE OF size ON resume_sessions BEGIN
+                    UPDATE resume_sessions_totals SET bytes = bytes + NEW.size - OLD.size;
+                END;
+                CREATE TRIGGER IF NOT EXISTS resume_sessions_delete AFTER DELETE ON resume_sessions BEGIN
+                    UPDATE resume_sessions_totals SET count = count - 1, bytes = bytes - OLD.size;
+                END;
+            """)
+            self._conn.commit()
+
+    async def get(self, session_id: str) -> Optional[ResumeSession]:
+        data = await asyncio.to_thread(self._get, session_id, time.time())
+        if data is None:
+            self.decoded.discard(session_id)
+            return None
+        return self.decoded.decode(session_id, data)
+
+    async def set(self, session_id: str, session: ResumeSession) -> None:
+        data = session.model_dump_json()
+        await asyncio.to_thread(self._set, session_id, data, time.time())
+        self.decoded.put(session_id, data, session)
+
+    async def replace(self, session_id: str, expected: Optional[ResumeSession],
+                      session: ResumeSession) -> bool:
+        data = session.model_dump_json()
+        replaced = await asyncio.to_thread(self._replace, session_id, expected, data, time.time())
+        if replaced:
+            self.decoded.put(session_id, data, session)
+        return replaced
+
+    async def delete(self, session_id: str) -> None:
+        self.decoded.discard(session_id)
+        await asyncio.to_thread(self._execute, "DELETE FROM resume_sessions WHERE session_id = ?", (session_id,))
+
+    async def clear(self) -> None:
+        self.decoded.clear()
+        await asyncio.to_thread(self._execute, "DELETE FROM resume_sessions", ())
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def _get(self, session_id: str, now: float) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, accessed_at FROM resume_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.idle_ttl:
+                self._conn.execute("DELETE FROM resume_sessions WHERE session_id = ?", (session_id,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE resume_sessions SET accessed_at = ? WHERE session_id = ?", (now, session_id)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def _set(self, session_id: str, data: str, now: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO resume_sessions (session_id, data, size, accessed_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (session_id) DO UPDATE SET "
+                "data = excluded.data, size = excluded.size, accessed_at = excluded.accessed_at",
+                (session_id, data, len(data), now)
+            )
+            self._evict(session_id, now)
+            self._conn.commit()
+
+    def _replace(self, session_id: str, expected: Optional[ResumeSession], data: str, now: float) -> bool:
+        with self._lock:
+            if expected is None:
+                cursor = self._conn.execute(
+                    "INSERT INTO resume_sessions (session_id, data, size, accessed_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (session_id) DO NOTHING",
+                    (session_id, data, len(data), now)
+                )
+            else:
+                # One statement, so the check and the write are atomic across processes
+                cursor = self._conn.execute(
+                    "UPDATE resume_sessions SET data = ?, size = ?, accessed_at = ? "
+                    "WHERE session_id = ? AND json_extract(data, '$.revision') = ? "
+                    "AND json_extract(data, '$.version') = ?",
+                    (data, len(data), now, session_id, expected.revision, expected.version)
+                )
+            if cursor.rowcount != 1:
+                self._conn.rollback()
+                return False
+            self._evict(session_id, now)
+            self._conn.commit()
+            return True
+
+    def _evict(self, keep: str, now: float) -> None:
+        """Drop idle sessions and least recently used ones beyond the limits (lock held)"""
+        self._conn.execute(
+            "DELETE FROM resume_sessions WHERE accessed_at < ?", (now - self.idle_ttl,)
+        )
+        count, total = self._conn.execute(
+            "SELECT count, bytes FROM resume_sessions_totals"
+        ).fetchone()
+        if count > self.max_sessions or total > self.max_bytes:
+            # Walk the access-time index from the oldest entry, only as far as needed
+            cursor = self._conn.execute(
+                "SELECT session_id, size FROM resume_sessions WHERE session_id != ? ORDER BY accessed_at",
+                (keep,)
+            )
+            evicted = []
+            for old_id, size in cursor:
+                if count <= self.max_sessions and total <= self.max_bytes:
+                    break
+                evicted.append((old_id,))
+                count -= 1
+                total -= size
+            cursor.close()
+            self._conn.executemany("DELETE FROM resume_sessions WHERE session_id = ?", evicted)
+
+
+class RedisError(Exception):
+    """Error reply from a Redis-protocol server"""
+
+
+class RedisConnection:
+    """Minimal RESP client over a single asyncio connection"""
+
+    def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0,
+                 password: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisConnection":
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip("/") or 0)
+        return cls(parsed.hostname or "localhost", parsed.port or 6379, db, parsed.password)
+
+    async def execute(self, *args: Any) -> Any:
+        """Send one command and return its decoded reply"""
+        async with self._lock:
+            if self._writer is None:
+                await self._connect()
+            try:
+                return await self._roundtrip(args)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Reconnect once, e.g. after the server closed an idle connection
+                await self._disconnect()
+                await self._connect()
+                return await self._roundtrip(args)
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._disconnect()
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            await self._roundtrip(("AUTH", self.password))
+        if self.db:
+            await self._roundtrip(("SELECT", self.db))
+
+    async def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+        self._reader = self._writer = None
+
+    async def _roundtrip(self, args: tuple) -> Any:
+        self._writer.write(encode_command(*args))
+        await self._writer.drain()
+        return await read_reply(self._reader)
+
+
+def encode_command(*args: Any) -> bytes:
+    """Encode a command as a RESP array of bulk strings"""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """Read one RESP reply"""
+    line = await reader.readuntil(b"\r\n")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode("utf-8")
+    if kind == b"-":
+        raise RedisError(payload.decode("utf-8"))
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        count = int(payload)
+        if count < 0:
+            return None
+        return [await read_reply(reader) for _ in range(count)]
+    raise RedisError(f"Unknown RESP reply type: {line!r}")
+
+
+# Compare-and-set for RedisResumeStore.replace: KEYS[1] is the session key,
+# ARGV the expected revision and version ("" for no session), the new data and PX
+_REDIS_REPLACE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current then
+    local session = cjson.decode(current)
+    if ARGV[1] == '' or session.revision ~= ARGV[1] or session.version ~= tonumber(ARGV[2]) then
+        return 0
+    end
+elseif ARGV[1] ~= '' then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[3], 'PX', ARGV[4])
+return 1
+"""
+
+
+class RedisResumeStore(ResumeStore):
+    """
+    Store for multi-host deployments, speaking the Redis protocol.
+
+    Idle TTL is enforced with key expiry; LRU and memory bounds are left to
+    the server (``maxmemory`` with ``allkeys-lru``).
+    """
+
+    def __init__(self, url: str = RESUME_STORE_REDIS_URL,
+                 idle_ttl: float = RESUME_STORE_IDLE_TTL,
+                 key_prefix: str = "jobprep:resume:", scan_count: int = 500):
+        self.connection = RedisConnection.from_url(url)
+        self.idle_ttl_ms = int(idle_ttl * 1000)
+        self.key_prefix = key_prefix
+        self.scan_count = scan_count
+        self.decoded = DecodedSessionCache()
+
+    def _key(self, session_id: str) -> str:
+        return self.key_prefix + session_id
+
+    async def get(self, session_id: str) -> Optional[ResumeSession]:
+        data = await self.connection.execute("GET", self._key(session_id))
+        if data is None:
+            self.decoded.discard(session_id)
+            return None
+        await self.connection.execute("PEXPIRE", self._key(session_id), self.idle_ttl_ms)
+        return self.decoded.decode(session_id, data)
+
+    async def set(self, session_id: str, session: ResumeSession) -> None:
+        data = session.model_dump_json()
+        await self.connection.execute("SET", self._key(session_id), data, "PX", self.idle_ttl_ms)
+        # GET replies are bytes
+        self.decoded.put(session_id, data.encode("utf-8"), session)
+
+    async def replace(self, session_id: str, expected: Optional[ResumeSession],
+                      session: ResumeSession) -> bool:
+        data = session.model_dump_json()
+        replaced = await self.connection.execute(
+            "EVAL", _REDIS_REPLACE_SCRIPT, 1, self._key(session_id),
+            expected.revision if expected is not None else "",
+            expected.version if expected is not None else 0,
+            data, self.idle_ttl_ms
+        )
+        if replaced != 1:
+            return False
+        self.decoded.put(session_id, data.encode("utf-8"), session)
+        return True
+
+    async def delete(self, session_id: str) -> None:
+        self.decoded.discard(session_id)
+        await self.connection.execute("DEL", self._key(session_id))
+
+    async def clear(self) -> None:
+        self.decoded.clear()
+        # SCAN in batches instead of KEYS, which blocks the server on large keyspaces
+        cursor = b"0"
+        while True:
+            cursor, keys = await self.connection.execute(
+                "SCAN", cursor, "MATCH", self.key_prefix + "*", "COUNT", self.scan_count
+            )
+            if keys:
+                await self.connection.execute("DEL", *keys)
+            if cursor == b"0":
+                break
+
+    async def close(self) -> None:
+        await self.connection.close()
+
+
+def create_resume_store(backend: str = RESUME_STORE_BACKEND) -> ResumeStore:
+    """Create the resume store configured by RESUME_STORE_BACKEND"""
+    if backend == "memory":
+        return MemoryResumeStore()
+    if backend == "sqlite":
+        return SQLiteResumeStore()
+    if backend == "redis":
+        return RedisResumeStore()
+    raise ValueError(f"Unknown resume store backend: {backend}")
+
+
+# Global store instance
+resume_store = create_resume_store()
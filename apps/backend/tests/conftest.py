@@ -0,0 +1,30 @@
+"""
+Shared fixtures for the backend tests
+"""
+from typing import Callable
+
+import pytest
+
+
+def build_completion(content: str) -> dict:
+    """Build a minimal OpenAI-compatible chat completion payload"""
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "qwen-turbo-latest",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }
+        ],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+    }
+
+
+@pytest.fixture
+def completion() -> Callable[[str], dict]:
+    """Builder of chat completion payloads for httpx.MockTransport handlers"""
+    return build_completion
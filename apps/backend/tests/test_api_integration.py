@@ -1,7 +1,13 @@
+import asyncio
+import json
 import pytest
 from fastapi.testclient import TestClient
 from src.main import app
-from src.routers.resume import resume_storage
+from unittest.mock import AsyncMock, patch
+from src.llm.admission import LLMOverloaded, Priority
+from src.llm.circuit_breaker import CircuitOpen
+from src.llm.resilience import LLMDeadlineExceeded
+from src.services.session_store import resume_store, next_session
 
 client = TestClient(app)
 
@@ -11,7 +17,7 @@ class TestResumeAPI:
     
     def setup_method(self):
         """Clear in-memory storage before each test"""
-        resume_storage.clear()
+        asyncio.run(resume_store.clear())
     
     def test_parse_resume_success(self):
         """Test successful resume parsing with LangGraph workflow"""
@@ -67,6 +73,62 @@ class TestResumeAPI:
         
         assert response.status_code == 422  # Validation error
     
+    def test_parse_resume_stream_success(self):
+        """Test streaming resume parsing emits sections before the final result"""
+        test_text = "张三\n邮箱: test@example.com\n教育: 清华大学\n工作: 阿里巴巴"
+        
+        response = client.post("/api/parse_resume/stream", json={"text": test_text})
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines() if line]
+        names = [event["event"] for event in events]
+        
+        assert names[0] == "basics"
+        assert "education" in names
+        assert "work" in names
+        assert "suggestion" in names
+        assert names[-1] == "result"
+        assert events[0]["data"]["name"] == "张三"
+        
+        result = events[-1]["data"]
+        assert result["resume"]["basics"]["name"] == "张三"
+        assert len(result["suggestions"]) == names.count("suggestion")
+        
+        # The streamed result is stored like the non-streaming endpoint
+        get_response = client.get("/api/resume")
+        assert get_response.status_code == 200
+        assert get_response.json()["basics"]["name"] == "张三"
+    
+    def test_sessions_are_isolated(self):
+        """Test that each session id sees only its own resume"""
+        test_text = "张三\n邮箱: test@example.com"
+        response = client.post("/api/parse_resume", json={"text": test_text}, headers={"X-Session-ID": "user-a"})
+        assert response.status_code == 200
+        
+        assert client.get("/api/resume", headers={"X-Session-ID": "user-a"}).status_code == 200
+        assert client.get("/api/resume", headers={"X-Session-ID": "user-b"}).status_code == 404
+        assert client.get("/api/resume").status_code == 404
+    
+    def test_cookieless_clients_get_own_sessions(self):
+        """Test that clients without a session id are given separate sessions by cookie"""
+        first, second = TestClient(app), TestClient(app)
+        response = first.post("/api/parse_resume", json={"text": "张三\n邮箱: test@example.com"})
+        assert response.status_code == 200
+        cookie = response.headers["set-cookie"]
+        assert cookie.startswith("jobprep_session=") and "HttpOnly" in cookie
+        
+        assert first.get("/api/resume").status_code == 200
+        assert "set-cookie" not in first.get("/api/resume").headers
+        missing = second.get("/api/resume")
+        assert missing.status_code == 404
+        assert missing.cookies["jobprep_session"] != first.cookies["jobprep_session"]
+    
+    def test_invalid_session_id(self):
+        """Test that malformed session ids are rejected"""
+        response = client.get("/api/resume", headers={"X-Session-ID": "bad id!"})
+        assert response.status_code == 400
+    
     def test_get_resume_not_found(self):
         """Test getting resume when none exists"""
         response = client.get("/api/resume")
@@ -106,6 +168,166 @@ class TestResumeAPI:
         error_detail = response.json()["detail"]
         assert "nonexistent" in error_detail.lower() or "error" in error_detail.lower()
 
+    def test_accept_suggestion_removes_pending(self):
+        """Test that an accepted suggestion is applied and no longer embedded"""
+        parse_response = client.post("/api/parse_resume", json={"text": "张三\n邮箱: test@example.com"})
+        assert parse_response.status_code == 200
+        suggestion = parse_response.json()["suggestions"][0]
+        
+        response = client.post(
+            "/api/accept_suggestion",
+            json={"field": suggestion["field"], "suggested": suggestion["suggested"]}
+        )
+        assert response.status_code == 200
+        
+        document = client.get("/api/resume").json()
+        embedded = [
+            s["field"]
+            for entry in [document["basics"], *document["education"], *document["work"]]
+            for s in entry.get("suggestions") or []
+        ]
+        assert suggestion["field"] not in embedded
+
+    def test_accept_suggestions_batch(self):
+        """Test applying several operations with per-operation status"""
+        parse_response = client.post("/api/parse_resume", json={"text": "张三\n邮箱: test@example.com"})
+        assert parse_response.status_code == 200
+        
+        response = client.post("/api/accept_suggestions", json={"operations": [
+            {"field": "work[0].description", "suggested": "负责后端开发"},
+            {"field": "nonexistent[0].field", "suggested": "新值"},
+            {"field": "basics.summary", "action": "reject"},
+            {"field": "basics.name"},
+            {"field": "work[5].description", "action": "reject"},
+            {"field": "basics.nickname", "action": "reject"},
+        ]})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [r["status"] for r in data["results"]] == ["applied", "failed", "applied", "failed", "failed", "failed"]
+        assert data["results"][3]["error"] == "Missing suggested value"
+        assert data["results"][4]["error"]
+        assert data["resume"]["work"][0]["description"] == "负责后端开发"
+        assert client.get("/api/resume").json()["work"][0]["description"] == "负责后端开发"
+    
+    def test_accept_suggestions_no_resume(self):
+        """Test batch operations when no resume exists"""
+        response = client.post("/api/accept_suggestions", json={"operations": [
+            {"field": "work[0].description", "suggested": "新值"}
+        ]})
+        
+        assert response.status_code == 404
+
+    def test_patch_resume_versions(self):
+        """Test PATCH updates with optimistic concurrency on the version"""
+        client.post("/api/parse_resume", json={"text": "张三\n邮箱: test@example.com"})
+        version = int(client.get("/api/resume").headers["X-Resume-Version"])
+        
+        response = client.patch("/api/resume", json={
+            "version": version,
+            "operations": [{"op": "replace", "path": "/basics/summary", "value": "新简介"}]
+        })
+        assert response.status_code == 200
+        assert response.json()["version"] == version + 1
+        assert response.json()["resume"]["basics"]["summary"] == "新简介"
+        
+        # A stale version is rejected and nothing is stored
+        stale = client.patch("/api/resume", json={
+            "version": version,
+            "operations": [{"op": "replace", "path": "/basics/summary", "value": "旧简介"}]
+        })
+        assert stale.status_code == 409
+        document = client.get("/api/resume")
+        assert document.json()["basics"]["summary"] == "新简介"
+        assert document.headers["X-Resume-Version"] == str(version + 1)
+    
+    def test_concurrent_write_conflicts(self):
+        """Test that a write landing between a request's version check and its store is not overwritten"""
+        client.post("/api/parse_resume", json={"text": "张三\n邮箱: test@example.com"})
+        version = int(client.get("/api/resume").headers["X-Resume-Version"])
+        get_session = resume_store.get
+        
+        async def read_then_concurrent_write(session_id):
+            # Another worker stores the next version right after this request read the session
+            current = await get_session(session_id)
+            await resume_store.set(session_id, next_session(current, current.resume, []))
+            return current
+        
+        with patch("src.routers.resume.resume_store.get", side_effect=read_then_concurrent_write):
+            response = client.patch("/api/resume", json={
+                "version": version,
+                "operations": [{"op": "replace", "path": "/basics/summary", "value": "新简介"}]
+            })
+        
+        assert response.status_code == 409
+        document = client.get("/api/resume")
+        assert document.headers["X-Resume-Version"] == str(version + 1)
+        assert document.json()["basics"]["summary"] != "新简介"
+        
+        with patch("src.routers.resume.resume_store.replace", return_value=False):
+            response = client.post("/api/accept_suggestion", json={
+                "field": "basics.summary", "current": "", "suggested": "新简介"
+            })
+        assert response.status_code == 409
+    
+    def test_get_resume_conditional(self):
+        """Test ETag revalidation of GET /api/resume"""
+        client.post("/api/parse_resume", json={"text": "张三\n邮箱: test@example.com"})
+        first = client.get("/api/resume")
+        etag = first.headers["ETag"]
+        # Weak: the same version is sent with different content codings
+        assert etag.startswith('W/"')
+        
+        unchanged = client.get("/api/resume", headers={"If-None-Match": etag})
+        assert unchanged.status_code == 304
+        assert unchanged.content == b""
+        assert client.get("/api/resume", headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+        # Weak comparison also matches the tag sent back without W/
+        assert client.get("/api/resume", headers={"If-None-Match": etag.removeprefix("W/")}).status_code == 304
+        assert client.get("/api/resume", headers={"If-None-Match": etag, "Accept-Encoding": "br"}).status_code == 304
+        
+        # Accepting a suggestion changes the ETag and returns the new one
+        suggestion = first.json()["work"][0]["suggestions"][0]
+        accepted = client.post(
+            "/api/accept_suggestion",
+            json={"field": suggestion["field"], "suggested": suggestion["suggested"]}
+        )
+        assert accepted.headers["ETag"] != etag
+        
+        changed = client.get("/api/resume", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] == accepted.headers["ETag"]
+        assert client.get("/api/resume", headers={"If-None-Match": accepted.headers["ETag"]}).status_code == 304
+    
+    def test_responses_match_json_response(self):
+        """Test that response bodies are the bytes JSONResponse would render"""
+        parsed = client.post("/api/parse_resume", json={"text": "张三\n邮箱: test@example.com"})
+        document = client.get("/api/resume")
+        
+        for response in (parsed, document):
+            expected = json.dumps(response.json(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            assert response.content == expected
+            assert response.headers["content-type"] == "application/json"
+    
+    def test_patch_resume_invalid(self):
+        """Test PATCH with invalid operations"""
+        client.post("/api/parse_resume", json={"text": "张三\n邮箱: test@example.com"})
+        
+        response = client.patch("/api/resume", json={
+            "operations": [{"op": "replace", "path": "/work/9/description", "value": "x"}]
+        })
+        assert response.status_code == 400
+        
+        response = client.patch("/api/resume", json={
+            "operations": [{"op": "test", "path": "/basics/name", "value": "别人"}]
+        })
+        assert response.status_code == 409
+        
+        response = client.patch("/api/resume", json={
+            "operations": [{"op": "move", "path": "/basics/name", "from": "/basics/email"}]
+        })
+        assert response.status_code == 422
+
     def test_save_resume_success(self):
         """Test successful resume saving"""
         resume_data = {
@@ -364,6 +586,22 @@ class TestChatAPI:
         if response.status_code == 400:
             assert "No user message found" in response.json()["detail"]
     
+    @pytest.mark.parametrize("error,status,retry_after", [
+        (LLMOverloaded(Priority.CHAT, 7), 429, "7"),
+        (CircuitOpen(9), 503, "9"),
+        (LLMDeadlineExceeded("deadline exceeded"), 504, None),
+    ])
+    def test_chat_llm_unavailable(self, error, status, retry_after):
+        """Test that an unavailable LLM is reported with its status, not a canned reply"""
+        request_data = {"messages": [{"role": "user", "content": "随便聊聊"}], "context": {}}
+        
+        with patch("src.langgraph.chat.nodes.llm_client.route_intent", new_callable=AsyncMock, side_effect=error), \
+             patch("src.langgraph.chat.nodes.llm_client.chat_response", new_callable=AsyncMock, side_effect=error):
+            response = client.post("/api/chat", json=request_data)
+        
+        assert response.status_code == status
+        assert response.headers.get("Retry-After") == retry_after
+    
     # Chat test endpoint has been removed
     # def test_chat_test_endpoint(self):
     #     """Test chat test endpoint"""
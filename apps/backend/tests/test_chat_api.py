@@ -1,6 +1,8 @@
 """
 Integration tests for chat API endpoints
 """
+import json
+
 import pytest
 from unittest.mock import AsyncMock, patch
 from fastapi.testclient import TestClient
@@ -288,4 +290,66 @@ class TestChatAPI:
             assert response.status_code == 200
             data = response.json()
             assert "reply" in data
-            mock_run.assert_called_once() 
\ No newline at end of file
+            mock_run.assert_called_once() 
+    
+    def test_chat_stream(self, sample_resume):
+        """Test that the streaming endpoint sends NDJSON events ending with the result"""
+        request_data = {
+            "messages": [{"role": "user", "content": "你好"}],
+            "context": {"resume": sample_resume}
+        }
+        
+        response = client.post("/api/chat/stream", json=request_data)
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines() if line]
+        tokens = [event["data"] for event in events if event["event"] == "token"]
+        assert len(tokens) > 1
+        assert events[-1]["event"] == "result"
+        assert events[-1]["data"]["response"] == "".join(tokens)
+    
+    def test_chat_stream_suggestion(self, sample_resume, sample_history):
+        """Test that a streamed suggestion is serialized in the result event"""
+        request_data = {
+            "messages": sample_history + [{"role": "user", "content": "帮我优化一下summary"}],
+            "context": {"resume": sample_resume}
+        }
+        
+        response = client.post("/api/chat/stream", json=request_data)
+        
+        result = json.loads(response.text.splitlines()[-1])["data"]
+        assert result["suggestion"]["field"] == "basics.summary"
+    
+    def test_chat_stream_without_user_message(self):
+        """Test that a request without a user message is rejected before streaming"""
+        response = client.post("/api/chat/stream", json={"messages": [{"role": "assistant", "content": "您好"}]})
+        
+        assert response.status_code == 400
+    
+    def test_chat_session_thread(self):
+        """Test that /api/chat keeps the session's thread and re-renders the resume only after it changes"""
+        from src.langgraph.chat.context import resume_context
+        
+        headers = {"X-Session-ID": "chat-thread"}
+        parsed = client.post("/api/parse_resume", json={"text": "张三\n工作: 阿里巴巴"}, headers=headers)
+        assert parsed.status_code == 200
+        
+        suggest = client.post("/api/chat", json={"messages": [{"role": "user", "content": "帮我优化一下summary"}]},
+                              headers=headers).json()
+        assert suggest["action"]["type"] == "suggest_update"
+        assert suggest["action"]["current"] == parsed.json()["resume"]["basics"]["summary"]
+        
+        misses = resume_context.misses
+        confirm = client.post("/api/chat", json={"messages": [{"role": "user", "content": "确认"}]},
+                              headers=headers).json()
+        assert confirm["action"]["type"] == "accept_suggestion"
+        assert resume_context.misses == misses
+        
+        accepted = client.post("/api/accept_suggestion", json={
+            "field": confirm["action"]["field"], "suggested": confirm["action"]["suggested"]
+        }, headers=headers)
+        assert accepted.status_code == 200
+        client.post("/api/chat", json={"messages": [{"role": "user", "content": "你好"}]}, headers=headers)
+        assert resume_context.misses == misses + 1
+
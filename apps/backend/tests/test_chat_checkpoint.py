@@ -0,0 +1,153 @@
+"""
+Tests for persistent chat threads and the bounded checkpointers
+"""
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from src.langgraph.chat.checkpoint import MemoryCheckpointSaver, SQLiteCheckpointSaver, create_chat_checkpointer
+from src.langgraph.chat.workflow import ChatWorkflow
+from src.models.resume import Suggestion
+
+
+RESUME = {"basics": {"name": "张三", "summary": "软件工程师"}}
+
+
+def thread(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+class TestCheckpointSavers:
+    """Test cases for the latest-checkpoint-only savers"""
+    
+    @pytest.mark.asyncio
+    async def test_memory_evicts_least_recently_used(self):
+        """Test that the thread untouched the longest is dropped beyond max_threads"""
+        saver = MemoryCheckpointSaver(max_threads=2)
+        workflow = ChatWorkflow(checkpointer=saver)
+        await workflow.run("你好", resume=RESUME, thread_id="a")
+        await workflow.run("你好", resume=RESUME, thread_id="b")
+        await saver.aget_tuple(thread("a"))
+        await workflow.run("你好", resume=RESUME, thread_id="c")
+        
+        assert saver.thread_count == 2
+        assert await saver.aget_tuple(thread("a")) is not None
+        assert await saver.aget_tuple(thread("b")) is None
+    
+    @pytest.mark.asyncio
+    async def test_memory_expires_idle_threads(self):
+        """Test that a thread idle for longer than idle_ttl is gone"""
+        saver = MemoryCheckpointSaver(idle_ttl=60)
+        workflow = ChatWorkflow(checkpointer=saver)
+        with patch("src.langgraph.chat.checkpoint.time.monotonic", return_value=1000.0):
+            await workflow.run("你好", resume=RESUME, thread_id="a")
+        with patch("src.langgraph.chat.checkpoint.time.monotonic", return_value=1061.0):
+            assert await saver.aget_tuple(thread("a")) is None
+    
+    @pytest.mark.asyncio
+    async def test_only_latest_checkpoint_is_kept(self):
+        """Test that a thread keeps one checkpoint however many turns it has"""
+        saver = MemoryCheckpointSaver()
+        workflow = ChatWorkflow(checkpointer=saver)
+        for _ in range(3):
+            await workflow.run("你好", resume=RESUME, thread_id="a")
+        
+        assert len(list(saver.list(thread("a")))) == 1
+    
+    @pytest.mark.asyncio
+    async def test_sqlite_round_trip(self, tmp_path):
+        """Test that a SQLite saver restores the thread from a fresh connection"""
+        path = str(tmp_path / "chat.db")
+        saver = SQLiteCheckpointSaver(path=path)
+        await ChatWorkflow(checkpointer=saver).run("帮我优化一下summary", resume=RESUME, thread_id="a")
+        saver.close()
+        
+        reopened = SQLiteCheckpointSaver(path=path)
+        state = (await reopened.aget_tuple(thread("a"))).checkpoint["channel_values"]
+        assert state["resume"] == RESUME
+        assert isinstance(state["latest_suggestion"], Suggestion)
+        assert len(list(reopened.list(thread("a")))) == 1
+        reopened.close()
+    
+    @pytest.mark.asyncio
+    async def test_sqlite_evicts_by_maintained_thread_count(self, tmp_path):
+        """Test that the trigger-kept thread count drives LRU eviction and survives a reopen"""
+        path = str(tmp_path / "chat.db")
+        saver = SQLiteCheckpointSaver(path=path, max_threads=2)
+        workflow = ChatWorkflow(checkpointer=saver)
+        for thread_id in ("a", "b", "a", "c"):
+            await workflow.run("你好", resume=RESUME, thread_id=thread_id)
+        
+        assert saver._conn.execute("SELECT threads FROM chat_checkpoint_totals").fetchone() == (2,)
+        assert await saver.aget_tuple(thread("a")) is not None
+        assert await saver.aget_tuple(thread("b")) is None
+        await saver.adelete_thread("a")
+        assert saver._conn.execute("SELECT threads FROM chat_checkpoint_totals").fetchone() == (1,)
+        
+        # A database from before the count existed is seeded from its rows
+        saver._conn.execute("DROP TABLE chat_checkpoint_totals")
+        saver._conn.commit()
+        saver.close()
+        reopened = SQLiteCheckpointSaver(path=path)
+        assert reopened._conn.execute("SELECT threads FROM chat_checkpoint_totals").fetchone() == (1,)
+        reopened.close()
+    
+    def test_backend_selection_does_not_fall_back(self, tmp_path):
+        """Test that an unknown or unusable persistent backend is an error, not an in-memory saver"""
+        assert isinstance(create_chat_checkpointer("memory"), MemoryCheckpointSaver)
+        with pytest.raises(ValueError):
+            create_chat_checkpointer("sqllite")
+        # A directory cannot be opened as the database
+        with patch("src.langgraph.chat.checkpoint.CHAT_CHECKPOINT_SQLITE_PATH", str(tmp_path)):
+            with pytest.raises(sqlite3.OperationalError):
+                create_chat_checkpointer("sqlite")
+
+
+class TestPersistentChat:
+    """Test cases for ChatWorkflow.run with a thread_id"""
+    
+    @pytest.mark.asyncio
+    async def test_follow_up_sends_only_text(self):
+        """Test that the suggestion from one turn can be confirmed in the next"""
+        workflow = ChatWorkflow(checkpointer=MemoryCheckpointSaver())
+        first = await workflow.run("帮我优化一下summary", resume=RESUME, thread_id="a")
+        assert first["suggestion"] is not None
+        
+        second = await workflow.run("确认", thread_id="a")
+        assert second["finalized"] is True
+        assert second["suggestion"].field == first["suggestion"].field
+    
+    @pytest.mark.asyncio
+    async def test_history_accumulates_and_is_capped(self):
+        """Test that each turn is appended to the history, keeping the last N messages"""
+        saver = MemoryCheckpointSaver()
+        workflow = ChatWorkflow(checkpointer=saver)
+        with patch("src.langgraph.chat.nodes.CHAT_HISTORY_MAX_MESSAGES", 4):
+            for i in range(3):
+                await workflow.run(f"第{i}个问题", resume=RESUME, thread_id="a")
+        
+        history = (await saver.aget_tuple(thread("a"))).checkpoint["channel_values"]["history"]
+        assert len(history) == 4
+        assert history[0] == {"role": "user", "content": "第1个问题"}
+        assert history[-1]["role"] == "assistant"
+    
+    @pytest.mark.asyncio
+    async def test_threads_are_isolated(self):
+        """Test that threads do not see each other's state"""
+        saver = MemoryCheckpointSaver()
+        workflow = ChatWorkflow(checkpointer=saver)
+        await workflow.run("帮我优化一下summary", resume=RESUME, thread_id="a")
+        result = await workflow.run("确认", thread_id="b")
+        
+        assert result["finalized"] is False
+    
+    @pytest.mark.asyncio
+    async def test_run_without_thread_is_stateless(self):
+        """Test that calls without a thread_id leave no checkpoint behind"""
+        saver = MemoryCheckpointSaver()
+        workflow = ChatWorkflow(checkpointer=saver)
+        result = await workflow.run("你好", history=[], resume=RESUME)
+        
+        assert result["response"]
+        assert saver.thread_count == 0
@@ -1,6 +1,7 @@
 import pytest
 import asyncio
 from src.services.chat_service import chat_service
+from src.langgraph.chat.tools import format_resume
 from src.models.chat import ChatRequest, ChatResponse, ChatMessage
 
 
@@ -9,7 +10,7 @@ class TestChatService:
     
     def test_format_resume_context_empty(self):
         """Test formatting empty resume context"""
-        result = chat_service._format_resume_context({})
+        result = format_resume({})
         assert "无简历信息" in result
     
     def test_format_resume_context_with_data(self):
@@ -48,7 +49,7 @@ class TestChatService:
             ]
         }
         
-        result = chat_service._format_resume_context(resume_data)
+        result = format_resume(resume_data)
         
         # Check that all sections are present
         assert "姓名: 张三" in result
@@ -59,42 +60,8 @@ class TestChatService:
         assert "阿里巴巴" in result
         assert "技能:" in result
         assert "Python" in result
-    
-    def test_format_chat_history_empty(self):
-        """Test formatting empty chat history"""
-        result = chat_service._format_chat_history([])
-        assert "无对话历史" in result
-    
-    def test_format_chat_history_with_messages(self):
-        """Test formatting chat history with messages"""
-        messages = [
-            ChatMessage(role="user", content="你好"),
-            ChatMessage(role="assistant", content="您好！有什么可以帮助您的吗？"),
-            ChatMessage(role="user", content="帮我分析简历")
-        ]
-        
-        result = chat_service._format_chat_history(messages)
-        
-        assert "用户: 你好" in result
-        assert "助手: 您好！有什么可以帮助您的吗？" in result
-        assert "用户: 帮我分析简历" in result
-    
-    def test_format_chat_history_limit(self):
-        """Test that chat history is limited to last 5 messages"""
-        messages = [
-            ChatMessage(role="user", content=f"消息{i}") 
-            for i in range(10)
-        ]
-        
-        result = chat_service._format_chat_history(messages)
-        
-        # Should only contain last 5 messages
-        assert "消息5" in result
-        assert "消息6" in result
-        assert "消息7" in result
-        assert "消息8" in result
-        assert "消息9" in result
-        assert "消息0" not in result  # Should not contain first message
+        assert "GPA: 3.8/4.0" in result
+        assert "优化系统性能" in result
     
     @pytest.mark.asyncio
     async def test_process_chat_success(self):
@@ -180,4 +147,44 @@ class TestChatService:
         assert response.action is not None
         assert response.action["type"] == "suggest_update"
         assert "field" in response.action
-        assert "suggested" in response.action 
\ No newline at end of file
+        assert "suggested" in response.action 
+    
+    @pytest.mark.asyncio
+    async def test_process_chat_uses_session_resume_and_thread(self):
+        """Test that a session chats about its stored resume and keeps the suggestion between turns"""
+        from src.services.resume_service import resume_service
+        from src.services.session_store import resume_store, next_session
+        
+        parsed = await resume_service.parse_resume("张三\n邮箱: test@example.com\n工作: 阿里巴巴")
+        await resume_store.set("chat-service-session", next_session(None, parsed.resume, []))
+        
+        request = ChatRequest(messages=[ChatMessage(role="user", content="帮我优化一下summary")])
+        response = await chat_service.process_chat(request, "chat-service-session")
+        assert response.action["type"] == "suggest_update"
+        assert response.action["current"] == parsed.resume.basics.summary
+        
+        # Only the new message is sent; the suggestion comes from the session's thread
+        request = ChatRequest(messages=[ChatMessage(role="user", content="确认")])
+        response = await chat_service.process_chat(request, "chat-service-session")
+        assert response.action["type"] == "accept_suggestion"
+        assert response.action["field"] == "basics.summary"
+    
+    @pytest.mark.asyncio
+    async def test_thread_id_is_scoped_to_session(self):
+        """Test that context.thread_id cannot reach another session's thread"""
+        resume = {"basics": {"name": "张三", "summary": "工程师"}}
+        request = ChatRequest(
+            messages=[ChatMessage(role="user", content="帮我优化一下summary")],
+            context={"resume": resume, "thread_id": "shared"}
+        )
+        await chat_service.process_chat(request, "session-a")
+        
+        # Session b names a's thread, both as a thread id and as a bare session id
+        for thread_id in ("shared", "session-a"):
+            request = ChatRequest(messages=[ChatMessage(role="user", content="确认")], context={"thread_id": thread_id})
+            response = await chat_service.process_chat(request, "session-b")
+            assert response.action is None
+        
+        assert chat_service._thread_id("session-a", "shared") == "session-a:shared"
+        assert chat_service._thread_id(None, "shared") is None
+
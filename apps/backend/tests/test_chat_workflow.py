@@ -110,13 +110,13 @@ class TestChatWorkflow:
         """Test intent extraction for suggestion confirmation"""
         response = "用户确认了建议"
         intent = extract_intent(response)
-        assert intent == "request_suggestion"  # 当前逻辑会匹配到"建议"关键词
+        assert intent == "confirm_suggestion"  # "建议"作名词时权重低于"确认"
     
     def test_extract_intent_reject_suggestion(self):
         """Test intent extraction for suggestion rejection"""
         response = "用户拒绝了建议"
         intent = extract_intent(response)
-        assert intent == "request_suggestion"  # 当前逻辑会匹配到"建议"关键词
+        assert intent == "reject_suggestion"
     
     def test_extract_intent_chat(self):
         """Test intent extraction for general chat"""
@@ -315,4 +315,31 @@ class TestChatWorkflow:
                 resume={}
             )
     
-            assert "生成回复时出现错误" in result["response"] 
\ No newline at end of file
+            assert "生成回复时出现错误" in result["response"] 
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_tokens_before_result(self, workflow, sample_resume):
+        """Test that a streamed chat reply arrives as node and token events, then the result"""
+        async def tokens(prompt):
+            for token in ["您好", "！", "我是助手"]:
+                yield token
+
+        with patch('src.llm.client.llm_client.chat_response_stream', side_effect=tokens):
+            events = [event async for event in workflow.stream("你好", resume=sample_resume)]
+
+        names = [event["event"] for event in events]
+        assert names[0] == "node" and events[0]["data"] == "router"
+        assert {"event": "node", "data": "llm_chat_response"} in events
+        assert [event["data"] for event in events if event["event"] == "token"] == ["您好", "！", "我是助手"]
+        assert names[-1] == "result"
+        assert events[-1]["data"] == {"response": "您好！我是助手", "suggestion": None, "finalized": False, "intent": "chat"}
+
+    @pytest.mark.asyncio
+    async def test_stream_suggestion_arrives_with_result(self, workflow, sample_resume):
+        """Test that replies which are not streamed come with the final result"""
+        events = [event async for event in workflow.stream("帮我优化一下summary", resume=sample_resume)]
+
+        assert not any(event["event"] == "token" for event in events)
+        assert {"event": "node", "data": "generate_suggestion"} in events
+        assert isinstance(events[-1]["data"]["suggestion"], Suggestion)
+
@@ -0,0 +1,167 @@
+"""
+Tests for the circuit breaker around the LLM upstream
+"""
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.llm.circuit_breaker import CircuitBreaker, CircuitOpen, CircuitState
+from src.llm.client import LLMClient, build_http_client
+from src.llm.resilience import RetryPolicy
+from src.main import app
+
+
+class FakeClock:
+    """Manually advanced clock"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(clock: FakeClock, **kwargs) -> CircuitBreaker:
+    options = {"window": 60, "min_calls": 4, "error_rate_threshold": 0.5, "slow_call_duration": 10,
+               "slow_rate_threshold": 0.5, "open_duration": 30, "half_open_max_calls": 1, "clock": clock}
+    options.update(kwargs)
+    return CircuitBreaker(**options)
+
+
+async def succeed(breaker: CircuitBreaker, clock: FakeClock = None, duration: float = 0):
+    async with breaker.guard():
+        if clock is not None:
+            clock.now += duration
+
+
+async def fail(breaker: CircuitBreaker, error: Exception = None):
+    with pytest.raises(type(error) if error else httpx.ConnectError):
+        async with breaker.guard():
+            raise error or httpx.ConnectError("connection refused")
+
+
+class TestCircuitBreaker:
+    """Test cases for the breaker's state machine"""
+    
+    @pytest.mark.asyncio
+    async def test_opens_on_error_rate(self):
+        """Test that the circuit opens once enough calls fail, and then fails fast"""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        await succeed(breaker)
+        await fail(breaker)
+        await succeed(breaker)
+        assert breaker.state is CircuitState.CLOSED
+        
+        await fail(breaker)
+        assert breaker.state is CircuitState.OPEN
+        
+        with pytest.raises(CircuitOpen) as exc_info:
+            await succeed(breaker)
+        assert exc_info.value.retry_after == 30
+    
+    @pytest.mark.asyncio
+    async def test_opens_on_slow_calls(self):
+        """Test that an upstream answering too slowly also opens the circuit"""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            await succeed(breaker, clock, duration=15)
+        
+        assert breaker.state is CircuitState.OPEN
+    
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_count(self):
+        """Test that failures the upstream is not to blame for leave the circuit closed"""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(10):
+            await fail(breaker, ValueError("bad request"))
+        
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.snapshot()["calls"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_old_outcomes_leave_the_window(self):
+        """Test that only failures within the rolling window count"""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(3):
+            await fail(breaker)
+        clock.now += 61
+        await fail(breaker)
+        
+        assert breaker.state is CircuitState.CLOSED
+    
+    @pytest.mark.asyncio
+    async def test_half_open_probe(self):
+        """Test that after the open period one probe decides whether to close or reopen"""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            await fail(breaker)
+        
+        clock.now += 30
+        assert breaker.state is CircuitState.HALF_OPEN
+        await fail(breaker)
+        assert breaker.state is CircuitState.OPEN
+        
+        clock.now += 30
+        async with breaker.guard():
+            # Only one probe at a time
+            with pytest.raises(CircuitOpen):
+                breaker.check()
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.opened == 2
+
+
+class TestCircuitBreakerIntegration:
+    """Test cases for the breaker in LLMClient and /healthz"""
+    
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_upstream(self):
+        """Test that an open circuit fails calls without touching the upstream"""
+        requests = []
+        
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(503)
+        
+        client = LLMClient(
+            api_key="test-key",
+            http_client=build_http_client(transport=httpx.MockTransport(handler)),
+            retry_policy=RetryPolicy(max_attempts=4, base_delay=0.001, max_delay=0.001),
+            breaker=make_breaker(FakeClock(), min_calls=2),
+        )
+        with pytest.raises(CircuitOpen):
+            await client.chat_response("你好")
+        
+        assert len(requests) == 2
+        with pytest.raises(CircuitOpen):
+            await client.generate_suggestions({"basics": {}})
+        assert len(requests) == 2
+        await client.aclose()
+    
+    def test_healthz_reports_circuit(self):
+        """Test that /healthz exposes the circuit state"""
+        client = TestClient(app)
+        assert client.get("/healthz").json()["llm_circuit"]["state"] == "closed"
+        
+        breaker = make_breaker(FakeClock())
+        breaker._open()
+        with patch("src.main.llm_client.breaker", breaker):
+            response = client.get("/healthz")
+        
+        assert response.status_code == 200
+        assert response.json()["status"] == "degraded"
+        assert response.json()["llm_circuit"]["retry_after"] == 30
+    
+    def test_open_circuit_returns_503(self):
+        """Test that requests refused by the breaker get 503 with Retry-After"""
+        with patch("src.routers.resume.resume_service.parse_resume", side_effect=CircuitOpen(12)):
+            response = TestClient(app).post("/api/parse_resume", json={"text": "张三"})
+        
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "12"
@@ -0,0 +1,92 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.compression import CompressionMiddleware, negotiate_encoding
+
+BODY = "简历内容 " * 1000
+
+
+def make_client(**options) -> TestClient:
+    """App with one large, one small and one streaming route behind the middleware"""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **options)
+    
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(BODY)
+    
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("ok")
+    
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            for i in range(3):
+                yield BODY + "\n"
+        return StreamingResponse(events(), media_type="application/x-ndjson")
+    
+    return TestClient(app)
+
+
+class TestNegotiateEncoding:
+    """Test cases for Accept-Encoding negotiation"""
+    
+    @pytest.mark.parametrize("header,with_brotli,without_brotli", [
+        ("", None, None),
+        ("gzip, deflate, br", "br", "gzip"),
+        ("br;q=0.5, gzip", "gzip", "gzip"),
+        ("gzip;q=0, *", "br", None),
+        ("*;q=0", None, None),
+        ("identity", None, None),
+    ])
+    def test_negotiate(self, header, with_brotli, without_brotli):
+        """Test q-values, wildcards and brotli availability"""
+        assert negotiate_encoding(header, brotli_available=True) == with_brotli
+        assert negotiate_encoding(header, brotli_available=False) == without_brotli
+
+
+class TestCompressionMiddleware:
+    """Test cases for the compression middleware"""
+    
+    def test_gzip_large_response(self):
+        """Test that large responses are gzip compressed"""
+        response = make_client().get("/large", headers={"Accept-Encoding": "gzip"})
+        
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert int(response.headers["Content-Length"]) < len(BODY.encode("utf-8"))
+        assert response.text == BODY
+    
+    def test_small_response_not_compressed(self):
+        """Test the size threshold"""
+        client = make_client(minimum_size=1024)
+        
+        assert "Content-Encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    
+    def test_streaming_response_not_compressed(self):
+        """Test that NDJSON streams pass through untouched"""
+        response = make_client().get("/stream", headers={"Accept-Encoding": "gzip, br"})
+        
+        assert "Content-Encoding" not in response.headers
+        assert response.text == (BODY + "\n") * 3
+    
+    def test_gzip_level(self):
+        """Test that the configured gzip level is used"""
+        response = make_client(gzip_level=1).get("/large", headers={"Accept-Encoding": "gzip"})
+        
+        assert int(response.headers["Content-Length"]) == len(gzip.compress(BODY.encode("utf-8"), compresslevel=1))
+    
+    def test_brotli(self):
+        """Test brotli compression when the optional package is installed"""
+        pytest.importorskip("brotli")
+        client = make_client()
+        
+        response = client.get("/large", headers={"Accept-Encoding": "br"})
+        
+        assert response.headers["Content-Encoding"] == "br"
+        assert response.text == BODY
@@ -0,0 +1,109 @@
+import pytest
+from pydantic import ValidationError
+
+from src.models.field_path import FieldPath, compile_field_path, parse_field_path, parse_json_pointer
+from src.models.resume import Resume
+
+
+@pytest.fixture
+def resume():
+    """Minimal resume model"""
+    return Resume(
+        basics={"name": "张三", "email": "test@example.com"},
+        education=[{"institution": "清华大学", "degree": "学士", "field_of_study": "CS", "start_date": "2018-09"}],
+        work=[{
+            "company": "阿里巴巴", "position": "工程师", "description": "开发", "start_date": "2022-08",
+            "achievements": ["成就一", "成就二"]
+        }]
+    )
+
+
+class TestParseFieldPath:
+    """Test cases for field path parsing"""
+
+    def test_parse(self):
+        """Test parsing dotted and indexed paths"""
+        assert parse_field_path("basics.name") == ["basics", "name"]
+        assert parse_field_path("work[0].description") == ["work", 0, "description"]
+        assert parse_field_path("work[0].achievements[1]") == ["work", 0, "achievements", 1]
+
+    def test_invalid(self):
+        """Test malformed paths"""
+        with pytest.raises(ValueError, match="Missing closing bracket"):
+            parse_field_path("work[0")
+        with pytest.raises(ValueError, match="Invalid array index"):
+            parse_field_path("work[a].description")
+
+    def test_parse_json_pointer(self):
+        """Test JSON pointer parsing, escapes and the end-of-array marker"""
+        assert parse_json_pointer("/work/0/achievements/-") == ["work", 0, "achievements", "-"]
+        assert parse_json_pointer("/a~1b/c~0d") == ["a/b", "c~d"]
+        assert parse_json_pointer("") == []
+        with pytest.raises(ValueError):
+            parse_json_pointer("work/0")
+        with pytest.raises(ValueError):
+            parse_json_pointer("/work/01")
+
+    def test_compile_is_cached(self):
+        """Test that the same path string compiles to the same object"""
+        path = compile_field_path("work[0].description")
+        assert compile_field_path("work[0].description") is path
+        assert path.section == "work"
+        assert path.owner == ("work", 0)
+        assert compile_field_path("basics.name").owner == ("basics",)
+
+
+class TestFieldPathAccess:
+    """Test cases for reading and writing through a field path"""
+
+    def test_get_model_and_dict(self, resume):
+        """Test that models and their dumps resolve the same way"""
+        path = compile_field_path("work[0].achievements[1]")
+        assert path.get(resume) == "成就二"
+        assert path.get(resume.model_dump()) == "成就二"
+
+    def test_get_missing(self, resume):
+        """Test missing fields and out-of-bounds indexes"""
+        with pytest.raises(KeyError):
+            compile_field_path("basics.nonexistent").get(resume)
+        with pytest.raises(IndexError):
+            compile_field_path("work[5].description").get(resume)
+        with pytest.raises(IndexError):
+            compile_field_path("work[-1].description").get(resume)
+        assert compile_field_path("education[3]").get(resume, None) is None
+
+    def test_exists(self, resume):
+        """Test existence checks, including fields whose value is None"""
+        assert compile_field_path("basics.phone").exists(resume)
+        assert compile_field_path("education[0].institution").exists(resume)
+        assert not compile_field_path("skills[0].name").exists(resume)
+        assert not compile_field_path("basics.name.first").exists(resume)
+
+    def test_set(self, resume):
+        """Test replacing values in place"""
+        data = resume.model_dump()
+        compile_field_path("work[0].achievements[0]").set(data, "新成就")
+        compile_field_path("basics.summary").set(resume, "简介")
+
+        assert data["work"][0]["achievements"][0] == "新成就"
+        assert resume.basics.summary == "简介"
+        with pytest.raises(KeyError):
+            FieldPath("basics.unknown", ("basics", "unknown")).set(data, "x")
+
+    def test_replace_copies_only_the_path(self, resume):
+        """Test copy-on-write replacement shares untouched entries"""
+        updated = compile_field_path("work[0].achievements[1]").replace(resume, "新成就")
+
+        assert updated.work[0].achievements == ["成就一", "新成就"]
+        assert resume.work[0].achievements == ["成就一", "成就二"]
+        assert updated.basics is resume.basics
+        assert updated.education[0] is resume.education[0]
+
+    def test_replace_validates_leaf(self, resume):
+        """Test that the new value is validated by the field that holds it"""
+        with pytest.raises(ValidationError):
+            compile_field_path("basics.name").replace(resume, 123)
+        with pytest.raises(ValidationError):
+            compile_field_path("work").replace(resume, [])
+        with pytest.raises(IndexError):
+            compile_field_path("work[1].description").replace(resume, "x")
@@ -0,0 +1,143 @@
+"""
+Tests for the local n-gram intent classifier of the chat router
+"""
+import json
+import time
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from src.langgraph.chat.intent_classifier import (
+    HashingVectorizer, IntentClassifier, intent_classifier, load_intent_classifier
+)
+from src.langgraph.chat.nodes import router
+from src.models.chat import ChatState
+from src.llm.client import LLMClient
+
+
+class TestHashingVectorizer:
+    """Test cases for hashed character n-gram vectors"""
+    
+    def test_ignores_case_and_punctuation(self):
+        """Test that spelling variants of the same words get the same vector"""
+        vectorizer = HashingVectorizer()
+        a_indexes, a_values = vectorizer.transform_one("OK，没问题！")
+        b_indexes, b_values = vectorizer.transform_one("ok 没问题")
+        
+        assert a_indexes.tolist() == b_indexes.tolist()
+        assert np.allclose(a_values, b_values)
+        assert np.isclose(np.linalg.norm(a_values), 1.0)
+    
+    def test_empty_text(self):
+        """Test that text without any n-gram is the zero vector"""
+        indexes, values = HashingVectorizer().transform_one("，。！")
+        assert len(indexes) == 0 and len(values) == 0
+        assert not HashingVectorizer(n_features=16).transform(["", "好"])[0].any()
+
+
+class TestIntentClassifier:
+    """Test cases for training and prediction"""
+    
+    def test_fit_predict(self):
+        """Test that a small training set is learnt"""
+        classifier = IntentClassifier(HashingVectorizer(n_features=256)).fit(
+            ["帮我优化简历", "改进一下描述", "同意", "可以，就这样", "不要改", "算了吧"],
+            ["request_suggestion", "request_suggestion", "confirm_suggestion",
+             "confirm_suggestion", "reject_suggestion", "reject_suggestion"],
+        )
+        
+        assert classifier.predict("帮我优化简历")[0] == "request_suggestion"
+        assert classifier.predict("算了吧")[0] == "reject_suggestion"
+        assert np.isclose(classifier.predict_proba("同意").sum(), 1.0)
+    
+    def test_untrained(self):
+        """Test that predicting before fit is an error"""
+        with pytest.raises(RuntimeError):
+            IntentClassifier().predict("你好")
+    
+    @pytest.mark.parametrize("text,intent", [
+        ("帮我优化一下工作经历", "request_suggestion"),
+        ("好的，就按这个改吧", "confirm_suggestion"),
+        ("我不同意这样改", "reject_suggestion"),
+        ("你好，你是谁？", "chat"),
+    ])
+    def test_bundled_examples(self, text, intent):
+        """Test that common phrasings are routed confidently by the bundled classifier"""
+        predicted, confidence = intent_classifier.predict(text)
+        
+        assert predicted == intent
+        assert confidence >= 0.6
+    
+    def test_custom_examples_file(self, tmp_path):
+        """Test training from a configured examples file"""
+        path = tmp_path / "examples.jsonl"
+        examples = [{"text": "冲", "intent": "confirm_suggestion"}, {"text": "撤", "intent": "reject_suggestion"}]
+        path.write_text("\n".join(json.dumps(e, ensure_ascii=False) for e in examples) + "\n", encoding="utf-8")
+        
+        classifier = load_intent_classifier(str(path))
+        assert classifier.intents == ["confirm_suggestion", "reject_suggestion"]
+        assert classifier.predict("冲")[0] == "confirm_suggestion"
+    
+    def test_unknown_intent_rejected(self, tmp_path):
+        """Test that examples must be labelled with intents the graph routes"""
+        path = tmp_path / "examples.jsonl"
+        path.write_text(json.dumps({"text": "hi", "intent": "greeting"}) + "\n", encoding="utf-8")
+        
+        with pytest.raises(ValueError):
+            load_intent_classifier(str(path))
+    
+    def test_prediction_is_fast(self):
+        """Test that one prediction stays well under a millisecond on average"""
+        start = time.perf_counter()
+        for _ in range(200):
+            intent_classifier.predict("可以，帮我把项目经历写得更量化一些")
+        
+        assert (time.perf_counter() - start) / 200 < 0.001
+
+
+class TestRouterNode:
+    """Test cases for the router's classifier and LLM fallback"""
+    
+    @pytest.mark.asyncio
+    async def test_confident_prediction_skips_llm(self):
+        """Test that a confident classification needs no LLM call"""
+        with patch("src.llm.client.llm_client.route_intent", new_callable=AsyncMock) as mock_route:
+            result = await router(ChatState(text="请帮我优化简历", resume={}))
+        
+        assert result.intent == "request_suggestion"
+        mock_route.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_low_confidence_asks_llm(self):
+        """Test that an uncertain classification is settled by the LLM"""
+        with patch("src.langgraph.chat.nodes.intent_classifier.predict", return_value=("chat", 0.3)), \
+             patch("src.llm.client.llm_client.route_intent", new_callable=AsyncMock) as mock_route:
+            mock_route.return_value = "reject_suggestion"
+            result = await router(ChatState(text="嗯……再想想", resume={}))
+        
+        assert result.intent == "reject_suggestion"
+        assert mock_route.call_args.args[0] == "嗯……再想想"
+    
+    @pytest.mark.asyncio
+    async def test_invalid_llm_answer_falls_back_to_keywords(self):
+        """Test that the keyword matcher decides when the LLM gives no valid intent"""
+        with patch("src.langgraph.chat.nodes.intent_classifier.predict", return_value=("chat", 0.3)), \
+             patch("src.llm.client.llm_client.route_intent", new_callable=AsyncMock) as mock_route:
+            mock_route.return_value = "我觉得用户想要修改"
+            result = await router(ChatState(text="不同意", resume={}))
+            
+            mock_route.side_effect = RuntimeError("upstream down")
+            failed = await router(ChatState(text="确认", resume={}))
+        
+        assert result.intent == "reject_suggestion"
+        assert failed.intent == "confirm_suggestion"
+    
+    @pytest.mark.asyncio
+    async def test_mock_route_intent(self):
+        """Test that the mock LLM routes on the user text only, not the prompt"""
+        client = LLMClient(api_key=None)
+        
+        assert await client.route_intent("确认", "", "无简历信息") == "confirm_suggestion"
+        assert await client.route_intent("你好", "", "无简历信息") == "chat"
+        await client.aclose()
@@ -0,0 +1,98 @@
+"""
+Tests for the Aho–Corasick keyword intent matcher
+"""
+import json
+
+import pytest
+
+from src.intent import AhoCorasick, IntentMatcher, load_intent_matcher
+from src.langgraph.chat.tools import extract_intent, is_confirmation
+
+
+class TestAhoCorasick:
+    """Test cases for the multi-pattern automaton"""
+    
+    def test_finds_overlapping_matches(self):
+        """Test that every occurrence is reported, including ones inside others"""
+        automaton = AhoCorasick(["he", "she", "his", "hers"])
+        matches = {(start, end, automaton.patterns[index]) for start, end, index in automaton.find_all("ushers")}
+        
+        assert matches == {(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")}
+    
+    def test_matches_naive_search(self):
+        """Test against a brute-force search on Chinese keywords"""
+        patterns = ["同意", "不同意", "不", "不要", "要求", "意见"]
+        text = "我不同意这个意见，不要再要求我同意了"
+        automaton = AhoCorasick(patterns)
+        expected = {
+            (i, i + len(p), p) for p in patterns for i in range(len(text)) if text.startswith(p, i)
+        }
+        
+        assert {(s, e, patterns[i]) for s, e, i in automaton.find_all(text)} == expected
+    
+    def test_empty_pattern_rejected(self):
+        """Test that an empty keyword is a configuration error"""
+        with pytest.raises(ValueError):
+            AhoCorasick(["好的", ""])
+
+
+class TestIntentMatcher:
+    """Test cases for weighted intent classification"""
+    
+    @pytest.mark.parametrize("text,intent", [
+        ("请帮我改进简历", "request_suggestion"),
+        ("给我一些建议", "request_suggestion"),
+        ("好的，我同意", "confirm_suggestion"),
+        ("我不同意", "reject_suggestion"),
+        ("不接受这个建议", "reject_suggestion"),
+        ("不要修改了", "reject_suggestion"),
+        ("不行", "reject_suggestion"),
+        ("你好，介绍一下自己", "chat"),
+    ])
+    def test_default_keywords(self, text, intent):
+        """Test classification with the default vocabulary"""
+        assert extract_intent(text) == intent
+    
+    def test_longer_keyword_takes_precedence(self):
+        """Test that "不同意" does not also count as "同意" """
+        matcher = IntentMatcher({"yes": {"同意": 1}, "no": {"不同意": 1}})
+        
+        assert matcher.scores("我不同意") == {"no": 1.0}
+    
+    def test_weights_and_ties(self):
+        """Test that summed weights decide, and ties go to the intent listed first"""
+        matcher = IntentMatcher({"a": {"甲": 1, "乙": 1}, "b": {"丙": 1.5}})
+        
+        assert matcher.classify("甲乙丙") == "a"
+        assert matcher.classify("甲丙") == "b"
+        assert matcher.classify("甲丙乙丙") == "b"
+        assert IntentMatcher({"a": {"甲": 1}, "b": {"乙": 1}}).classify("乙甲") == "a"
+    
+    def test_negated_keyword(self):
+        """Test that a negation word moves or drops the keyword right after it"""
+        matcher = IntentMatcher({"yes": {"接受": 1}, "no": {"拒绝": 1}, "edit": {"修改": 1}},
+                                negations=["不", "别"], negated_intents={"yes": "no"})
+        
+        assert matcher.scores("不接受") == {"no": 1.0}
+        assert matcher.scores("别修改") == {}
+        assert matcher.scores("不用说，接受") == {"yes": 1.0}
+    
+    def test_is_confirmation(self):
+        """Test that any rejection outweighs confirmation words"""
+        assert is_confirmation("没问题")
+        assert not is_confirmation("好的，还是算了")
+        assert not is_confirmation("不确认")
+    
+    def test_keywords_file(self, tmp_path):
+        """Test that keywords can be changed through a JSON file"""
+        path = tmp_path / "intents.json"
+        path.write_text(json.dumps({
+            "keywords": {"request_suggestion": {"润色": 1}, "chat": {"你好": 1}},
+            "negations": []
+        }, ensure_ascii=False), encoding="utf-8")
+        matcher = load_intent_matcher(str(path))
+        
+        assert matcher.classify("帮我润色一下") == "request_suggestion"
+        assert matcher.classify("帮我优化一下") == "chat"
+        assert matcher.classify("我同意") == "confirm_suggestion"
+        assert matcher.scores("不同意") == {"reject_suggestion": 1.0}
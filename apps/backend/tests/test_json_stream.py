@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from src.llm.json_stream import JSONStreamDecoder, JSONStreamError, decode_partial
+
+
+SAMPLE = {
+    "basics": {"name": "张三", "email": "zhangsan@example.com", "summary": "a \"quoted\" \\ text"},
+    "education": [{"institution": "清华大学", "gpa": 3.8}],
+    "work": [{"company": "阿里巴巴", "achievements": ["x", "y"], "current": True, "end": None}],
+    "skills": []
+}
+
+
+def feed_in_chunks(decoder, text, size):
+    """Feed text to the decoder in fixed-size chunks, collecting events"""
+    events = []
+    for start in range(0, len(text), size):
+        events.extend(decoder.feed(text[start:start + size]))
+    return events
+
+
+class TestJSONStreamDecoder:
+    """Test cases for the incremental JSON decoder"""
+    
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 1000])
+    def test_decodes_any_chunking(self, chunk_size):
+        """Test that the decoded value does not depend on chunk boundaries"""
+        text = json.dumps(SAMPLE, ensure_ascii=False, indent=2)
+        decoder = JSONStreamDecoder()
+        
+        feed_in_chunks(decoder, text, chunk_size)
+        
+        assert decoder.done
+        assert decoder.value == SAMPLE
+    
+    def test_section_events_in_document_order(self):
+        """Test that completed sections are reported as soon as they close"""
+        text = json.dumps(SAMPLE, ensure_ascii=False)
+        decoder = JSONStreamDecoder(max_event_depth=2)
+        
+        events = feed_in_chunks(decoder, text, 5)
+        paths = [path for path, _ in events]
+        
+        assert paths.index(("basics",)) < paths.index(("education", 0)) < paths.index(("work", 0))
+        assert paths[-1] == ()
+        assert dict(events)[("work", 0)] == SAMPLE["work"][0]
+    
+    def test_section_event_before_document_end(self):
+        """Test that a section is reported before the rest of the document arrives"""
+        decoder = JSONStreamDecoder(max_event_depth=1)
+        
+        events = decoder.feed('{"basics": {"name": "张三"}, "work": [')
+        
+        assert events == [(("basics",), {"name": "张三"})]
+        assert not decoder.done
+    
+    def test_ignores_markdown_fence(self):
+        """Test that text around the JSON document is ignored"""
+        decoder = JSONStreamDecoder()
+        
+        decoder.feed('```json\n{"a": [1, 2]}\n```')
+        
+        assert decoder.done
+        assert decoder.value == {"a": [1, 2]}
+    
+    @pytest.mark.parametrize("text", ['{"a" 1}', '{"a": 1,,}', '[1 2]', '{"a": 1]', '{"a": tru e}'])
+    def test_invalid_json(self, text):
+        """Test that malformed JSON raises JSONStreamError"""
+        decoder = JSONStreamDecoder()
+        
+        with pytest.raises(JSONStreamError):
+            decoder.feed(text)
+    
+    def test_snapshot_closes_open_containers(self):
+        """Test that a snapshot repairs a truncated document"""
+        decoder = JSONStreamDecoder()
+        
+        decoder.feed('{"basics": {"name": "张三", "email": "zhang')
+        
+        assert decoder.snapshot() == {"basics": {"name": "张三"}}
+    
+    def test_snapshot_drops_open_entries(self):
+        """Test that half-written entries below max_open_depth are dropped"""
+        decoder = JSONStreamDecoder()
+        
+        decoder.feed('{"work": [{"company": "A"}, {"company": "B", "sugg')
+        
+        assert decoder.snapshot() == {"work": [{"company": "A"}, {"company": "B"}]}
+        assert decoder.snapshot(max_open_depth=1) == {"work": [{"company": "A"}]}
+    
+    def test_feed_is_resumable_after_snapshot(self):
+        """Test that taking a snapshot does not disturb decoding"""
+        decoder = JSONStreamDecoder()
+        
+        decoder.feed('{"a": [1, ')
+        assert decoder.snapshot() == {"a": [1]}
+        decoder.feed('2]}')
+        
+        assert decoder.done
+        assert decoder.value == {"a": [1, 2]}
+
+
+class TestDecodePartial:
+    """Test cases for one-shot partial decoding"""
+    
+    def test_truncated_document(self):
+        """Test recovery of the longest valid prefix of a truncated document"""
+        text = json.dumps(SAMPLE, ensure_ascii=False)
+        cut = text.index('"achievements"') + 5
+        
+        result = decode_partial(text[:cut], max_open_depth=1)
+        
+        assert result["basics"] == SAMPLE["basics"]
+        assert result["education"] == SAMPLE["education"]
+        assert result["work"] == []
+    
+    def test_stops_at_syntax_error(self):
+        """Test that decoding keeps everything before a syntax error"""
+        assert decode_partial('{"a": 1, "b": [2, 3}') == {"a": 1, "b": [2, 3]}
+    
+    def test_no_json(self):
+        """Test that text without a JSON document returns None"""
+        assert decode_partial("no json here") is None
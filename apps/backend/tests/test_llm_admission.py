@@ -0,0 +1,216 @@
+"""
+Tests for admission control of upstream LLM calls
+"""
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.llm.admission import AdmissionController, LLMOverloaded, Priority
+from src.llm.client import LLMClient, build_http_client, llm_client
+from src.main import app
+
+
+def make_controller(max_concurrency: int = 1, tenant_max_concurrency: int = 1, queue_limit: int = 8):
+    """Build a controller with the same queue limit for every priority"""
+    return AdmissionController(
+        max_concurrency=max_concurrency,
+        tenant_max_concurrency=tenant_max_concurrency,
+        queue_limits={priority: queue_limit for priority in Priority},
+    )
+
+
+async def hold(controller: AdmissionController, priority: Priority, tenant, order: list, release: asyncio.Event):
+    """Take a slot, record the order it was granted in and keep it until release is set"""
+    async with controller.slot(priority, tenant):
+        order.append((priority, tenant))
+        await release.wait()
+
+
+class TestAdmissionController:
+    """Test cases for the LLM admission controller"""
+    
+    @pytest.mark.asyncio
+    async def test_priority_order(self):
+        """Test that a freed slot goes to chat before parse and suggestions"""
+        controller = make_controller(max_concurrency=1)
+        order, release = [], asyncio.Event()
+        
+        first = asyncio.create_task(hold(controller, Priority.PARSE, None, order, release))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(hold(controller, priority, None, order, release))
+            for priority in (Priority.SUGGESTIONS, Priority.PARSE, Priority.CHAT)
+        ]
+        await asyncio.sleep(0)
+        assert controller.active == 1
+        assert controller.queue_depth(Priority.CHAT) == 1
+        
+        release.set()
+        await asyncio.gather(first, *waiters)
+        
+        assert [priority for priority, _ in order] == [
+            Priority.PARSE, Priority.CHAT, Priority.PARSE, Priority.SUGGESTIONS
+        ]
+        assert controller.active == 0
+    
+    @pytest.mark.asyncio
+    async def test_tenant_limit(self):
+        """Test that one tenant at its limit does not hold back others"""
+        controller = make_controller(max_concurrency=2, tenant_max_concurrency=1)
+        order, release = [], asyncio.Event()
+        
+        tasks = [asyncio.create_task(hold(controller, Priority.PARSE, "a", order, release))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(hold(controller, Priority.PARSE, "a", order, release)))
+        tasks.append(asyncio.create_task(hold(controller, Priority.PARSE, "b", order, release)))
+        await asyncio.sleep(0)
+        
+        assert order == [(Priority.PARSE, "a"), (Priority.PARSE, "b")]
+        assert controller.queue_depth(Priority.PARSE) == 1
+        
+        release.set()
+        await asyncio.gather(*tasks)
+        assert len(order) == 3
+    
+    @pytest.mark.asyncio
+    async def test_full_queue_is_shed(self):
+        """Test that a call over the queue limit is rejected with a retry hint"""
+        controller = make_controller(max_concurrency=1, queue_limit=1)
+        order, release = [], asyncio.Event()
+        tasks = [asyncio.create_task(hold(controller, Priority.PARSE, None, order, release)) for _ in range(2)]
+        await asyncio.sleep(0)
+        
+        with pytest.raises(LLMOverloaded) as exc_info:
+            async with controller.slot(Priority.PARSE):
+                pass
+        
+        assert exc_info.value.retry_after >= 1
+        assert controller.rejected == 1
+        # Other priorities have their own queues
+        tasks.append(asyncio.create_task(hold(controller, Priority.CHAT, None, order, release)))
+        await asyncio.sleep(0)
+        assert controller.queue_depth(Priority.CHAT) == 1
+        
+        release.set()
+        await asyncio.gather(*tasks)
+    
+    @pytest.mark.asyncio
+    async def test_check(self):
+        """Test that check predicts shedding without taking a slot or a queue place"""
+        controller = make_controller(max_concurrency=1, queue_limit=1)
+        order, release = [], asyncio.Event()
+        controller.check(Priority.PARSE)
+        
+        tasks = [asyncio.create_task(hold(controller, Priority.PARSE, None, order, release))]
+        await asyncio.sleep(0)
+        # Busy, but there is room to queue
+        controller.check(Priority.PARSE)
+        tasks.append(asyncio.create_task(hold(controller, Priority.PARSE, None, order, release)))
+        await asyncio.sleep(0)
+        
+        with pytest.raises(LLMOverloaded):
+            controller.check(Priority.PARSE)
+        controller.check(Priority.CHAT)
+        assert controller.active == 1
+        assert controller.queue_depth(Priority.PARSE) == 1
+        
+        release.set()
+        await asyncio.gather(*tasks)
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test that a cancelled waiter gives up its place without taking a slot"""
+        controller = make_controller(max_concurrency=1)
+        order, release = [], asyncio.Event()
+        first = asyncio.create_task(hold(controller, Priority.PARSE, None, order, release))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold(controller, Priority.PARSE, None, order, release))
+        await asyncio.sleep(0)
+        
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        await first
+        
+        assert controller.queue_depth(Priority.PARSE) == 0
+        assert controller.active == 0
+    
+    @pytest.mark.asyncio
+    async def test_waiter_cancelled_during_dispatch(self):
+        """Test that a slot freed in the same tick a waiter is cancelled is not lost"""
+        controller = make_controller(max_concurrency=1)
+        holder = controller.slot(Priority.PARSE)
+        await holder.__aenter__()
+        order, release = [], asyncio.Event()
+        waiter = asyncio.create_task(hold(controller, Priority.PARSE, None, order, release))
+        await asyncio.sleep(0)
+        
+        waiter.cancel()
+        await holder.__aexit__(None, None, None)
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert controller.active == 0
+        
+        release.set()
+        await asyncio.wait_for(hold(controller, Priority.PARSE, None, order, release), 2)
+        assert order == [(Priority.PARSE, None)]
+        assert controller.active == 0
+
+
+class TestLLMClientAdmission:
+    """Test cases for admission control in LLMClient"""
+    
+    @pytest.mark.asyncio
+    async def test_overloaded_call_does_not_fall_back_to_mock(self, completion):
+        """Test that a shed call raises instead of returning mock data"""
+        release = asyncio.Event()
+        
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await release.wait()
+            return httpx.Response(200, json=completion("ok"))
+        
+        client = LLMClient(
+            api_key="test-key",
+            http_client=build_http_client(transport=httpx.MockTransport(handler)),
+            admission=make_controller(max_concurrency=1, queue_limit=0),
+        )
+        busy = asyncio.create_task(client.chat_response("你好"))
+        await asyncio.sleep(0.01)
+        
+        with pytest.raises(LLMOverloaded):
+            await client.generate_suggestions({"basics": {}})
+        
+        release.set()
+        assert await busy == "ok"
+        await client.aclose()
+    
+    def test_parse_endpoint_returns_429(self):
+        """Test that shed parse requests get 429 with Retry-After"""
+        overloaded = LLMOverloaded(Priority.PARSE, retry_after=7)
+        
+        with patch("src.routers.resume.resume_service.parse_resume", side_effect=overloaded):
+            response = TestClient(app).post("/api/parse_resume", json={"text": "张三"})
+        
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "7"
+    
+    @pytest.mark.parametrize("path,body", [
+        ("/api/parse_resume/stream", {"text": "流式解析限流测试"}),
+        ("/api/chat/stream", {"messages": [{"role": "user", "content": "你好"}], "context": {}}),
+    ])
+    def test_stream_endpoints_return_429(self, path, body):
+        """Test that shed streaming requests get 429 instead of a 200 with an error event"""
+        controller = make_controller(max_concurrency=1, queue_limit=0)
+        # Every slot taken, and no room to queue
+        controller.active = 1
+        
+        with patch.object(llm_client, "use_real_llm", True), \
+             patch.object(llm_client, "admission", controller):
+            response = TestClient(app).post(path, json=body)
+        
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
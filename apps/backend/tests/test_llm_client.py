@@ -0,0 +1,261 @@
+"""
+Tests for the async LLM transport in LLMClient
+"""
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from src.llm.client import LLMClient, build_http_client
+from src.llm.resilience import LLMDeadlineExceeded, deadline, remaining_time
+from src.llm.singleflight import SingleFlight, request_key
+
+
+class TestLLMClientTransport:
+    """Test cases for the pooled async LLM transport"""
+    
+    def test_mock_client_without_api_key(self):
+        """Test that no HTTP client is created without an API key"""
+        client = LLMClient(api_key=None)
+        assert client.use_real_llm is False
+        assert client.http_client is None
+    
+    def test_build_http_client_pool_limits(self):
+        """Test that the shared HTTP client is built with pool limits"""
+        http_client = build_http_client()
+        pool = http_client._transport._pool
+        assert pool._max_connections > 0
+        assert pool._max_keepalive_connections > 0
+    
+    @pytest.mark.asyncio
+    async def test_parse_resume_uses_async_transport(self, completion):
+        """Test that parse_resume goes through the async HTTP client"""
+        requests = []
+        
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, json=completion('{"basics": {}}'))
+        
+        client = LLMClient(
+            api_key="test-key",
+            http_client=build_http_client(transport=httpx.MockTransport(handler))
+        )
+        result = await client.parse_resume("张三")
+        await client.aclose()
+        
+        assert result == '{"basics": {}}'
+        assert len(requests) == 1
+        assert requests[0]["max_tokens"] == 8000
+        assert requests[0]["messages"][-1]["role"] == "user"
+    
+    @pytest.mark.asyncio
+    async def test_parse_resume_section(self, completion):
+        """Test per-section extraction with the real and the mock LLM"""
+        requests = []
+        
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, json=completion('[{"company": "阿里巴巴"}]'))
+        
+        client = LLMClient(
+            api_key="test-key",
+            http_client=build_http_client(transport=httpx.MockTransport(handler))
+        )
+        result = await client.parse_resume_section("work", "阿里巴巴 工程师")
+        await client.aclose()
+        
+        assert result == '[{"company": "阿里巴巴"}]'
+        assert "阿里巴巴 工程师" in requests[0]["messages"][-1]["content"]
+        assert requests[0]["max_tokens"] < 8000
+        
+        mock_work = json.loads(await LLMClient(api_key=None).parse_resume_section("work", "阿里巴巴"))
+        assert isinstance(mock_work, list) and mock_work[0]["company"]
+    
+    @pytest.mark.asyncio
+    async def test_chat_entry_points_use_async_transport(self, completion):
+        """Test that chat and chat_response also use the real transport"""
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json=completion(" chat "))
+        
+        client = LLMClient(
+            api_key="test-key",
+            http_client=build_http_client(transport=httpx.MockTransport(handler))
+        )
+        assert await client.chat("你好") == "chat"
+        assert await client.chat_response("你好") == " chat "
+        await client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_route_intent(self, completion):
+        """Test that route_intent sends the router prompt and returns the bare intent"""
+        prompts = []
+        
+        async def handler(request: httpx.Request) -> httpx.Response:
+            payload = json.loads(request.content)
+            prompts.append(payload["messages"][0]["content"])
+            assert payload["temperature"] == 0
+            return httpx.Response(200, json=completion(' "reject_suggestion"\n'))
+        
+        client = LLMClient(
+            api_key="test-key",
+            http_client=build_http_client(transport=httpx.MockTransport(handler))
+        )
+        assert await client.route_intent("再想想吧", "无历史记录", "无简历信息") == "reject_suggestion"
+        assert "用户输入：再想想吧" in prompts[0]
+        await client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_chat_response_stream(self):
+        """Test that chat replies are streamed token by token from the real and the mock LLM"""
+        requests = []
+        
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(json.loads(request.content))
+            chunks = [
+                {"id": "chatcmpl-test", "object": "chat.completion.chunk", "created": 0, "model": "qwen",
+                 "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}
+                for token in ["您好", "，", "张三"]
+            ]
+            body = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+            return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+        
+        client = LLMClient(
+            api_key="test-key",
+            http_client=build_http_client(transport=httpx.MockTransport(handler))
+        )
+        tokens = [token async for token in client.chat_response_stream("你好")]
+        await client.aclose()
+        
+        assert tokens == ["您好", "，", "张三"]
+        assert requests[0]["stream"] is True
+        
+        mock_client = LLMClient(api_key=None)
+        mock_tokens = [token async for token in mock_client.chat_response_stream("你好")]
+        assert len(mock_tokens) > 1
+        assert "".join(mock_tokens) == await mock_client.chat_response("你好")
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_completions_do_not_block(self, completion):
+        """Test that slow completions run concurrently on one event loop"""
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.2)
+            return httpx.Response(200, json=completion("ok"))
+        
+        client = LLMClient(
+            api_key="test-key",
+            http_client=build_http_client(transport=httpx.MockTransport(handler))
+        )
+        start = time.monotonic()
+        results = await asyncio.gather(*[client.chat_response(f"问题{i}") for i in range(10)])
+        elapsed = time.monotonic() - start
+        await client.aclose()
+        
+        assert results == ["ok"] * 10
+        assert elapsed < 1.0
+
+
+class TestLLMClientSingleFlight:
+    """Test cases for coalescing concurrent identical LLM requests"""
+    
+    @pytest.mark.asyncio
+    async def test_identical_parse_requests_share_one_call(self):
+        """Test that concurrent identical parses hit the mock LLM once"""
+        client = LLMClient(api_key=None)
+        calls = 0
+        original = client._call_mock_llm
+        
+        async def slow_mock(resume_text):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return await original(resume_text)
+        
+        client._call_mock_llm = slow_mock
+        results = await asyncio.gather(*[client.parse_resume("张三") for _ in range(5)])
+        
+        assert calls == 1
+        assert len(set(results)) == 1
+        assert client.single_flight.coalesced == 4
+        assert client.single_flight.in_flight == 0
+    
+    @pytest.mark.asyncio
+    async def test_different_requests_are_not_coalesced(self):
+        """Test that different prompts run separately"""
+        client = LLMClient(api_key=None)
+        
+        await asyncio.gather(client.chat_response("你好"), client.chat_response("帮我看看"))
+        
+        assert client.single_flight.calls == 2
+        assert client.single_flight.coalesced == 0
+    
+    @pytest.mark.asyncio
+    async def test_waiters_share_exception(self):
+        """Test that every waiter gets the same exception"""
+        client = LLMClient(api_key=None)
+        
+        async def failing_mock(resume_text):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream failed")
+        
+        client._call_mock_llm = failing_mock
+        results = await asyncio.gather(*[client.parse_resume("张三") for _ in range(3)], return_exceptions=True)
+        
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert client.single_flight.calls == 1
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_call(self):
+        """Test that cancelling one waiter leaves the shared call running"""
+        flight = SingleFlight()
+        
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+        
+        first = asyncio.ensure_future(flight.do("k", work))
+        second = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        
+        assert await second == "done"
+    
+    @pytest.mark.asyncio
+    async def test_waiters_keep_their_own_deadlines(self):
+        """Test that a leader's short deadline fails only the leader, and the last waiter leaving cancels the call"""
+        flight = SingleFlight()
+        started = asyncio.Event()
+        
+        async def work():
+            # Bounded by the deadline in its context, as RetryPolicy.call is
+            started.set()
+            try:
+                await asyncio.wait_for(asyncio.sleep(0.1), remaining_time())
+            except asyncio.TimeoutError as e:
+                raise LLMDeadlineExceeded("deadline passed") from e
+            return "done"
+        
+        async def call(seconds):
+            with deadline(seconds):
+                return await flight.do("k", work)
+        
+        leader = asyncio.ensure_future(call(0.02))
+        await started.wait()
+        follower = asyncio.ensure_future(call(1))
+        
+        with pytest.raises(LLMDeadlineExceeded):
+            await leader
+        assert await follower == "done"
+        
+        with pytest.raises(LLMDeadlineExceeded):
+            await call(0.01)
+        await asyncio.sleep(0.01)
+        assert flight.in_flight == 0
+    
+    def test_request_key(self):
+        """Test that the request key covers messages, model and temperature"""
+        messages = [{"role": "user", "content": "你好"}]
+        assert request_key(messages, "m", 0.2) == request_key(list(messages), "m", 0.2)
+        assert request_key(messages, "m", 0.2) != request_key(messages, "m", 0.7)
+        assert request_key(messages, "m", 0.2) != request_key(messages, "n", 0.2)
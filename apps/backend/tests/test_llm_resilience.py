@@ -0,0 +1,211 @@
+"""
+Tests for retries, deadlines and hedging of upstream LLM calls
+"""
+import asyncio
+import random
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.deadline import requested_timeout
+from src.llm.client import LLMClient, build_http_client
+from src.llm.resilience import (
+    LLMDeadlineExceeded, LLMUnavailable, RetryPolicy, current_deadline, deadline, remaining_time
+)
+from src.main import app
+
+
+def make_policy(**kwargs) -> RetryPolicy:
+    """A policy with short sleeps so tests stay fast"""
+    options = {"base_delay": 0.001, "max_delay": 0.01, "rng": random.Random(0)}
+    options.update(kwargs)
+    return RetryPolicy(**options)
+
+
+def flaky(failures: int, result: str = "ok", error: Exception = None):
+    """An async callable failing with a retryable error the first `failures` times"""
+    calls = []
+    
+    async def fn():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error or httpx.ConnectError("connection refused")
+        return result
+    
+    return fn, calls
+
+
+class TestRetryPolicy:
+    """Test cases for bounded retries with jitter"""
+    
+    def test_backoff_is_jittered_and_capped(self):
+        """Test that sleeps stay between the base delay and the cap"""
+        policy = RetryPolicy(base_delay=0.5, max_delay=8.0, rng=random.Random(1))
+        delay, delays = 0.5, []
+        for _ in range(50):
+            delay = policy.backoff(delay)
+            delays.append(delay)
+        
+        assert all(0.5 <= d <= 8.0 for d in delays)
+        assert len(set(delays)) > 10
+    
+    @pytest.mark.asyncio
+    async def test_retryable_errors_are_retried(self):
+        """Test that transient failures are retried until the call succeeds"""
+        policy = make_policy(max_attempts=3)
+        fn, calls = flaky(2)
+        
+        assert await policy.call(fn) == "ok"
+        assert len(calls) == 3
+        assert policy.retries == 2
+    
+    @pytest.mark.asyncio
+    async def test_attempts_are_bounded(self):
+        """Test that the last failure is raised as LLMUnavailable"""
+        policy = make_policy(max_attempts=3)
+        fn, calls = flaky(10)
+        
+        with pytest.raises(LLMUnavailable, match="after 3 attempts"):
+            await policy.call(fn)
+        assert len(calls) == 3
+    
+    @pytest.mark.asyncio
+    async def test_non_retryable_errors_fail_fast(self):
+        """Test that errors a retry cannot fix are not retried"""
+        policy = make_policy(max_attempts=3)
+        fn, calls = flaky(10, error=ValueError("bad request"))
+        
+        with pytest.raises(LLMUnavailable):
+            await policy.call(fn)
+        assert len(calls) == 1
+
+
+class TestDeadlines:
+    """Test cases for request deadlines"""
+    
+    @pytest.mark.asyncio
+    async def test_slow_call_stops_at_deadline(self):
+        """Test that an attempt is cancelled when the deadline passes"""
+        async def slow():
+            await asyncio.sleep(5)
+        
+        with deadline(0.05):
+            with pytest.raises(LLMDeadlineExceeded):
+                await make_policy().call(slow)
+    
+    @pytest.mark.asyncio
+    async def test_no_retry_past_deadline(self):
+        """Test that a retry whose backoff would overrun the deadline is not attempted"""
+        policy = make_policy(base_delay=1.0, max_delay=1.0)
+        fn, calls = flaky(10)
+        
+        with deadline(0.5):
+            with pytest.raises(LLMDeadlineExceeded):
+                await policy.call(fn)
+        assert len(calls) == 1
+    
+    def test_inner_deadline_cannot_extend_outer(self):
+        """Test that nested deadlines keep the sooner one"""
+        assert current_deadline.get() is None
+        with deadline(1):
+            with deadline(60):
+                assert remaining_time() <= 1
+        assert remaining_time() is None
+    
+    def test_requested_timeout(self):
+        """Test X-Request-Timeout parsing, capped by the default"""
+        assert requested_timeout(None, 180) == 180
+        assert requested_timeout("30", 180) == 30
+        assert requested_timeout("600", 180) == 180
+        assert requested_timeout("-1", 180) == 180
+        assert requested_timeout("soon", 180) == 180
+
+
+class TestHedging:
+    """Test cases for hedged attempts"""
+    
+    async def _warm_up(self, policy: RetryPolicy, kind: str = "default"):
+        async def fast():
+            return "fast"
+        for _ in range(policy.hedge_min_samples):
+            await policy.call(fast, kind=kind)
+    
+    @pytest.mark.asyncio
+    async def test_slow_attempt_is_hedged(self):
+        """Test that a straggler gets a second attempt and the first success wins"""
+        policy = make_policy(hedge=True, hedge_min_delay=0.01)
+        await self._warm_up(policy)
+        calls = []
+        
+        async def first_call_hangs():
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(5)
+            return f"attempt {len(calls)}"
+        
+        result = await asyncio.wait_for(policy.call(first_call_hangs), 1)
+        
+        assert result == "attempt 2"
+        assert policy.hedged == 1
+    
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_history_or_capacity(self):
+        """Test that hedging needs latency samples and is skipped when hedge_if says no"""
+        policy = make_policy(hedge=True, hedge_min_delay=0.01)
+        assert policy.hedge_delay("default") is None
+        
+        await self._warm_up(policy)
+        
+        async def slowish():
+            await asyncio.sleep(0.05)
+            return "ok"
+        
+        assert await policy.call(slowish, hedge_if=lambda: False) == "ok"
+        assert policy.hedged == 0
+
+
+class TestLLMClientResilience:
+    """Test cases for retries in LLMClient"""
+    
+    def _client(self, handler, **kwargs) -> LLMClient:
+        return LLMClient(
+            api_key="test-key",
+            http_client=build_http_client(transport=httpx.MockTransport(handler)),
+            retry_policy=make_policy(**kwargs),
+        )
+    
+    @pytest.mark.asyncio
+    async def test_upstream_errors_are_retried(self, completion):
+        """Test that 503s from the upstream are retried"""
+        statuses = [503, 503]
+        
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if statuses:
+                return httpx.Response(statuses.pop())
+            return httpx.Response(200, json=completion("ok"))
+        
+        client = self._client(handler, max_attempts=3)
+        assert await client.chat_response("你好") == "ok"
+        assert client.retry_policy.retries == 2
+        await client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_failed_parse_is_not_answered_with_mock_data(self):
+        """Test that a real LLM failure raises instead of returning the mock resume"""
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(500)
+        
+        client = self._client(handler, max_attempts=2)
+        with pytest.raises(LLMUnavailable):
+            await client.parse_resume("张三")
+        await client.aclose()
+    
+    def test_parse_endpoint_returns_503(self):
+        """Test that an unavailable LLM is reported as 503"""
+        with patch("src.routers.resume.resume_service.parse_resume", side_effect=LLMUnavailable("down")):
+            response = TestClient(app).post("/api/parse_resume", json={"text": "张三"})
+        
+        assert response.status_code == 503
+        assert response.json()["detail"] == "down"
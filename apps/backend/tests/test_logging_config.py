@@ -0,0 +1,105 @@
+import json
+import logging
+import queue
+import sys
+
+from src.logging_config import (
+    AsyncQueueHandler, JSONFormatter, SamplingFilter, module_setting, parse_module_settings
+)
+
+
+def make_record(name: str = "src.llm.client", level: int = logging.INFO, msg: str = "消息") -> logging.LogRecord:
+    """Build a log record"""
+    return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+
+class TestModuleSettings:
+    """Test cases for per-module settings"""
+    
+    def test_parse_and_longest_prefix(self):
+        """Test that the longest matching logger prefix wins"""
+        settings = parse_module_settings("src=0.5, src.llm=0.1,,bad")
+        
+        assert settings == {"src": 0.5, "src.llm": 0.1}
+        assert module_setting(settings, "src.llm.client") == 0.1
+        assert module_setting(settings, "src.services") == 0.5
+        assert module_setting(settings, "src_other") is None
+        assert module_setting(settings, "uvicorn") is None
+
+
+class TestSamplingFilter:
+    """Test cases for log sampling"""
+    
+    def test_sampling_rate(self):
+        """Test that a rate of 0.25 keeps one record in four"""
+        sampler = SamplingFilter({"src.llm": 0.25})
+        
+        kept = [sampler.filter(make_record()) for _ in range(8)]
+        
+        assert kept.count(True) == 2
+        assert all(sampler.filter(make_record("src.services")) for _ in range(3))
+    
+    def test_warnings_never_sampled(self):
+        """Test that warnings and errors are always kept"""
+        sampler = SamplingFilter({"src": 0})
+        
+        assert not sampler.filter(make_record())
+        assert sampler.filter(make_record(level=logging.WARNING))
+        assert sampler.filter(make_record(level=logging.ERROR))
+
+
+class TestAsyncQueueHandler:
+    """Test cases for the queue handler"""
+    
+    def test_enqueues_rendered_record(self):
+        """Test that the message is rendered before it crosses threads"""
+        log_queue = queue.Queue()
+        handler = AsyncQueueHandler(log_queue, max_chars=100, module_max_chars={})
+        
+        handler.handle(logging.LogRecord("src.x", logging.INFO, __file__, 1, "%s条建议", (3,), None))
+        
+        record = log_queue.get_nowait()
+        assert record.getMessage() == "3条建议"
+        assert record.args is None
+    
+    def test_truncation(self):
+        """Test the global and per-module message limits"""
+        log_queue = queue.Queue()
+        handler = AsyncQueueHandler(log_queue, max_chars=10, module_max_chars={"src.llm": 4})
+        
+        handler.handle(make_record("src.services", msg="a" * 15))
+        handler.handle(make_record("src.llm.client", msg="b" * 15))
+        handler.handle(make_record("src.services", msg="short"))
+        
+        assert log_queue.get_nowait().getMessage() == "a" * 10 + "... [truncated 5 chars]"
+        assert log_queue.get_nowait().getMessage() == "b" * 4 + "... [truncated 11 chars]"
+        assert log_queue.get_nowait().getMessage() == "short"
+    
+    def test_traceback_is_not_truncated(self):
+        """Test that only the message of an error record is cut, not its traceback"""
+        log_queue = queue.Queue()
+        handler = AsyncQueueHandler(log_queue, max_chars=10, module_max_chars={})
+        try:
+            raise ValueError("x" * 50)
+        except ValueError:
+            record = logging.LogRecord("src.x", logging.ERROR, __file__, 1, "c" * 15, None, sys.exc_info())
+        
+        handler.handle(record)
+        
+        message = log_queue.get_nowait().getMessage()
+        assert message.startswith("c" * 10 + "... [truncated 5 chars]\nTraceback")
+        assert message.endswith("ValueError: " + "x" * 50)
+
+
+class TestJSONFormatter:
+    """Test cases for JSON lines"""
+    
+    def test_format(self):
+        """Test that each record is one JSON object"""
+        line = JSONFormatter().format(make_record(msg="解析完成"))
+        
+        entry = json.loads(line)
+        assert entry["message"] == "解析完成"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "src.llm.client"
+        assert "\n" not in line
@@ -0,0 +1,122 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.models.resume import ParseResumeResponse
+from src.services.parse_cache import ParseCache, make_parse_cache_key, normalize_resume_text
+from src.services.resume_service import resume_service
+from src.services.parse_cache import parse_cache
+
+
+def make_result(name: str = "张三") -> ParseResumeResponse:
+    """Build a minimal parse result"""
+    return ParseResumeResponse(
+        resume={
+            "basics": {"name": name, "email": "test@example.com"},
+            "education": [{"institution": "清华大学", "degree": "学士", "field_of_study": "CS", "start_date": "2018-09"}],
+            "work": [{"company": "阿里巴巴", "position": "工程师", "description": "开发", "start_date": "2022-08"}],
+        },
+        suggestions=[{"field": "basics.name", "current": name, "suggested": "新名字", "reason": "测试"}]
+    )
+
+
+class TestParseCacheKey:
+    """Test cases for parse cache keys"""
+    
+    def test_whitespace_normalization(self):
+        """Test that whitespace differences map to the same key"""
+        assert normalize_resume_text("  张三\n\n邮箱:  a@b.com \t") == "张三 邮箱: a@b.com"
+        assert make_parse_cache_key("张三\n邮箱", "1", "m") == make_parse_cache_key(" 张三  邮箱\n", "1", "m")
+    
+    def test_prompt_version_and_model_in_key(self):
+        """Test that prompt version and model change the key"""
+        base = make_parse_cache_key("张三", "1", "model-a")
+        assert make_parse_cache_key("张三", "2", "model-a") != base
+        assert make_parse_cache_key("张三", "1", "model-b") != base
+
+
+class TestParseCache:
+    """Test cases for the parse result cache"""
+    
+    @pytest.mark.asyncio
+    async def test_hit_and_miss_counters(self):
+        """Test that hits return an equal copy and counters are updated"""
+        cache = ParseCache(max_entries=4, ttl_seconds=60)
+        result = make_result()
+        
+        assert await cache.get("k") is None
+        await cache.set("k", result)
+        cached = await cache.get("k")
+        
+        assert cached == result
+        assert cached is not result
+        assert cache.stats() == {"hits": 1, "misses": 1, "disk_hits": 0, "entries": 1}
+    
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        cache = ParseCache(max_entries=2, ttl_seconds=60)
+        await cache.set("a", make_result("A"))
+        await cache.set("b", make_result("B"))
+        await cache.get("a")
+        await cache.set("c", make_result("C"))
+        
+        assert await cache.get("b") is None
+        assert (await cache.get("a")).resume.basics.name == "A"
+        assert (await cache.get("c")).resume.basics.name == "C"
+    
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        """Test that expired entries are not returned"""
+        cache = ParseCache(max_entries=2, ttl_seconds=10)
+        with patch("src.services.parse_cache.time.time", return_value=1000.0):
+            await cache.set("k", make_result())
+        with patch("src.services.parse_cache.time.time", return_value=1011.0):
+            assert await cache.get("k") is None
+    
+    @pytest.mark.asyncio
+    async def test_sqlite_tier_survives_restart(self, tmp_path):
+        """Test that the on-disk tier serves results to a new cache instance"""
+        db_path = str(tmp_path / "parse_cache.db")
+        first = ParseCache(max_entries=2, ttl_seconds=60, db_path=db_path)
+        await first.set("k", make_result())
+        
+        second = ParseCache(max_entries=2, ttl_seconds=60, db_path=db_path)
+        cached = await second.get("k")
+        
+        assert cached == make_result()
+        assert second.stats()["disk_hits"] == 1
+
+
+class TestResumeServiceParseCache:
+    """Test cases for the parse cache in front of the resume service"""
+    
+    def setup_method(self):
+        parse_cache.clear()
+    
+    @pytest.mark.asyncio
+    async def test_repeated_parse_skips_workflow(self):
+        """Test that re-parsing the same text does not run the workflow again"""
+        with patch(
+            "src.langgraph.parse_resume.workflow.resume_workflow.run",
+            new_callable=AsyncMock, return_value=make_result()
+        ) as mock_run:
+            first = await resume_service.parse_resume("张三\n邮箱: test@example.com")
+            second = await resume_service.parse_resume("张三 邮箱:  test@example.com\n")
+        
+        assert mock_run.await_count == 1
+        assert first == second
+    
+    @pytest.mark.asyncio
+    async def test_stream_replays_cached_result(self):
+        """Test that the streaming parse replays a cached result"""
+        result = make_result()
+        with patch(
+            "src.langgraph.parse_resume.workflow.resume_workflow.run",
+            new_callable=AsyncMock, return_value=result
+        ):
+            await resume_service.parse_resume("张三")
+        
+        events = [event async for event in await resume_service.parse_resume_stream("张三")]
+        
+        assert [e["event"] for e in events] == ["basics", "education", "work", "suggestion", "result"]
+        assert events[-1]["data"] == result
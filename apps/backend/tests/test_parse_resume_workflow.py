@@ -1,6 +1,9 @@
+import asyncio
 import pytest
 import json
+from unittest.mock import patch
 from src.langgraph.parse_resume.workflow import ResumeParsingWorkflow
+from src.llm.client import llm_client
 from src.models.resume import LangGraphState, Resume, Suggestion, BasicInfo, Education, WorkExperience
 
 
@@ -125,6 +128,72 @@ class TestLangGraphWorkflow:
             assert suggestion.suggested is not None
             assert suggestion.reason is not None
     
+    @pytest.mark.asyncio
+    async def test_workflow_sections_mode(self):
+        """Test section-parallel parsing merges sections with a concurrency cap"""
+        text = "张三\n邮箱: test@example.com\n教育\n清华大学\n工作\n阿里巴巴\n技能\nJava\n证书\nAWS"
+        full = json.loads(await llm_client._call_mock_llm(text))
+        running = []
+        peak = []
+        
+        async def parse_section(section, section_text):
+            running.append(section)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(section)
+            return json.dumps(full[section], ensure_ascii=False)
+        
+        with patch("src.langgraph.parse_resume.workflow.PARSE_RESUME_MODE", "sections"), \
+                patch("src.langgraph.parse_resume.workflow.PARSE_SECTION_CONCURRENCY", 2), \
+                patch("src.langgraph.parse_resume.workflow.llm_client.parse_resume_section", parse_section), \
+                patch("src.langgraph.parse_resume.workflow.llm_client.parse_resume") as parse_resume:
+            result = await self.workflow.run(text)
+        
+        parse_resume.assert_not_called()
+        assert len(peak) == 5 and max(peak) == 2
+        assert result.resume.work[0].company == full["work"][0]["company"]
+        assert len(result.resume.skills) == len(full["skills"])
+        assert result.suggestions
+    
+    @pytest.mark.asyncio
+    async def test_workflow_sections_mode_truncated_section(self):
+        """Test that a cut-off section keeps its complete entries"""
+        text = "张三\n邮箱: test@example.com\n教育\n清华大学\n工作\n阿里巴巴\n技能\nJava"
+        full = json.loads(await llm_client._call_mock_llm(text))
+        
+        async def parse_section(section, section_text):
+            data = json.dumps(full[section], ensure_ascii=False)
+            return data[:data.index('"name": "Python"')] if section == "skills" else data
+        
+        with patch("src.langgraph.parse_resume.workflow.PARSE_RESUME_MODE", "sections"), \
+                patch("src.langgraph.parse_resume.workflow.llm_client.parse_resume_section", parse_section):
+            result = await self.workflow.run(text)
+        
+        assert [skill.name for skill in result.resume.skills] == [full["skills"][0]["name"]]
+    
+    def test_sections_to_parse_fallback(self):
+        """Test when the single-call parse is used instead of sections"""
+        long_text = "张三\n教育\n清华大学\n工作\n阿里巴巴\n" + "负责后端开发。" * 500
+        
+        with patch("src.langgraph.parse_resume.workflow.PARSE_RESUME_MODE", "auto"):
+            assert self.workflow._sections_to_parse("张三\n教育\n清华大学\n工作\n阿里巴巴") is None
+            assert set(self.workflow._sections_to_parse(long_text)) == {"basics", "education", "work"}
+        with patch("src.langgraph.parse_resume.workflow.PARSE_RESUME_MODE", "sections"):
+            assert self.workflow._sections_to_parse("张三\n教育: 清华大学\n工作: 阿里巴巴") is None
+            assert self.workflow._sections_to_parse("教育：\n清华大学\n工作：\n阿里巴巴")["basics"].startswith("教育")
+        with patch("src.langgraph.parse_resume.workflow.PARSE_RESUME_MODE", "single"):
+            assert self.workflow._sections_to_parse(long_text) is None
+    
+    @pytest.mark.asyncio
+    async def test_nodes_return_partial_updates(self):
+        """Test that nodes return only the fields they change"""
+        resume = Resume(basics={"name": "张三", "email": "test@example.com"})
+        state = LangGraphState(resume_text="张三", parsed_resume=resume)
+        
+        assert await self.workflow._validate_resume_node(state) == {"validation_errors": []}
+        assert set(await self.workflow._combine_result_node(state)) == {"suggestions", "final_result"}
+        assert set(await self.workflow._handle_resume_error_node(state)) == {"error_message"}
+    
     @pytest.mark.asyncio
     async def test_workflow_with_invalid_resume(self):
         """Test workflow with invalid resume structure"""
@@ -140,6 +209,72 @@ class TestLangGraphWorkflow:
             # Expected if validation fails
             assert "validation" in str(e).lower() or "error" in str(e).lower()
     
+    @pytest.mark.asyncio
+    async def test_stream_matches_run(self):
+        """Test streaming workflow yields sections and the same final result as run"""
+        test_text = "张三\n邮箱: test@example.com\n教育: 清华大学\n工作: 阿里巴巴"
+        
+        events = [event async for event in self.workflow.stream(test_text)]
+        expected = await self.workflow.run(test_text)
+        
+        names = [event["event"] for event in events]
+        assert names[0] == "basics"
+        assert names[-1] == "result"
+        assert [e["index"] for e in events if e["event"] == "skills"] == list(range(len(expected.resume.skills)))
+        assert events[-1]["data"] == expected
+        
+        streamed_fields = [e["data"]["field"] for e in events if e["event"] == "suggestion"]
+        assert streamed_fields == [s.field for s in expected.suggestions]
+    
+    @pytest.mark.asyncio
+    async def test_stream_truncated_output(self):
+        """Test streaming workflow reports an error for truncated LLM output"""
+        async def truncated_stream(resume_text):
+            yield '{"basics": {"name": "张三", "email": "test@example.com"}, "education": ['
+        
+        with patch("src.langgraph.parse_resume.workflow.llm_client.parse_resume_stream", truncated_stream):
+            events = [event async for event in self.workflow.stream("张三")]
+        
+        assert events[0]["event"] == "basics"
+        assert events[-1]["event"] == "error"
+        assert "Failed to parse resume" in events[-1]["detail"]
+    
+    @pytest.mark.asyncio
+    async def test_stream_truncated_after_complete_sections(self):
+        """Test streaming workflow keeps completed sections of truncated output"""
+        full = json.loads(await llm_client._call_mock_llm("张三"))
+        text = json.dumps(full, ensure_ascii=False)
+        cut = text.index('"skills"') + 40
+        
+        async def truncated_stream(resume_text):
+            yield text[:cut]
+        
+        with patch("src.langgraph.parse_resume.workflow.llm_client.parse_resume_stream", truncated_stream):
+            events = [event async for event in self.workflow.stream("张三")]
+        
+        assert events[-1]["event"] == "result"
+        result = events[-1]["data"]
+        assert result.resume.work[0].company == "阿里巴巴"
+        assert len(result.resume.skills) == 0
+    
+    def test_extract_partial_json_truncated(self):
+        """Test salvaging complete sections from a truncated LLM response"""
+        response = (
+            '{"basics": {"name": "张三", "email": "test@example.com"}, '
+            '"work": [{"company": "阿里巴巴", "position": "工程师", "description": "开发", "start_date": "2022-08"}], '
+            '"skills": [{"name": "Java", "suggestions": [{"field": "skills[0].level", "current": "Profic'
+        )
+        
+        result = self.workflow._extract_partial_json(response)
+        
+        assert result["basics"]["name"] == "张三"
+        assert result["work"][0]["company"] == "阿里巴巴"
+        assert result["skills"] == []
+    
+    def test_extract_partial_json_no_json(self):
+        """Test that a response without JSON yields an empty dict"""
+        assert self.workflow._extract_partial_json("抱歉，我无法解析") == {}
+    
     def test_should_continue_after_resume_validation_valid(self):
         """Test continue decision after valid resume validation"""
         state = LangGraphState(
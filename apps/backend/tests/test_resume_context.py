@@ -0,0 +1,71 @@
+"""
+Tests for the cached resume context renderer used by chat prompts
+"""
+from src.langgraph.chat.context import ResumeContextRenderer, render_resume_context, resume_content_key
+
+
+RESUME = {
+    "basics": {"name": "张三", "email": "zhangsan@example.com", "summary": "软件工程师"},
+    "education": [{"institution": "清华大学", "degree": "学士", "gpa": "3.8/4.0"}],
+    "work": [{"company": "阿里巴巴", "position": "工程师", "achievements": ["提升性能30%"]}],
+    "skills": [{"name": "Python", "level": "高级"}]
+}
+
+
+class TestResumeContextRenderer:
+    """Test cases for ResumeContextRenderer"""
+    
+    def test_entries_numbered_like_field_paths(self):
+        """Test that entries are numbered from 0, as in work[0]"""
+        rendered = render_resume_context(RESUME)
+        
+        assert "  0. 清华大学 - 学士" in rendered
+        assert "  0. 阿里巴巴 - 工程师" in rendered
+        assert "       - 提升性能30%" in rendered
+    
+    def test_same_version_is_rendered_once(self):
+        """Test that later turns on the same resume version reuse the rendered block"""
+        renderer = ResumeContextRenderer()
+        first = renderer.render(RESUME, '"rev-1"')
+        second = renderer.render(RESUME, '"rev-1"')
+        
+        assert second is first
+        assert renderer.stats() == {"entries": 1, "hits": 1, "misses": 1}
+    
+    def test_new_version_is_rendered_again(self):
+        """Test that a saved or accepted change, stored as a new version, is re-rendered"""
+        renderer = ResumeContextRenderer()
+        renderer.render(RESUME, '"rev-1"')
+        changed = {**RESUME, "basics": {**RESUME["basics"], "summary": "资深软件工程师"}}
+        
+        assert "资深软件工程师" in renderer.render(changed, '"rev-2"')
+        assert renderer.misses == 2
+    
+    def test_unversioned_resume_keyed_by_content(self):
+        """Test that resumes without a version share an entry only when their content is equal"""
+        renderer = ResumeContextRenderer()
+        renderer.render(RESUME)
+        renderer.render({**RESUME})
+        renderer.render({**RESUME, "skills": []})
+        
+        assert renderer.hits == 1
+        assert renderer.misses == 2
+        assert resume_content_key(RESUME) == resume_content_key(dict(RESUME))
+    
+    def test_cache_is_bounded(self):
+        """Test that the least recently used entries are evicted"""
+        renderer = ResumeContextRenderer(max_entries=2)
+        for version in ("a", "b", "a", "c"):
+            renderer.render(RESUME, version)
+        
+        assert renderer.stats()["entries"] == 2
+        renderer.render(RESUME, "a")
+        renderer.render(RESUME, "b")
+        assert renderer.misses == 4
+    
+    def test_empty_resume(self):
+        """Test that an empty resume renders the placeholder and is not cached"""
+        renderer = ResumeContextRenderer()
+        
+        assert renderer.render({}) == "无简历信息"
+        assert renderer.stats()["entries"] == 0
@@ -0,0 +1,31 @@
+from src.langgraph.parse_resume.sections import segment_resume_text
+
+
+class TestSegmentResumeText:
+    """Test cases for splitting resume text into sections"""
+    
+    def test_inline_key_value_lines(self):
+        """Test that "title: value" lines are content, not headings"""
+        text = "张三\n学历：本科\n工作：3年\n邮箱: test@example.com\n教育：\n清华大学\n工作经历\n阿里巴巴"
+        
+        assert segment_resume_text(text) == {
+            "basics": "张三\n学历：本科\n工作：3年\n邮箱: test@example.com",
+            "education": "清华大学",
+            "work": "阿里巴巴",
+        }
+    
+    def test_heading_lines(self):
+        """Test headings on their own line, in brackets, markdown or English"""
+        text = "张三\n\n【教育背景】\n清华大学 2018-2022\n## 工作经历\n阿里巴巴 工程师\n负责订单系统\nSkills\nJava, Python\n证书：\nAWS"
+        
+        sections = segment_resume_text(text)
+        
+        assert sections["education"] == "清华大学 2018-2022"
+        assert sections["work"] == "阿里巴巴 工程师\n负责订单系统"
+        assert sections["skills"] == "Java, Python"
+        assert sections["certificates"] == "AWS"
+    
+    def test_no_headings(self):
+        """Test that text without headings is all basics"""
+        assert segment_resume_text("张三\n工程师，做后端开发") == {"basics": "张三\n工程师，做后端开发"}
+        assert segment_resume_text("  \n") == {}
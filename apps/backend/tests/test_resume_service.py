@@ -1,7 +1,7 @@
 import pytest
 import asyncio
-from src.services.resume_service import resume_service
-from src.models.resume import Resume, BasicInfo, Education, WorkExperience, Skill
+from src.services.resume_service import resume_service, ResumePatchConflict, ResumePatchError
+from src.models.resume import Resume, BasicInfo, Education, WorkExperience, Skill, ResumePatchOperation
 
 
 class TestResumeService:
@@ -211,4 +211,63 @@ class TestResumeService:
                 "nonexistent[0].field",
                 "新值",
                 parse_result.resume
-            ) 
\ No newline at end of file
+            ) 
+
+class TestResumePatch:
+    """Test cases for JSON Patch operations on a resume"""
+    
+    @pytest.fixture
+    def resume(self):
+        return Resume(
+            basics=BasicInfo(name="测试用户", email="test@example.com"),
+            education=[
+                Education(institution="测试大学", degree="学士", field_of_study="计算机科学", start_date="2018-09")
+            ],
+            work=[
+                WorkExperience(
+                    company="测试公司", position="软件工程师", description="原始描述",
+                    start_date="2022-08", achievements=["成就一"]
+                )
+            ]
+        )
+    
+    def test_replace_add_remove(self, resume):
+        """Test the basic operations on fields and arrays"""
+        updated = resume_service.patch_resume([
+            ResumePatchOperation(op="replace", path="/work/0/description", value="新描述"),
+            ResumePatchOperation(op="add", path="/work/0/achievements/-", value="成就二"),
+            ResumePatchOperation(op="add", path="/work/0/achievements/0", value="成就零"),
+            ResumePatchOperation(op="remove", path="/work/0/achievements/1"),
+            ResumePatchOperation(op="add", path="/skills/0", value={"name": "Python"}),
+            ResumePatchOperation(op="remove", path="/basics/phone"),
+        ], resume)
+        
+        assert updated.work[0].description == "新描述"
+        assert updated.work[0].achievements == ["成就零", "成就二"]
+        assert updated.skills[0].name == "Python"
+        assert updated.education[0] is resume.education[0]
+        assert resume.work[0].description == "原始描述"
+    
+    def test_test_operation(self, resume):
+        """Test that a failing test operation rejects the patch"""
+        operations = [
+            ResumePatchOperation(op="test", path="/work/0/description", value="原始描述"),
+            ResumePatchOperation(op="replace", path="/work/0/description", value="新描述"),
+        ]
+        assert resume_service.patch_resume(operations, resume).work[0].description == "新描述"
+        
+        with pytest.raises(ResumePatchConflict):
+            resume_service.patch_resume([
+                ResumePatchOperation(op="test", path="/basics", value={"name": "别人"})
+            ], resume)
+    
+    def test_invalid_operations(self, resume):
+        """Test missing paths, missing values and invalid values"""
+        with pytest.raises(ResumePatchError):
+            resume_service.patch_resume([ResumePatchOperation(op="replace", path="/work/3/description", value="x")], resume)
+        with pytest.raises(ResumePatchError):
+            resume_service.patch_resume([ResumePatchOperation(op="replace", path="/work/0/description")], resume)
+        with pytest.raises(ResumePatchError):
+            resume_service.patch_resume([ResumePatchOperation(op="replace", path="", value={})], resume)
+        with pytest.raises(ValueError):
+            resume_service.patch_resume([ResumePatchOperation(op="remove", path="/basics/name")], resume)
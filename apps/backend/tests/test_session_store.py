@@ -0,0 +1,419 @@
+import asyncio
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.models.resume import Resume
+from src.services.session_store import (
+    MemoryResumeStore, SQLiteResumeStore, RedisResumeStore, ResumeSession,
+    encode_command, read_reply, next_session
+)
+
+
+def make_session(name: str = "张三", summary: str = "") -> ResumeSession:
+    """Build a minimal resume session"""
+    resume = Resume(
+        basics={"name": name, "email": "test@example.com", "summary": summary},
+        education=[{"institution": "清华大学", "degree": "学士", "field_of_study": "CS", "start_date": "2018-09"}],
+        work=[{"company": "阿里巴巴", "position": "工程师", "description": "开发", "start_date": "2022-08"}]
+    )
+    return ResumeSession(
+        resume=resume,
+        suggestions=[{"field": "basics.name", "current": name, "suggested": "新名字", "reason": "测试"}]
+    )
+
+
+class FakeRedisServer:
+    """Local stand-in speaking the subset of RESP used by RedisResumeStore"""
+    
+    def __init__(self):
+        self.data = {}
+        self.expiry_ms = {}
+        self.scans = 0
+        self.cursors = {}
+        self.server = None
+    
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+    
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+    
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                command = await read_reply(reader)
+                writer.write(self._execute([part.decode("utf-8") for part in command]))
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+    
+    def _execute(self, args):
+        name = args[0].upper()
+        if name == "GET":
+            value = self.data.get(args[1])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if name == "SET":
+            self.data[args[1]] = args[2].encode("utf-8")
+            if len(args) > 4 and args[3].upper() == "PX":
+                self.expiry_ms[args[1]] = int(args[4])
+            return b"+OK\r\n"
+        if name == "PEXPIRE":
+            self.expiry_ms[args[1]] = int(args[2])
+            return b":1\r\n"
+        if name == "DEL":
+            removed = sum(1 for key in args[1:] if self.data.pop(key, None) is not None)
+            return b":%d\r\n" % removed
+        if name == "EVAL":
+            # The compare-and-set script of RedisResumeStore.replace
+            key, revision, version, data, px = args[3:8]
+            current = self.data.get(key)
+            if current is not None:
+                session = json.loads(current)
+                if not revision or session["revision"] != revision or session["version"] != int(version):
+                    return b":0\r\n"
+            elif revision:
+                return b":0\r\n"
+            self.data[key] = data.encode("utf-8")
+            self.expiry_ms[key] = int(px)
+            return b":1\r\n"
+        if name == "SCAN":
+            # Cursors resume after the last key returned, so deletions between calls skip nothing;
+            # MATCH is a prefix
+            after, prefix, count = self.cursors.get(args[1], ""), args[3].rstrip("*"), int(args[5])
+            names = [key for key in sorted(self.data) if key > after]
+            page = names[:count]
+            self.scans += 1
+            keys = [key.encode("utf-8") for key in page if key.startswith(prefix)]
+            next_cursor = b"0"
+            if len(names) > count:
+                next_cursor = str(self.scans).encode("utf-8")
+                self.cursors[str(self.scans)] = page[-1]
+            return (b"*2\r\n$%d\r\n%s\r\n" % (len(next_cursor), next_cursor)
+                    + b"*%d\r\n" % len(keys) + b"".join(b"$%d\r\n%s\r\n" % (len(k), k) for k in keys))
+        return b"-ERR unknown command\r\n"
+
+
+async def check_replace(store) -> None:
+    """Compare-and-set semantics shared by all backends"""
+    first = next_session(None, make_session().resume, [])
+    assert await store.replace("a", None, first)
+    assert not await store.replace("a", None, next_session(None, make_session("重复").resume, []))
+    
+    second = next_session(first, make_session("第二版").resume, [])
+    assert await store.replace("a", first, second)
+    # A writer still holding the first version loses
+    assert not await store.replace("a", first, next_session(first, make_session("过期").resume, []))
+    # The same version number of another session is not a match either
+    assert not await store.replace("a", make_session(), next_session(first, make_session("过期").resume, []))
+    
+    stored = await store.get("a")
+    assert stored.resume.basics.name == "第二版"
+    assert stored.version == 2
+
+
+class TestMemoryResumeStore:
+    """Test cases for the in-memory resume store"""
+    
+    @pytest.mark.asyncio
+    async def test_replace(self):
+        """Test compare-and-set on the stored version"""
+        await check_replace(MemoryResumeStore())
+    
+    @pytest.mark.asyncio
+    async def test_set_get_delete(self):
+        """Test basic session operations"""
+        store = MemoryResumeStore()
+        session = make_session()
+        
+        await store.set("a", session)
+        assert await store.get("a") is session
+        assert await store.get("b") is None
+        
+        await store.delete("a")
+        assert await store.get("a") is None
+        assert store.total_bytes == 0
+    
+    @pytest.mark.asyncio
+    async def test_lru_eviction_by_count(self):
+        """Test that the least recently used session is evicted"""
+        store = MemoryResumeStore(max_sessions=2)
+        await store.set("a", make_session())
+        await store.set("b", make_session())
+        await store.get("a")
+        await store.set("c", make_session())
+        
+        assert await store.get("b") is None
+        assert await store.get("a") is not None
+        assert await store.get("c") is not None
+    
+    @pytest.mark.asyncio
+    async def test_eviction_by_size(self):
+        """Test that total stored bytes stay within the limit"""
+        size = len(make_session().model_dump_json())
+        store = MemoryResumeStore(max_bytes=size * 2 + 10)
+        for session_id in ("a", "b", "c"):
+            await store.set(session_id, make_session())
+        
+        assert len(store) == 2
+        assert store.total_bytes <= size * 2 + 10
+        assert await store.get("a") is None
+    
+    def test_threads_keep_totals_consistent(self):
+        """Test that expiring reads, writes and deletes from several threads keep total_bytes exact"""
+        store = MemoryResumeStore(idle_ttl=0.0005)
+        sessions = [make_session(f"用户{i}") for i in range(4)]
+        
+        async def churn(worker: int):
+            for i in range(300):
+                session_id = f"s{(worker + i) % 4}"
+                await store.get(session_id)
+                await store.replace(session_id, await store.get(session_id), sessions[i % 4])
+                if i % 7 == 0:
+                    await store.delete(session_id)
+        
+        threads = [threading.Thread(target=asyncio.run, args=(churn(worker),)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert store.total_bytes == sum(entry[1] for entry in store._sessions.values())
+    
+    @pytest.mark.asyncio
+    async def test_oversized_session_is_kept(self):
+        """Test that the session just written is never evicted"""
+        store = MemoryResumeStore(max_bytes=10)
+        await store.set("a", make_session())
+        
+        assert await store.get("a") is not None
+    
+    @pytest.mark.asyncio
+    async def test_idle_ttl(self):
+        """Test that idle sessions expire"""
+        store = MemoryResumeStore(idle_ttl=10)
+        with patch("src.services.session_store.time.monotonic", return_value=100.0):
+            await store.set("a", make_session())
+        with patch("src.services.session_store.time.monotonic", return_value=109.0):
+            assert await store.get("a") is not None
+        with patch("src.services.session_store.time.monotonic", return_value=120.0):
+            assert await store.get("a") is None
+
+
+class TestSQLiteResumeStore:
+    """Test cases for the SQLite resume store"""
+    
+    @pytest.mark.asyncio
+    async def test_round_trip_and_persistence(self, tmp_path):
+        """Test that sessions survive reopening the database"""
+        path = str(tmp_path / "sessions.db")
+        store = SQLiteResumeStore(path=path)
+        stored = make_session("李四")
+        await store.set("a", stored)
+        await store.close()
+        
+        reopened = SQLiteResumeStore(path=path)
+        session = await reopened.get("a")
+        
+        assert session == stored
+        assert await reopened.get("b") is None
+    
+    @pytest.mark.asyncio
+    async def test_replace(self, tmp_path):
+        """Test compare-and-set, also between two workers sharing the file"""
+        path = str(tmp_path / "sessions.db")
+        await check_replace(SQLiteResumeStore(path=path))
+        
+        workers = [SQLiteResumeStore(path=path), SQLiteResumeStore(path=path)]
+        current = await workers[0].get("a")
+        results = [
+            await worker.replace("a", current, next_session(current, make_session(name).resume, []))
+            for worker, name in zip(workers, ("甲", "乙"))
+        ]
+        assert results == [True, False]
+        assert (await workers[1].get("a")).resume.basics.name == "甲"
+    
+    @pytest.mark.asyncio
+    async def test_reads_reuse_decoded_session(self, tmp_path):
+        """Test that unchanged reads return the same session, with its cached document, across workers"""
+        path = str(tmp_path / "sessions.db")
+        store, other_worker = SQLiteResumeStore(path=path), SQLiteResumeStore(path=path)
+        await other_worker.set("a", make_session("李四"))
+        
+        first = await store.get("a")
+        body = first.embedded_document_json()
+        second = await store.get("a")
+        assert second is first
+        assert second.embedded_document_json() is body
+        
+        await other_worker.replace("a", first, next_session(first, make_session("王五").resume, []))
+        changed = await store.get("a")
+        assert changed is not first
+        assert changed.resume.basics.name == "王五"
+    
+    @pytest.mark.asyncio
+    async def test_limits(self, tmp_path):
+        """Test count-based eviction and trigger-maintained totals"""
+        store = SQLiteResumeStore(path=str(tmp_path / "sessions.db"), max_sessions=2)
+        await store.set("a", make_session())
+        await store.set("b", make_session())
+        await store.set("a", make_session("更新"))
+        await store.set("c", make_session())
+        
+        assert await store.get("b") is None
+        assert (await store.get("a")).resume.basics.name == "更新"
+        count, total = store._conn.execute("SELECT count, bytes FROM resume_sessions_totals").fetchone()
+        assert count == 2
+        assert total == store._conn.execute("SELECT SUM(size) FROM resume_sessions").fetchone()[0]
+
+
+class TestRedisResumeStore:
+    """Test cases for the Redis-protocol resume store against a local stand-in"""
+    
+    @pytest.mark.asyncio
+    async def test_round_trip(self):
+        """Test session operations over RESP"""
+        server = FakeRedisServer()
+        port = await server.start()
+        store = RedisResumeStore(url=f"redis://127.0.0.1:{port}/0", idle_ttl=60)
+        try:
+            stored = make_session("王五")
+            await store.set("a", stored)
+            assert await store.get("a") is stored
+            store.decoded.clear()
+            assert (await store.get("a")).resume.basics.name == "王五"
+            assert await store.get("a") is await store.get("a")
+            assert server.expiry_ms["jobprep:resume:a"] == 60000
+            assert await store.get("missing") is None
+            
+            await store.clear()
+            assert await store.get("a") is None
+        finally:
+            await store.close()
+            await server.stop()
+    
+    @pytest.mark.asyncio
+    async def test_replace(self):
+        """Test compare-and-set through the server-side script"""
+        server = FakeRedisServer()
+        port = await server.start()
+        store = RedisResumeStore(url=f"redis://127.0.0.1:{port}/0", idle_ttl=60)
+        try:
+            await check_replace(store)
+            assert server.expiry_ms["jobprep:resume:a"] == 60000
+        finally:
+            await store.close()
+            await server.stop()
+    
+    @pytest.mark.asyncio
+    async def test_clear_scans_in_batches(self):
+        """Test that clear walks the keyspace with SCAN and leaves other keys alone"""
+        server = FakeRedisServer()
+        port = await server.start()
+        store = RedisResumeStore(url=f"redis://127.0.0.1:{port}/0", idle_ttl=60, scan_count=2)
+        try:
+            for session_id in "abcde":
+                await store.set(session_id, make_session())
+            server.data["other:key"] = b"kept"
+            
+            await store.clear()
+            assert list(server.data) == ["other:key"]
+            assert server.scans > 1
+        finally:
+            await store.close()
+            await server.stop()
+    
+    def test_encode_command(self):
+        """Test RESP command encoding"""
+        assert encode_command("SET", "k", "值") == b"*3\r\n$3\r\nSET\r\n$1\r\nk\r\n$3\r\n\xe5\x80\xbc\r\n"
+
+
+class TestResumeSession:
+    """Test cases for the suggestion index and embedded document"""
+    
+    def test_suggestion_index(self):
+        """Test that suggestions are grouped by their owning entry"""
+        session = make_session()
+        session = ResumeSession(
+            resume=session.resume,
+            suggestions=[
+                {"field": "basics.summary", "current": "", "suggested": "简介", "reason": "r"},
+                {"field": "work[0].description", "current": "开发", "suggested": "后端开发", "reason": "r"},
+                {"field": "work[0].achievements[1]", "current": "", "suggested": "成就", "reason": "r"},
+                {"field": "unknown", "current": "", "suggested": "", "reason": "r"},
+            ]
+        )
+        
+        index = session.suggestion_index
+        assert [s.field for s in index[("basics", None)]] == ["basics.summary"]
+        assert [s.field for s in index[("work", 0)]] == ["work[0].description", "work[0].achievements[1]"]
+        assert len(index) == 2
+    
+    def test_embedded_document(self):
+        """Test that suggestions are embedded into their entries"""
+        base = make_session()
+        session = ResumeSession(
+            resume=base.resume,
+            suggestions=[
+                {"field": "work[0].description", "current": "开发", "suggested": "后端开发", "reason": "r"},
+                {"field": "work[5].description", "current": "", "suggested": "越界", "reason": "r"},
+            ]
+        )
+        
+        document = session.embedded_document()
+        
+        assert document["work"][0]["suggestions"][0]["suggested"] == "后端开发"
+        assert document["basics"]["suggestions"] is None
+        assert len(document["work"]) == 1
+    
+    def test_embedded_document_is_cached(self):
+        """Test that repeated reads reuse the built document"""
+        session = make_session()
+        first = session.embedded_document()
+        
+        with patch.object(Resume, "model_dump", side_effect=AssertionError("rebuilt")):
+            assert session.embedded_document() is first
+    
+    def test_embedded_document_json(self):
+        """Test that the serialized document matches json.dumps and is cached"""
+        session = make_session()
+        first = session.embedded_document_json()
+        
+        assert first == json.dumps(session.embedded_document(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        assert session.embedded_document_json() is first
+    
+    def test_without_suggestion(self):
+        """Test removing an accepted suggestion through the index"""
+        base = make_session()
+        session = ResumeSession(
+            resume=base.resume,
+            suggestions=[
+                {"field": "basics.summary", "current": "", "suggested": "简介", "reason": "r"},
+                {"field": "work[0].description", "current": "开发", "suggested": "后端开发", "reason": "r"},
+            ]
+        )
+        
+        assert [s.field for s in session.without_suggestion("work[0].description")] == ["basics.summary"]
+        assert session.without_suggestion("work[0].position") is session.suggestions
+    
+    def test_next_session_version(self):
+        """Test that replacing a session increments its version"""
+        first = next_session(None, make_session().resume, [])
+        second = next_session(first, first.resume, first.suggestions)
+        
+        assert (first.version, second.version) == (1, 2)
+        assert ResumeSession.model_validate_json(second.model_dump_json()).version == 2
+    
+    def test_etag(self):
+        """Test that the ETag changes with the version and differs between sessions"""
+        first = next_session(None, make_session().resume, [])
+        second = next_session(first, first.resume, first.suggestions)
+        other = next_session(None, make_session().resume, [])
+        
+        assert first.etag != second.etag
+        assert first.etag != other.etag
+        assert ResumeSession.model_validate_json(second.model_dump_json()).etag == second.etag